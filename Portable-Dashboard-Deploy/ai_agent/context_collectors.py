@@ -1,4 +1,5 @@
 from django.utils import timezone
+from dashboard.metrics import compute_dashboard_metrics
 from dashboard.models import Resource, Project, KPI, KPIRating, KPIRatingSubmission, UserAction
 from .models import DashboardContext
 
@@ -9,14 +10,12 @@ def collect_dashboard_overview_context(session, request):
     # Create a new context object
     context = DashboardContext(session=session)
 
-    # Get all projects
-    projects = Project.objects.all()
-
     # Get counts for analytics
-    context.total_products = projects.count()
+    metrics = compute_dashboard_metrics()
+    context.total_products = metrics.total_products
     context.total_resources = Resource.objects.count()
-    context.active_products = projects.filter(status='in_progress').count()
-    context.completed_products = projects.filter(status='completed').count()
+    context.active_products = metrics.active_products
+    context.completed_products = metrics.completed_products
 
     # Save the context
     context.save()
@@ -333,10 +332,12 @@ def collect_full_dashboard_context(session, request):
     """
     try:
         # Get counts of products and resources
-        total_products = Project.objects.count()
+        metrics = compute_dashboard_metrics()
+        total_products = metrics.total_products
         total_resources = Resource.objects.count()
-        active_products = Project.objects.filter(status='in_progress').count()
-        completed_products = Project.objects.filter(status='completed').count()
+        active_products = metrics.active_products
+        completed_products = metrics.completed_products
+        dashboard_metrics = metrics.to_dict()
 
         # Database access successful
         database_available = True
@@ -347,6 +348,7 @@ def collect_full_dashboard_context(session, request):
         total_resources = 0
         active_products = 0
         completed_products = 0
+        dashboard_metrics = {}
         database_available = False
 
     # Determine the current view based on the request path
@@ -380,6 +382,7 @@ def collect_full_dashboard_context(session, request):
             'completed_products': completed_products,
             'applied_filters': {
                 'database_available': database_available,
+                'dashboard_metrics': dashboard_metrics,
                 'product_data': product_data
             }
         }
@@ -401,6 +404,7 @@ def collect_full_dashboard_context(session, request):
             # Add a flag to indicate if the database is available
             context.applied_filters = context.applied_filters or {}
             context.applied_filters['database_available'] = database_available
+            context.applied_filters['dashboard_metrics'] = dashboard_metrics
 
             # Add detailed product data to the context
             context.applied_filters['product_data'] = product_data
@@ -8,6 +8,7 @@ import os
 import sys
 import logging
 import importlib.metadata
+from collections import Counter
 from pathlib import Path
 
 # Configure logging
@@ -613,7 +614,19 @@ def initialize_mcp():
             # Execute the query, ordered by most recent first
             actions = query.order_by('-timestamp')[:limit]
 
-            if not actions:
+            # Raw actions only cover the retention window; the daily rollups hold the older totals
+            from django.contrib.auth.models import User
+            from dashboard.activity import activity_counts, raw_window_start
+            user_ids = None
+            if username:
+                user_ids = list(User.objects.filter(username__icontains=username).values_list('id', flat=True))
+            totals = activity_counts(user_ids=user_ids)
+            if action_type:
+                totals = Counter({
+                    type_name: count for type_name, count in totals.items() if action_type.lower() in type_name
+                })
+
+            if not actions and not totals:
                 filters = []
                 if username:
                     filters.append(f"username containing '{username}'")
@@ -626,6 +639,12 @@ def initialize_mcp():
             # Build the response
             response = f"Recent user activities (showing {len(actions)} of {query.count()}):\n\n"
 
+            if totals:
+                response += f"All-time totals by action type (daily rollups before {raw_window_start()}, individual actions since):\n"
+                for type_name, count in sorted(totals.items()):
+                    response += f"- {type_name}: {count}\n"
+                response += "\n"
+
             for i, action in enumerate(actions, 1):
                 response += f"{i}. User: {action.user.username}\n"
                 response += f"   Action: {action.action_type}\n"
@@ -684,12 +703,13 @@ def initialize_mcp():
 
             # Get data for the requested chart
             if chart_name == 'products_by_status':
-                # Count projects by status
-                statuses = dict(Project.STATUS_CHOICES)
-                counts = {}
-
-                for status_code, status_name in statuses.items():
-                    counts[status_name] = Project.objects.filter(status=status_code).count()
+                # Count projects by status in a single aggregate query
+                from dashboard.metrics import compute_dashboard_metrics
+                status_counts = compute_dashboard_metrics().status_counts
+                counts = {
+                    status_name: status_counts.get(status_code, 0)
+                    for status_code, status_name in Project.STATUS_CHOICES
+                }
 
                 response = "Products by Status:\n\n"
                 for status, count in counts.items():
@@ -0,0 +1,288 @@
+"""
+Retention for the UserAction audit table.
+
+Raw UserAction rows are kept for RETENTION_DAYS (settings.USER_ACTION_AUDIT).
+Before they expire they are summarized into UserActionDailyRollup rows, one
+per day, user, action type and model name, which are kept forever. The
+archive_user_actions command then streams the expired rows to gzipped NDJSON
+files and deletes them in chunks.
+
+activity_counts() reads rollups for days before the raw window and raw rows
+for the days inside it, so activity totals cover the whole history without
+counting a day twice.
+
+The action log page filters through the composite indexes of UserAction,
+searches details and model_name through a full-text index (migration 0051,
+built like the one in dashboard.search) and reads its filter dropdowns from a
+cache that writes to the table invalidate.
+"""
+import gzip
+import json
+import os
+import uuid
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.db.models import Count, Q, Sum, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .audit import audit_settings
+from .models import UserAction, UserActionDailyRollup
+from .search import search_terms
+
+FTS_TABLE = 'dashboard_useraction_fts'
+
+FACET_CACHE_VERSION_KEY = 'dashboard:user-action-facets:version'
+FACET_CACHE_TIMEOUT = 60 * 60
+
+# sort_by values of the action log and their orderings; each one is served by
+# an index of UserAction
+SORT_OPTIONS = {
+    '-timestamp': ('Newest First', ['-timestamp']),
+    'timestamp': ('Oldest First', ['timestamp']),
+    'action_type': ('Action Type (A-Z)', ['action_type', '-timestamp']),
+    'user': ('User', ['user', '-timestamp']),
+}
+DEFAULT_SORT = '-timestamp'
+
+ARCHIVE_CHUNK_SIZE = 5000
+
+ARCHIVE_FIELDS = ['id', 'user_id', 'action_type', 'model_name', 'record_id', 'details', 'ip_address', 'timestamp']
+
+
+def retention_days():
+    return audit_settings()['RETENTION_DAYS']
+
+
+def raw_window_start(today=None, days=None):
+    """First day whose raw UserAction rows are still kept."""
+    today = today or timezone.localdate()
+    return today - timedelta(days=retention_days() if days is None else days)
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+# Rollups
+
+def rollup_days(start, end):
+    """
+    (Re)build the rollups of the days in [start, end) from the raw rows.
+    Days are rebuilt whole, so running it twice for the same days is safe.
+    Days before the oldest raw row have been archived and keep their rollups.
+    Returns the number of rollup rows written.
+    """
+    oldest = UserAction.objects.order_by('timestamp').values_list('timestamp', flat=True).first()
+    if oldest is None:
+        return 0
+    start = max(start, timezone.localdate(oldest))
+    if start >= end:
+        return 0
+    rows = (
+        UserAction.objects.filter(timestamp__gte=_day_start(start), timestamp__lt=_day_start(end))
+        .annotate(day=TruncDate('timestamp'), model=Coalesce('model_name', Value('')))
+        .values('day', 'user_id', 'action_type', 'model')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    rollups = [
+        UserActionDailyRollup(
+            day=row['day'], user_id=row['user_id'], action_type=row['action_type'],
+            model_name=row['model'], count=row['count'],
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        UserActionDailyRollup.objects.filter(day__gte=start, day__lt=end).delete()
+        UserActionDailyRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
+
+
+def _rollup_pending_days(before):
+    """Roll up every day before `before` that still has raw rows."""
+    oldest = UserAction.objects.filter(timestamp__lt=_day_start(before)).order_by('timestamp').values_list(
+        'timestamp', flat=True
+    ).first()
+    if oldest is None:
+        return 0
+    return rollup_days(timezone.localdate(oldest), before)
+
+
+# Archiving
+
+def expired_actions(today=None, days=None):
+    """The UserAction rows older than the raw retention window."""
+    return UserAction.objects.filter(timestamp__lt=_day_start(raw_window_start(today, days)))
+
+
+def archive_expired_actions(archive_dir, today=None, days=None, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Roll up, archive and delete the rows older than the retention window.
+
+    Rows are read in primary key order, chunk_size at a time; each chunk is
+    appended to a gzipped NDJSON file in archive_dir and then deleted, so
+    memory use does not depend on the backlog. Returns (rows archived, path),
+    the path being None when nothing expired.
+    """
+    window_start = raw_window_start(today, days)
+    _rollup_pending_days(window_start)
+
+    expired = expired_actions(today, days).order_by('pk')
+    if not expired.exists():
+        return 0, None
+
+    os.makedirs(archive_dir, exist_ok=True)
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%S')
+    path = os.path.join(archive_dir, f'user_actions_before_{window_start:%Y%m%d}_{stamp}.ndjson.gz')
+    archived = 0
+    last_pk = 0
+    with gzip.open(path, 'wt', encoding='utf-8') as archive:
+        while True:
+            chunk = list(expired.filter(pk__gt=last_pk).values(*ARCHIVE_FIELDS)[:chunk_size])
+            if not chunk:
+                break
+            for row in chunk:
+                archive.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+            archive.flush()
+            last_pk = chunk[-1]['id']
+            UserAction.objects.filter(pk__in=[row['id'] for row in chunk]).delete()
+            archived += len(chunk)
+    invalidate_action_facets()
+    return archived, path
+
+
+# Action log filters
+
+def invalidate_action_facets():
+    """Invalidate the cached filter options of the action log."""
+    cache.set(FACET_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _facet_cache_version():
+    version = cache.get(FACET_CACHE_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(FACET_CACHE_VERSION_KEY, version, None)
+    return version
+
+
+def _cached_facet(name, build):
+    key = f'dashboard:user-action-facets:{name}:{_facet_cache_version()}'
+    options = cache.get(key)
+    if options is None:
+        options = build()
+        cache.set(key, options, FACET_CACHE_TIMEOUT)
+    return options
+
+
+def action_model_names():
+    """The distinct model names in the action log, sorted."""
+    return _cached_facet('model-names', lambda: list(
+        UserAction.objects.exclude(model_name__isnull=True).exclude(model_name='')
+        .order_by('model_name').values_list('model_name', flat=True).distinct()
+    ))
+
+
+def action_user_options():
+    """[{'id', 'username'}, ...] of every user, for the user dropdown."""
+    return _cached_facet('users', lambda: list(User.objects.order_by('username').values('id', 'username')))
+
+
+def note_written_actions(model_names):
+    """Invalidate the facets if newly written actions bring a model name they do not list."""
+    new_names = {name for name in model_names if name}
+    if new_names and not new_names.issubset(action_model_names()):
+        invalidate_action_facets()
+
+
+def sort_ordering(sort_by):
+    """Return (sort_by, ordering) for a sort_by parameter, falling back to the default sort."""
+    if sort_by not in SORT_OPTIONS:
+        sort_by = DEFAULT_SORT
+    return sort_by, SORT_OPTIONS[sort_by][1]
+
+
+# Action log search
+
+def action_search_vector():
+    """The tsvector used by the PostgreSQL backend (and its GIN index)."""
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector('details', 'model_name', config='simple')
+
+
+def search_actions(queryset, text):
+    """
+    Filter UserActions to those whose details or model name contain every
+    term of text as a word prefix, or whose user's username contains text.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+    users = User.objects.filter(username__icontains=text.strip()).values('id')
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        matches = Q(id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,)))
+    elif vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery
+        query = SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config='simple')
+        queryset = queryset.annotate(search=action_search_vector())
+        matches = Q(search=query)
+    else:
+        matches = Q()
+        for term in terms:
+            matches &= Q(details__icontains=term) | Q(model_name__icontains=term)
+    return queryset.filter(matches | Q(user_id__in=users))
+
+
+# Reading
+
+def activity_counts(start=None, end=None, user_ids=None, action_type=None, model_name=None, group_by='action_type',
+                    today=None):
+    """
+    Return a Counter of actions in [start, end) (dates, both optional) keyed
+    by group_by ('action_type', 'day' or 'user_id'), reading rollups before
+    the raw window and raw rows inside it.
+    """
+    window_start = raw_window_start(today)
+    counts = Counter()
+
+    if start is None or start < window_start:
+        rollups = UserActionDailyRollup.objects.filter(day__lt=window_start)
+        if start is not None:
+            rollups = rollups.filter(day__gte=start)
+        if end is not None:
+            rollups = rollups.filter(day__lt=end)
+        if user_ids is not None:
+            rollups = rollups.filter(user_id__in=user_ids)
+        if action_type:
+            rollups = rollups.filter(action_type=action_type)
+        if model_name:
+            rollups = rollups.filter(model_name=model_name)
+        for row in rollups.values(group_by).annotate(total=Sum('count')).order_by():
+            counts[row[group_by]] += row['total']
+
+    if end is None or end > window_start:
+        actions = UserAction.objects.filter(timestamp__gte=_day_start(max(start or window_start, window_start)))
+        if end is not None:
+            actions = actions.filter(timestamp__lt=_day_start(end))
+        if user_ids is not None:
+            actions = actions.filter(user_id__in=user_ids)
+        if action_type:
+            actions = actions.filter(action_type=action_type)
+        if model_name:
+            actions = actions.filter(model_name=model_name)
+        if group_by == 'day':
+            actions = actions.annotate(day=TruncDate('timestamp'))
+        for row in actions.values(group_by).annotate(total=Count('id')).order_by():
+            counts[row[group_by]] += row['total']
+
+    return counts
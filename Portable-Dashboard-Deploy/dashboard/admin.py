@@ -295,15 +295,15 @@ class RecordsPasswordAdmin(admin.ModelAdmin):
 
 @admin.register(DeletedRecord)
 class DeletedRecordAdmin(admin.ModelAdmin):
-    list_display = ('model_name', 'record_id', 'deleted_at', 'deleted_by')
+    list_display = ('model_name', 'record_id', 'related_count', 'deleted_at', 'deleted_by')
     list_filter = ('model_name', 'deleted_at')
     search_fields = ('model_name', 'record_id', 'data')
     date_hierarchy = 'deleted_at'
-    readonly_fields = ('model_name', 'record_id', 'data', 'deleted_at', 'deleted_by')
+    readonly_fields = ('model_name', 'record_id', 'related_count', 'data', 'deleted_at', 'deleted_by')
 
     fieldsets = (
         ('Record Information', {
-            'fields': ('model_name', 'record_id', 'deleted_by', 'deleted_at')
+            'fields': ('model_name', 'record_id', 'related_count', 'deleted_by', 'deleted_at')
         }),
         ('Data', {
             'fields': ('data',),
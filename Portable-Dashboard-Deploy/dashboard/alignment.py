@@ -0,0 +1,70 @@
+"""
+Resource alignment queries.
+
+The resource alignment page and its export read the same assignment rows:
+the page prefetches them for the products of the current page only, the
+export streams them in chunks. The assignment picker searches resources on
+demand instead of rendering every resource into the page.
+"""
+from django.db.models import Prefetch, Q
+
+from .models import ProjectResource, Resource
+
+# Rows fetched per round trip when streaming the export
+EXPORT_CHUNK_SIZE = 2000
+
+# Default and largest number of resources returned by one picker search
+PICKER_LIMIT = 20
+MAX_PICKER_LIMIT = 50
+
+EXPORT_FIELDS = [
+    'product_name', 'product_status', 'resource_name', 'resource_role',
+    'resource_skill', 'hours_allocated', 'utilization_percentage', 'eta', 'notes',
+]
+
+
+def alignment_assignments(status=None, team_lead=None):
+    """Return the project assignments shown on the alignment page, filtered like its products."""
+    queryset = ProjectResource.objects.select_related('project', 'resource').order_by('project_id', 'pk')
+    if status:
+        queryset = queryset.filter(project__status=status)
+    if team_lead:
+        queryset = queryset.filter(project__team_lead_id=team_lead)
+    return queryset
+
+
+def alignment_prefetch():
+    """Prefetch of a product queryset's assignments into product.alignment_assignments."""
+    return Prefetch('projectresource_set', queryset=alignment_assignments(), to_attr='alignment_assignments')
+
+
+def export_rows(status=None, team_lead=None):
+    """Yield one export dict per assignment, reading the rows in chunks."""
+    for pr in alignment_assignments(status, team_lead).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            'product_name': pr.project.name,
+            'product_status': pr.project.get_status_display(),
+            'resource_name': pr.resource.name,
+            'resource_role': pr.resource.role,
+            'resource_skill': pr.resource.get_skill_display(),
+            'hours_allocated': pr.hours_allocated,
+            'utilization_percentage': pr.utilization_percentage,
+            'eta': pr.eta,
+            'notes': pr.notes,
+        }
+
+
+def search_resources(text='', exclude_project=None, limit=PICKER_LIMIT):
+    """
+    Return (resources, has_more) for the assignment picker: resources whose
+    name, role or email contains text, ordered by name, leaving out those
+    already assigned to exclude_project.
+    """
+    limit = max(1, min(limit, MAX_PICKER_LIMIT))
+    queryset = Resource.objects.only('id', 'name', 'role', 'skill').order_by('name', 'pk')
+    if text:
+        queryset = queryset.filter(Q(name__icontains=text) | Q(role__icontains=text) | Q(email__icontains=text))
+    if exclude_project:
+        queryset = queryset.exclude(projectresource__project_id=exclude_project)
+    resources = list(queryset[:limit + 1])
+    return resources[:limit], len(resources) > limit
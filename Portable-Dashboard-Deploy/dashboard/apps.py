@@ -8,3 +8,5 @@ class DashboardConfig(AppConfig):
     def ready(self):
         # Import the custom_filters module to ensure it's loaded
         import dashboard.templatetags.custom_filters
+        # Register signal handlers that maintain denormalized dashboard data
+        import dashboard.signals
@@ -0,0 +1,212 @@
+"""
+Buffered writer for the user action audit log.
+
+UserActionMiddleware only builds a small AuditRecord per request and hands it
+to the process-wide AuditWriter, which queues it in memory. A background
+thread writes the queue with bulk_create every BATCH_SIZE records or
+FLUSH_INTERVAL_MS milliseconds, whichever comes first, so requests never wait
+on an audit INSERT. The queue is flushed when the process exits.
+
+Configured by settings.USER_ACTION_AUDIT (see DEFAULT_SETTINGS). When the
+queue is full, OVERFLOW decides what happens to a new record:
+
+- 'drop': discard it (counted in AuditWriter.dropped)
+- 'block': wait up to BLOCK_TIMEOUT_MS for room, then discard it
+- 'sync': write the queued records and the new one in the request thread
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {
+    'ENABLED': True,
+    'MAX_QUEUE_SIZE': 10000,
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL_MS': 500,
+    'OVERFLOW': 'drop',
+    'BLOCK_TIMEOUT_MS': 50,
+    'RETENTION_DAYS': 90,
+    'ARCHIVE_DIR': 'archive/user_actions',
+}
+
+OVERFLOW_POLICIES = ('drop', 'block', 'sync')
+
+
+@dataclass(frozen=True)
+class AuditRecord:
+    """The fields of one UserAction, captured at request time."""
+    user_id: int
+    action_type: str
+    model_name: Optional[str]
+    record_id: Optional[int]
+    details: str
+    ip_address: Optional[str]
+    timestamp: datetime
+
+
+def audit_settings():
+    return {**DEFAULT_SETTINGS, **getattr(settings, 'USER_ACTION_AUDIT', {})}
+
+
+def write_user_actions(records):
+    """Insert a batch of AuditRecords as UserAction rows."""
+    from .activity import note_written_actions
+    from .models import UserAction
+
+    UserAction.objects.bulk_create([
+        UserAction(
+            user_id=record.user_id,
+            action_type=record.action_type,
+            model_name=record.model_name,
+            record_id=record.record_id,
+            details=record.details,
+            ip_address=record.ip_address,
+            timestamp=record.timestamp,
+        )
+        for record in records
+    ])
+    note_written_actions(record.model_name for record in records)
+
+
+class AuditWriter:
+    """Bounded in-memory queue of AuditRecords drained by a background flusher thread."""
+
+    def __init__(self, max_queue_size=10000, batch_size=200, flush_interval_ms=500, overflow='drop',
+                 block_timeout_ms=50, write=write_user_actions):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f'overflow must be one of {", ".join(OVERFLOW_POLICIES)}')
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.overflow = overflow
+        self.block_timeout = block_timeout_ms / 1000
+        self.write = write
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_settings(cls):
+        options = audit_settings()
+        return cls(
+            max_queue_size=options['MAX_QUEUE_SIZE'],
+            batch_size=options['BATCH_SIZE'],
+            flush_interval_ms=options['FLUSH_INTERVAL_MS'],
+            overflow=options['OVERFLOW'],
+            block_timeout_ms=options['BLOCK_TIMEOUT_MS'],
+        )
+
+    def enqueue(self, record):
+        """Queue a record for the flusher. Returns False if the overflow policy discarded it."""
+        self._ensure_started()
+        try:
+            if self.overflow == 'block':
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            if self.overflow == 'sync':
+                self._write_batch(self._drain() + [record])
+                return True
+            self.dropped += 1
+            return False
+
+    def flush(self):
+        """Write everything queued so far in the calling thread. Returns the number of records written."""
+        written = 0
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return written
+            self._write_batch(batch)
+            written += len(batch)
+
+    def stop(self, timeout=5):
+        """Stop the flusher thread and write what is left in the queue."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    # Internals
+
+    def _ensure_started(self):
+        if self._thread is not None or self._stopping.is_set():
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='user-action-audit', daemon=True)
+                self._thread.start()
+
+    def _drain(self, limit=None):
+        records = []
+        while limit is None or len(records) < limit:
+            try:
+                records.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return records
+
+    def _collect(self):
+        """Wait for a batch: up to batch_size records or until flush_interval has passed since the first one."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+        with self._write_lock:
+            try:
+                self.write(batch)
+            except Exception:
+                logger.exception('Could not write %d user actions', len(batch))
+                # Do not keep a broken connection for the next batch
+                connection.close()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                close_old_connections()
+                self._write_batch(batch)
+        connection.close()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer():
+    """Return the process-wide AuditWriter, creating it (and its shutdown flush) on first use."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditWriter.from_settings()
+                atexit.register(_writer.stop)
+    return _writer
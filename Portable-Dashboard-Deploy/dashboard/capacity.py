@@ -0,0 +1,294 @@
+"""
+Resource capacity engine.
+
+Builds a resources x days matrix of allocated utilization from the date ranges
+of ProjectResource assignments, removes the capacity of weekends and
+ResourceLeave days, and reports over-allocation intervals, free capacity and
+team rollups by lead.
+
+Only three queries are made (resources, assignments, leaves); the matrix is
+filled with NumPy difference arrays and every report is vectorized, so a
+year-long horizon for hundreds of resources is computed in milliseconds.
+
+Assignments without an end date are treated as ongoing until the end of the
+horizon. Utilization is expressed in percent of one person's day.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+from django.db.models import Q
+
+from .models import ProjectResource, Resource, ResourceHierarchy, ResourceLeave
+
+FULL_CAPACITY = 100.0
+
+# Default and longest horizon of a capacity request
+DEFAULT_HORIZON_DAYS = 30
+MAX_HORIZON_DAYS = 366
+
+
+@dataclass
+class CapacityMatrix:
+    """
+    Daily capacity of a list of resources over [start, end].
+
+    allocated and capacity are (resources, days) arrays in percent; capacity is
+    100 on working days and 0 on weekends and leave days.
+    """
+    start: object
+    end: object
+    resources: list
+    allocated: np.ndarray
+    capacity: np.ndarray
+    working_days: np.ndarray
+
+    @property
+    def days(self):
+        return self.allocated.shape[1]
+
+    def dates(self):
+        return [self.start + timedelta(days=offset) for offset in range(self.days)]
+
+    @property
+    def free(self):
+        return np.clip(self.capacity - self.allocated, 0, None)
+
+    @property
+    def over(self):
+        return self.allocated > self.capacity
+
+    @property
+    def on_leave(self):
+        return (self.capacity == 0) & self.working_days
+
+
+def parse_horizon(start, end, today):
+    """
+    Parse optional start / end ISO dates (inclusive). The horizon defaults to
+    DEFAULT_HORIZON_DAYS days from today.
+
+    Raises:
+        ValueError: If a date is invalid or the horizon is empty or too long
+    """
+    start = date.fromisoformat(start) if start else today
+    end = date.fromisoformat(end) if end else start + timedelta(days=DEFAULT_HORIZON_DAYS - 1)
+    if end < start:
+        raise ValueError('end must not be before start')
+    if (end - start).days >= MAX_HORIZON_DAYS:
+        raise ValueError(f'the horizon cannot exceed {MAX_HORIZON_DAYS} days')
+    return start, end
+
+
+def team_resource_ids(lead_id):
+    """Return the ids of every resource below a lead in the lead chain."""
+    return list(
+        ResourceHierarchy.objects.filter(ancestor_id=lead_id, relation='lead').values_list('descendant_id', flat=True)
+    )
+
+
+def _accumulate(rows, starts, ends, values, shape):
+    """Sum values over the inclusive [start, end] day spans of each row with a difference array."""
+    delta = np.zeros((shape[0], shape[1] + 1))
+    np.add.at(delta, (rows, starts), values)
+    np.add.at(delta, (rows, ends + 1), -values)
+    # Rounding removes the float residue of adding and subtracting e.g. 33.33
+    return np.round(np.cumsum(delta[:, :-1], axis=1), 6)
+
+
+def _spans(records, index, start, end):
+    """Turn (resource_id, start_date, end_date, value) records into clipped row/day arrays."""
+    last_day = (end - start).days
+    rows, starts, ends, values = [], [], [], []
+    for resource_id, span_start, span_end, value in records:
+        rows.append(index[resource_id])
+        starts.append(max((span_start - start).days, 0))
+        ends.append(min((span_end - start).days, last_day) if span_end else last_day)
+        values.append(value)
+    return (
+        np.array(rows, dtype=np.intp),
+        np.array(starts, dtype=np.intp),
+        np.array(ends, dtype=np.intp),
+        np.array(values, dtype=float),
+    )
+
+
+def build_capacity_matrix(start, end, resource_ids=None):
+    """
+    Build the CapacityMatrix of [start, end] (inclusive) for the given
+    resources, or for every resource when resource_ids is None.
+    """
+    resources = Resource.objects.only('id', 'name', 'lead_id').order_by('name', 'pk')
+    if resource_ids is not None:
+        resources = resources.filter(id__in=resource_ids)
+    resources = list(resources)
+    index = {resource.id: row for row, resource in enumerate(resources)}
+    shape = (len(resources), (end - start).days + 1)
+
+    assignments = ProjectResource.objects.filter(start_date__lte=end).filter(
+        Q(end_date__gte=start) | Q(end_date__isnull=True)
+    )
+    leaves = ResourceLeave.objects.filter(start_date__lte=end, end_date__gte=start)
+    if resource_ids is not None:
+        assignments = assignments.filter(resource_id__in=index)
+        leaves = leaves.filter(resource_id__in=index)
+
+    rows, starts, ends, values = _spans(
+        assignments.values_list('resource_id', 'start_date', 'end_date', 'utilization_percentage'), index, start, end
+    )
+    allocated = _accumulate(rows, starts, ends, values, shape)
+
+    rows, starts, ends, values = _spans(
+        ((resource_id, leave_start, leave_end, 1) for resource_id, leave_start, leave_end
+         in leaves.values_list('resource_id', 'start_date', 'end_date')),
+        index, start, end,
+    )
+    on_leave = _accumulate(rows, starts, ends, values, shape) > 0
+
+    working_days = (np.arange(shape[1]) + start.weekday()) % 7 < 5
+    capacity = np.where(on_leave | ~working_days, 0.0, FULL_CAPACITY)
+    # Assignments only book working days
+    allocated = allocated * working_days
+    return CapacityMatrix(start, end, resources, allocated, capacity, working_days)
+
+
+def _bridge_non_working_days(over, working_days):
+    """Mark weekends that sit between two over-allocated working days, so intervals are not split by them."""
+    days = np.arange(len(working_days))
+    previous_working = np.maximum.accumulate(np.where(working_days, days, 0))
+    next_working = np.minimum.accumulate(np.where(working_days, days, len(days) - 1)[::-1])[::-1]
+    bridged = ~working_days & over[:, previous_working] & over[:, next_working]
+    return over | bridged
+
+
+def over_allocation_intervals(matrix):
+    """
+    Return {resource_id: [interval, ...]} for the resources that are booked
+    above their capacity. Each interval has start / end dates (inclusive), the
+    number of working days and the peak utilization.
+    """
+    over = _bridge_non_working_days(matrix.over, matrix.working_days)
+    padded = np.zeros((over.shape[0], over.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = over
+    edges = np.diff(padded, axis=1)
+    # np.nonzero walks row by row, so rising and falling edges pair up
+    rise_rows, rise_days = np.nonzero(edges == 1)
+    _, fall_days = np.nonzero(edges == -1)
+
+    intervals = {}
+    for row, first, stop in zip(rise_rows.tolist(), rise_days.tolist(), fall_days.tolist()):
+        intervals.setdefault(matrix.resources[row].id, []).append({
+            'start': matrix.start + timedelta(days=first),
+            'end': matrix.start + timedelta(days=stop - 1),
+            'working_days': int(matrix.working_days[first:stop].sum()),
+            'peak_utilization': float(matrix.allocated[row, first:stop].max()),
+        })
+    return intervals
+
+
+def resource_totals(matrix):
+    """Per-resource totals in person-days as a dict of arrays aligned with matrix.resources."""
+    return {
+        'capacity_days': matrix.capacity.sum(axis=1) / FULL_CAPACITY,
+        'allocated_days': matrix.allocated.sum(axis=1) / FULL_CAPACITY,
+        'free_days': matrix.free.sum(axis=1) / FULL_CAPACITY,
+        'over_days': matrix.over.sum(axis=1),
+        'peak_utilization': matrix.allocated.max(axis=1, initial=0),
+    }
+
+
+def team_rollups(matrix, totals=None):
+    """
+    Roll resource totals up to every lead's team (all resources below them in
+    the lead chain that are part of the matrix).
+    """
+    totals = totals if totals is not None else resource_totals(matrix)
+    index = {resource.id: row for row, resource in enumerate(matrix.resources)}
+    members = {}
+    for lead_id, resource_id in ResourceHierarchy.objects.filter(
+        relation='lead', descendant_id__in=index
+    ).values_list('ancestor_id', 'descendant_id'):
+        members.setdefault(lead_id, []).append(index[resource_id])
+    lead_names = dict(Resource.objects.filter(id__in=members).values_list('id', 'name'))
+
+    rollups = []
+    for lead_id, rows in members.items():
+        rows = np.array(sorted(rows), dtype=np.intp)
+        capacity_days = float(totals['capacity_days'][rows].sum())
+        allocated_days = float(totals['allocated_days'][rows].sum())
+        rollups.append({
+            'lead_id': lead_id,
+            'lead_name': lead_names.get(lead_id, ''),
+            'members': len(rows),
+            'capacity_days': capacity_days,
+            'allocated_days': allocated_days,
+            'free_days': float(totals['free_days'][rows].sum()),
+            'utilization': round(allocated_days / capacity_days * FULL_CAPACITY, 1) if capacity_days else None,
+            'over_allocated_members': int((totals['over_days'][rows] > 0).sum()),
+        })
+    return sorted(rollups, key=lambda rollup: rollup['lead_name'])
+
+
+def weekly_utilization(matrix):
+    """
+    Collapse the matrix to weeks for long horizons. Returns (week start dates,
+    mean utilization per resource and week over its working days, whether any
+    day of the week is over-allocated).
+    """
+    week_index = (np.arange(matrix.days) + matrix.start.weekday()) // 7
+    week_count = int(week_index[-1]) + 1 if matrix.days else 0
+    working = matrix.working_days.astype(float)
+
+    allocated = np.zeros((len(matrix.resources), week_count))
+    working_per_week = np.zeros(week_count)
+    over = np.zeros((len(matrix.resources), week_count), dtype=bool)
+    np.add.at(allocated.T, week_index, matrix.allocated.T)
+    np.add.at(working_per_week, week_index, working)
+    np.logical_or.at(over.T, week_index, matrix.over.T)
+
+    utilization = allocated / np.maximum(working_per_week, 1)
+    week_starts = [matrix.start + timedelta(days=int(offset)) for offset in np.flatnonzero(np.diff(week_index, prepend=-1))]
+    return week_starts, utilization, over
+
+
+def capacity_report(matrix):
+    """JSON-ready report of a CapacityMatrix: per-resource totals and over-allocations, and team rollups."""
+    totals = resource_totals(matrix)
+    intervals = over_allocation_intervals(matrix)
+    return {
+        'start': matrix.start.isoformat(),
+        'end': matrix.end.isoformat(),
+        'days': matrix.days,
+        'resources': [
+            {
+                'id': resource.id,
+                'name': resource.name,
+                'lead_id': resource.lead_id,
+                'capacity_days': float(totals['capacity_days'][row]),
+                'allocated_days': float(totals['allocated_days'][row]),
+                'free_days': float(totals['free_days'][row]),
+                'peak_utilization': float(totals['peak_utilization'][row]),
+                'over_allocations': [
+                    {**interval, 'start': interval['start'].isoformat(), 'end': interval['end'].isoformat()}
+                    for interval in intervals.get(resource.id, [])
+                ],
+            }
+            for row, resource in enumerate(matrix.resources)
+        ],
+        'teams': team_rollups(matrix, totals),
+    }
+
+
+# Heatmap cell levels, in np.select priority order
+HEATMAP_LEVELS = ['over', 'off', 'leave', 'free', 'partial', 'full']
+
+
+def heatmap_levels(utilization, over, working=None, on_leave=None):
+    """
+    Classify heatmap cells: 'over' when above capacity, 'off' on non-working
+    days, 'leave' on leave days, then 'free' (0%), 'partial' (<100%) or 'full'.
+    """
+    off = np.zeros_like(over) if working is None else ~np.broadcast_to(working, over.shape)
+    leave = np.zeros_like(over) if on_leave is None else on_leave
+    conditions = [over, off, leave, utilization <= 0, utilization < FULL_CAPACITY]
+    return np.select(conditions, HEATMAP_LEVELS[:-1], default=HEATMAP_LEVELS[-1])
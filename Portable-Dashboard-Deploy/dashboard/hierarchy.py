@@ -0,0 +1,211 @@
+"""
+Reporting hierarchy helpers.
+
+The ResourceHierarchy closure table stores every (ancestor, descendant) pair of
+the Resource.lead and Resource.manager chains. This module keeps it up to date
+and exposes the access rules used by the feedback views:
+
+- a lead sees every resource below them in the lead chain (all levels)
+- a manager sees all resources
+- anybody else only sees their own resource
+
+Data about a single resource, such as its feedback detail (can_view_resource),
+is visible only to the resource itself and to those above it in its lead or
+manager chain.
+
+The resolved scope for a user is cached and invalidated whenever a Resource
+changes, so resolving visibility costs at most one indexed join per request.
+"""
+import logging
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+
+from .models import Resource, ResourceHierarchy
+
+logger = logging.getLogger(__name__)
+
+# Resource field holding the parent for each relation
+PARENT_FIELDS = {
+    'lead': 'lead_id',
+    'manager': 'manager_id',
+}
+
+ACCESS_CACHE_VERSION_KEY = 'dashboard:resource-access:version'
+ACCESS_CACHE_TIMEOUT = getattr(settings, 'RESOURCE_ACCESS_CACHE_TIMEOUT', 300)
+
+AccessScope = namedtuple('AccessScope', ['resource_id', 'role'])
+
+
+def compute_closure(parents):
+    """
+    Compute closure rows from a {node_id: parent_id} mapping.
+
+    Returns a list of (ancestor_id, descendant_id, depth) tuples. Cycles in the
+    data are cut at the first repeated node.
+    """
+    rows = []
+    for node in parents:
+        seen = {node}
+        parent = parents.get(node)
+        depth = 1
+        while parent is not None and parent not in seen:
+            rows.append((parent, node, depth))
+            seen.add(parent)
+            parent = parents.get(parent)
+            depth += 1
+    return rows
+
+
+def rebuild_resource_hierarchy():
+    """Rebuild the whole closure table from Resource.lead / Resource.manager."""
+    resources = list(Resource.objects.values_list('id', 'lead_id', 'manager_id'))
+    rows = []
+    for relation, index in (('lead', 1), ('manager', 2)):
+        parents = {resource[0]: resource[index] for resource in resources}
+        rows.extend(
+            ResourceHierarchy(ancestor_id=ancestor, descendant_id=descendant, depth=depth, relation=relation)
+            for ancestor, descendant, depth in compute_closure(parents)
+        )
+
+    with transaction.atomic():
+        ResourceHierarchy.objects.all().delete()
+        ResourceHierarchy.objects.bulk_create(rows, batch_size=500)
+
+    invalidate_access_cache()
+    return len(rows)
+
+
+def move_resource(resource_id, relation, new_parent_id):
+    """
+    Re-attach a resource (and everything below it) under a new parent.
+
+    Passing new_parent_id=None detaches the subtree from its current ancestors.
+    """
+    subtree = {resource_id: 0}
+    subtree.update(
+        ResourceHierarchy.objects.filter(ancestor_id=resource_id, relation=relation)
+        .values_list('descendant_id', 'depth')
+    )
+
+    if new_parent_id in subtree:
+        # Keep the current links rather than leaving the subtree detached
+        logger.warning(
+            "Resource %s cannot report to %s through %s: that would create a cycle",
+            resource_id, new_parent_id, relation,
+        )
+        return
+
+    with transaction.atomic():
+        ResourceHierarchy.objects.filter(
+            relation=relation, descendant_id__in=subtree
+        ).exclude(ancestor_id__in=subtree).delete()
+
+        if new_parent_id is None:
+            return
+
+        ancestors = {new_parent_id: 0}
+        ancestors.update(
+            ResourceHierarchy.objects.filter(descendant_id=new_parent_id, relation=relation)
+            .values_list('ancestor_id', 'depth')
+        )
+        ResourceHierarchy.objects.bulk_create([
+            ResourceHierarchy(
+                ancestor_id=ancestor,
+                descendant_id=descendant,
+                depth=ancestor_depth + 1 + descendant_depth,
+                relation=relation,
+            )
+            for ancestor, ancestor_depth in ancestors.items()
+            for descendant, descendant_depth in subtree.items()
+        ], batch_size=500)
+
+
+def detach_resource(resource_id):
+    """
+    Remove the links between a resource's ancestors and its descendants.
+    Called before a resource is deleted; its own rows are removed by the cascade.
+    """
+    for relation in PARENT_FIELDS:
+        descendants = list(
+            ResourceHierarchy.objects.filter(ancestor_id=resource_id, relation=relation)
+            .values_list('descendant_id', flat=True)
+        )
+        if descendants:
+            ResourceHierarchy.objects.filter(
+                relation=relation, descendant_id__in=descendants
+            ).exclude(ancestor_id__in=descendants + [resource_id]).delete()
+
+
+def invalidate_access_cache():
+    """Invalidate every cached access scope."""
+    cache.set(ACCESS_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _access_cache_version():
+    version = cache.get(ACCESS_CACHE_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(ACCESS_CACHE_VERSION_KEY, version, None)
+    return version
+
+
+def get_access_scope(user):
+    """
+    Return the AccessScope (linked resource id and role) for a user.
+    The role is 'lead', 'manager', 'self' or None when the user has no resource.
+    """
+    if not user.is_authenticated:
+        return AccessScope(None, None)
+
+    key = f'dashboard:resource-access:{_access_cache_version()}:{user.pk}'
+    scope = cache.get(key)
+    if scope is None:
+        direct_reports = ResourceHierarchy.objects.filter(ancestor=OuterRef('pk'), depth=1)
+        resource = Resource.objects.filter(user=user).annotate(
+            is_lead=Exists(direct_reports.filter(relation='lead')),
+            is_manager=Exists(direct_reports.filter(relation='manager')),
+        ).values('id', 'is_lead', 'is_manager').first()
+
+        if resource is None:
+            scope = (None, None)
+        elif resource['is_lead']:
+            scope = (resource['id'], 'lead')
+        elif resource['is_manager']:
+            scope = (resource['id'], 'manager')
+        else:
+            scope = (resource['id'], 'self')
+        cache.set(key, scope, ACCESS_CACHE_TIMEOUT)
+    return AccessScope(*scope)
+
+
+def accessible_resources(user):
+    """Return a queryset of the resources the user is allowed to see."""
+    scope = get_access_scope(user)
+    if scope.role == 'manager':
+        return Resource.objects.all()
+    if scope.role == 'lead':
+        return Resource.objects.filter(
+            reporting_ancestors__ancestor_id=scope.resource_id,
+            reporting_ancestors__relation='lead',
+        )
+    if scope.role == 'self':
+        return Resource.objects.filter(pk=scope.resource_id)
+    return Resource.objects.none()
+
+
+def can_view_resource(user, resource):
+    """
+    Return True if the user may see data about the given resource: it is their
+    own resource or they are above it in its lead or manager chain.
+    """
+    scope = get_access_scope(user)
+    if scope.resource_id is None:
+        return False
+    if scope.resource_id == resource.pk:
+        return True
+    return ResourceHierarchy.objects.filter(ancestor_id=scope.resource_id, descendant_id=resource.pk).exists()
@@ -1,7 +1,7 @@
 import csv
 import io
 import pandas as pd
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect
 from django.urls import reverse
 from django.views import View
@@ -10,7 +10,24 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.mixins import LoginRequiredMixin
 
-from .models import Resource, Project, ProjectResource
+from .alignment import EXPORT_FIELDS, export_rows
+from .models import Resource, Project
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows, fieldnames):
+    """Yield the CSV lines of a header and dict rows without buffering the whole file."""
+    writer = csv.DictWriter(_Echo(), fieldnames=fieldnames)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
 
 # Resource Import/Export Views
 class ResourceExportView(View):
@@ -350,52 +367,17 @@ class ResourceAlignmentExportView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
         format_type = request.GET.get('format', 'excel')  # Default to Excel format
 
-        # Get all project resources with related project and resource data
-        project_resources = ProjectResource.objects.select_related('project', 'resource').all()
-
-        # Filter by status if provided
-        status = request.GET.get('status')
-        if status:
-            project_resources = project_resources.filter(project__status=status)
-
-        # Filter by team lead if provided
-        team_lead = request.GET.get('team_lead')
-        if team_lead:
-            project_resources = project_resources.filter(project__team_lead_id=team_lead)
-
-        # Prepare data for export
-        export_data = []
-        for pr in project_resources:
-            export_data.append({
-                'product_name': pr.project.name,
-                'product_status': pr.project.get_status_display(),
-                'resource_name': pr.resource.name,
-                'resource_role': pr.resource.role,
-                'resource_skill': pr.resource.get_skill_display(),
-                'hours_allocated': pr.hours_allocated,
-                'utilization_percentage': pr.utilization_percentage,
-                'eta': pr.eta,
-                'notes': pr.notes
-            })
+        # Stream the same assignment rows the alignment page shows
+        rows = export_rows(request.GET.get('status'), request.GET.get('team_lead'))
 
         if format_type == 'csv':
-            response = HttpResponse(content_type='text/csv')
+            response = StreamingHttpResponse(_csv_lines(rows, EXPORT_FIELDS), content_type='text/csv')
             response['Content-Disposition'] = 'attachment; filename="resource_alignment.csv"'
-
-            fieldnames = ['product_name', 'product_status', 'resource_name', 'resource_role', 
-                         'resource_skill', 'hours_allocated', 'utilization_percentage', 'eta', 'notes']
-
-            writer = csv.DictWriter(response, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for item in export_data:
-                writer.writerow(item)
-
             return response
 
         elif format_type == 'excel':
             # Convert to DataFrame
-            df = pd.DataFrame(export_data)
+            df = pd.DataFrame(rows, columns=EXPORT_FIELDS)
 
             # Create a response with Excel content type
             response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
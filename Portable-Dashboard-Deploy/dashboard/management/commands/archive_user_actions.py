@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.activity import ARCHIVE_CHUNK_SIZE, archive_expired_actions
+from dashboard.audit import audit_settings
+
+
+class Command(BaseCommand):
+    help = ('Roll up the user actions older than the retention window, archive them to a gzipped NDJSON file '
+            'and delete them')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            help='Days of raw user actions to keep (default: USER_ACTION_AUDIT["RETENTION_DAYS"])',
+        )
+        parser.add_argument(
+            '--archive-dir',
+            help='Directory for the archive files (default: USER_ACTION_AUDIT["ARCHIVE_DIR"])',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=ARCHIVE_CHUNK_SIZE,
+            help=f'Rows archived and deleted per round trip (default: {ARCHIVE_CHUNK_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        archive_dir = options['archive_dir'] or audit_settings()['ARCHIVE_DIR']
+        archived, path = archive_expired_actions(
+            archive_dir, days=options['retention_days'], chunk_size=options['chunk_size'],
+        )
+        if not archived:
+            self.stdout.write(self.style.SUCCESS('No expired user actions to archive'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'Archived and deleted {archived} user actions to {path}'))
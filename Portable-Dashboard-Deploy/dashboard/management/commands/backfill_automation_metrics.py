@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from dashboard.timeseries import backfill_automation_metrics
+
+
+class Command(BaseCommand):
+    help = 'Backfill the automation metric time series from the WeeklyProjectUpdate history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Number of updates processed per batch')
+
+    def handle(self, *args, **options):
+        point_count = backfill_automation_metrics(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Automation metric time series backfilled with {point_count} points'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from dashboard.models import Quarter, QuarterSummary
+
+
+class Command(BaseCommand):
+    help = 'Write the QuarterSummary snapshot of completed quarters that do not have one yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--refresh', action='store_true', help='Recompute the snapshots that already exist as well')
+
+    def handle(self, *args, **options):
+        quarters = Quarter.objects.filter(completed=True).order_by('year', 'quarter_number')
+        if not options['refresh']:
+            quarters = quarters.filter(summary__isnull=True)
+
+        written = 0
+        for quarter in quarters:
+            with transaction.atomic():
+                QuarterSummary.capture(quarter)
+            written += 1
+        self.stdout.write(self.style.SUCCESS(f'{written} quarter summaries written'))
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from dashboard.recycle import BULK_CHUNK_SIZE, bulk_purge, expired_records
+
+
+class Command(BaseCommand):
+    help = ('Permanently delete the recycle bin records older than the retention period; '
+            'schedule it daily')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Keep records deleted within this many days (default: RECYCLE_BIN_RETENTION_DAYS)',
+        )
+        parser.add_argument(
+            '--model',
+            help='Only purge deleted records of this model (e.g. Project)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=BULK_CHUNK_SIZE,
+            help=f'Records deleted per transaction (default: {BULK_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many records would be purged',
+        )
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.RECYCLE_BIN_RETENTION_DAYS
+        queryset = expired_records(days)
+        if options['model']:
+            queryset = queryset.filter(model_name=options['model'])
+
+        if options['dry_run']:
+            self.stdout.write(f'{queryset.count()} deleted records are older than {days} days')
+            return
+
+        result = bulk_purge(
+            queryset,
+            chunk_size=options['chunk_size'],
+            progress=lambda result: self.stdout.write(f'Purged {result.done} of {result.total}'),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Purged {result.done} deleted records older than {days} days'))
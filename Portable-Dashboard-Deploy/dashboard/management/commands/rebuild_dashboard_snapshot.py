@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from dashboard.models import DashboardSnapshot
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized dashboard snapshot from the source tables'
+
+    def handle(self, *args, **options):
+        snapshot = DashboardSnapshot.rebuild()
+
+        self.stdout.write(f'Products: {snapshot.total_products} '
+                          f'(active {snapshot.active_products}, completed {snapshot.completed_products})')
+        self.stdout.write(f'Resources: {snapshot.total_resources}, assignments: {snapshot.total_assignments}')
+        self.stdout.write(f'Submitted feedback for {snapshot.feedback_month}/{snapshot.feedback_year}: '
+                          f'{snapshot.submitted_feedbacks}')
+        self.stdout.write(self.style.SUCCESS('Dashboard snapshot rebuilt successfully'))
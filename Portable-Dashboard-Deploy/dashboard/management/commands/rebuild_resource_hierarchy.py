@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from dashboard.hierarchy import rebuild_resource_hierarchy
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the resource reporting hierarchy closure table from Resource.lead and Resource.manager'
+
+    def handle(self, *args, **options):
+        row_count = rebuild_resource_hierarchy()
+        self.stdout.write(self.style.SUCCESS(f'Resource hierarchy rebuilt with {row_count} rows'))
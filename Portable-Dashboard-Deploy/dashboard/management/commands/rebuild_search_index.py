@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from dashboard.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from the indexed products, bugs, updates and documents'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Number of rows processed per batch')
+
+    def handle(self, *args, **options):
+        document_count = rebuild_search_index(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt with {document_count} documents'))
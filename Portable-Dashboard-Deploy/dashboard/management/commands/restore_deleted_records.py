@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from dashboard.recycle import BULK_CHUNK_SIZE, bulk_restore, deleted_records
+
+
+class Command(BaseCommand):
+    help = 'Restore recycle bin records selected by id, model or deletion date'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'ids',
+            nargs='*',
+            type=int,
+            help='Ids of the deleted records to restore (default: every record matching the filters)',
+        )
+        parser.add_argument(
+            '--model',
+            help='Only restore deleted records of this model (e.g. Project)',
+        )
+        parser.add_argument(
+            '--since',
+            help='Only restore records deleted on or after this date (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=BULK_CHUNK_SIZE,
+            help=f'Records restored per transaction (default: {BULK_CHUNK_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since = parse_date(options['since'])
+            if since is None:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+            since = timezone.make_aware(datetime.combine(since, datetime.min.time()))
+        if not (options['ids'] or options['model'] or since):
+            raise CommandError('Give record ids, --model or --since to select the records to restore')
+
+        queryset = deleted_records(model_name=options['model'], deleted_after=since, ids=options['ids'] or None)
+        result = bulk_restore(
+            queryset,
+            chunk_size=options['chunk_size'],
+            progress=lambda result: self.stdout.write(
+                f'Restored {result.done} of {result.total} ({result.failed} failed)'
+            ),
+        )
+        for pk, error in result.errors:
+            self.stderr.write(f'Record #{pk} could not be restored: {error}')
+        self.stdout.write(self.style.SUCCESS(f'Restored {result.done} of {result.total} deleted records'))
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dashboard.activity import rollup_days
+
+
+class Command(BaseCommand):
+    help = 'Build the daily user action rollups; schedule it daily, shortly after midnight'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=1,
+            help='Number of days before today to roll up (default: 1, yesterday only)',
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        start = today - timedelta(days=max(options['days'], 1))
+        written = rollup_days(start, today)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} rollup rows for {start} to {today - timedelta(days=1)}'))
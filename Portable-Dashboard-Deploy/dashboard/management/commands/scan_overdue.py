@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from dashboard.models import Project, RoadmapItem, Rock
+
+
+class Command(BaseCommand):
+    help = 'Refresh the overdue flag of products, rocks and roadmap items; schedule it daily, shortly after midnight'
+
+    def handle(self, *args, **options):
+        for model in (Project, Rock, RoadmapItem):
+            flagged, cleared = model.flag_overdue()
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {flagged} flagged overdue, {cleared} cleared')
+        self.stdout.write(self.style.SUCCESS('Overdue flags refreshed'))
@@ -0,0 +1,573 @@
+"""
+Services for the weekly automation and manual update meetings.
+
+These helpers work on whole meetings at once so that starting a meeting costs a
+fixed number of queries regardless of how many products are in the portfolio.
+
+The state of an active meeting (baseline values and the fields changed per
+project) lives in the MeetingBaseline / ProductMeetingBaseline tables rather
+than in the session, so any facilitator can end the meeting and the session
+only carries the meeting-active flag.
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass
+from operator import ne
+from typing import Any, Callable, Tuple
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import (
+    DashboardSnapshot, MeetingBaseline, OATReleaseCycle, ProductProblem, Project, SprintCycle, WeeklyProductUpdate,
+    WeeklyProjectUpdate,
+)
+from .product_filters import invalidate_team_lead_options
+from .search import index_objects
+from .timeseries import record_meeting_metrics
+
+# Project.execution_time_of_smoke is stored as "Xh Ym"
+EXECUTION_TIME_RE = re.compile(r'(\d+)h\s*(\d+)m')
+
+
+def parse_execution_time(value):
+    """Parse an "Xh Ym" string into an (hours, minutes) tuple."""
+    if value:
+        match = EXECUTION_TIME_RE.match(value.strip())
+        if match:
+            return int(match.group(1)), int(match.group(2))
+    return 0, 0
+
+
+def project_baseline(project):
+    """Return the project values recorded when a meeting starts, used to detect changes at the end."""
+    return {
+        'smoke_automation_status': project.smoke_automation_status or 'na',
+        'regression_automation_status': project.regression_automation_status or 'na',
+        'pipeline_schedule': project.pipeline_schedule or 'na',
+        'execution_time_of_smoke': project.execution_time_of_smoke or "0h 0m",
+        'total_number_of_available_test_cases': project.total_number_of_available_test_cases or 0,
+        'bugs_found_through_automation': project.bugs_found_through_automation or 0,
+        'regression_coverage': project.regression_coverage or 0,
+        'total_automatable_test_cases': project.total_automatable_test_cases or 0,
+        'total_automated_test_cases': project.total_automated_test_cases or 0,
+        'total_automated_smoke_test_cases': project.total_automated_smoke_test_cases or 0,
+        'status_of_last_automation_run': project.status_of_last_automation_run or '',
+        'date_of_last_automation_run': project.date_of_last_automation_run.strftime('%Y-%m-%d') if project.date_of_last_automation_run else None,
+        'automation_framework_tech_stack': project.automation_framework_tech_stack or '',
+        'total_number_of_functional_test_cases': project.total_number_of_functional_test_cases or 0,
+        'total_number_of_business_test_cases': project.total_number_of_business_test_cases or 0,
+        'readiness_for_production': getattr(project, 'readiness_for_production', False),
+        'team_lead_id': project.team_lead.id if project.team_lead else None,
+        'team_lead_name': project.team_lead.name if project.team_lead else 'Not assigned',
+        'sprint_cycle': project.sprint_cycle or '',
+        'oat_release_cycle': project.oat_release_cycle or '',
+    }
+
+
+def build_weekly_project_update(meeting, project, sprint_cycle_ids, oat_release_cycle_ids):
+    """
+    Build an unsaved WeeklyProjectUpdate pre-filled from the project.
+
+    sprint_cycle_ids / oat_release_cycle_ids map cycle names to primary keys.
+    """
+    execution_hours, execution_minutes = parse_execution_time(project.execution_time_of_smoke)
+    return WeeklyProjectUpdate(
+        meeting=meeting,
+        project=project,
+        smoke_automation_status=project.smoke_automation_status or 'na',
+        regression_automation_status=project.regression_automation_status or 'na',
+        pipeline_schedule=project.pipeline_schedule or 'na',
+        execution_time_hours=execution_hours,
+        execution_time_minutes=execution_minutes,
+        total_available_test_cases=project.total_number_of_available_test_cases or 0,
+        bugs_found_through_automation=project.bugs_found_through_automation or 0,
+        regression_coverage=project.regression_coverage or 0,
+        total_automatable_test_cases=project.total_automatable_test_cases or 0,
+        total_automated_test_cases=project.total_automated_test_cases or 0,
+        total_automated_smoke_test_cases=project.total_automated_smoke_test_cases or 0,
+        last_automation_run_status=project.status_of_last_automation_run or '',
+        last_automation_run_date=project.date_of_last_automation_run,
+        automation_framework_tech_stack=project.automation_framework_tech_stack or '',
+        functional_test_cases_count=project.total_number_of_functional_test_cases or 0,
+        business_test_cases_count=project.total_number_of_business_test_cases or 0,
+        readiness_for_production=getattr(project, 'readiness_for_production', False),
+        team_lead=project.team_lead,
+        sprint_cycle_id=sprint_cycle_ids.get((project.sprint_cycle or '').strip()),
+        oat_release_cycle_id=oat_release_cycle_ids.get((project.oat_release_cycle or '').strip()),
+    )
+
+
+def bootstrap_weekly_meeting(meeting):
+    """
+    Create the missing WeeklyProjectUpdate rows for every project in one transaction.
+
+    Cycle names are resolved from a single lookup per cycle table, existing
+    updates are fetched in one query and the missing ones are bulk-created.
+
+    Returns:
+        dict: Baseline values per project id (see project_baseline)
+    """
+    with transaction.atomic():
+        projects = list(Project.objects.select_related('team_lead').order_by('pk'))
+        sprint_cycle_ids = dict(SprintCycle.objects.values_list('name', 'id'))
+        oat_release_cycle_ids = dict(OATReleaseCycle.objects.values_list('name', 'id'))
+        existing_project_ids = set(
+            WeeklyProjectUpdate.objects.filter(meeting=meeting).values_list('project_id', flat=True)
+        )
+
+        baselines = {}
+        new_updates = []
+        for project in projects:
+            baselines[project.id] = project_baseline(project)
+            if project.id not in existing_project_ids:
+                new_updates.append(
+                    build_weekly_project_update(meeting, project, sprint_cycle_ids, oat_release_cycle_ids)
+                )
+
+        WeeklyProjectUpdate.objects.bulk_create(new_updates, batch_size=500)
+        save_meeting_baselines(MeetingBaseline, meeting, baselines)
+
+    return baselines
+
+
+# WeeklyProductUpdate fields copied from the previous meeting
+PRODUCT_CARRY_FORWARD_FIELDS = [
+    'latest_project_updates', 'product_notes', 'problems', 'expected_solution', 'solution_timeline',
+]
+
+
+def carried_product_values(previous):
+    """Return the values a new product update starts with, given the previous update (or None)."""
+    if previous is None:
+        return {
+            'latest_project_updates': '',
+            'product_notes': '',
+            'problems': '',
+            'expected_solution': '',
+            'solution_timeline': 'medium',
+        }
+    return {
+        # Older updates only used the legacy problems field
+        'latest_project_updates': previous.latest_project_updates or previous.problems,
+        'product_notes': previous.product_notes,
+        'problems': previous.problems,
+        'expected_solution': previous.expected_solution,
+        'solution_timeline': previous.solution_timeline,
+    }
+
+
+def latest_prior_product_updates(meeting, project_ids):
+    """
+    Return {project_id: WeeklyProductUpdate} with the newest update of each
+    project from an earlier meeting, with its problems prefetched.
+    """
+    prior = WeeklyProductUpdate.objects.filter(
+        project_id__in=project_ids,
+        meeting__meeting_date__lte=meeting.meeting_date,
+    ).exclude(meeting=meeting)
+    latest = prior.filter(project=OuterRef('project')).order_by('-meeting__meeting_date', '-pk').values('pk')[:1]
+    return {
+        update.project_id: update
+        for update in prior.filter(pk=Subquery(latest)).prefetch_related('product_problems')
+    }
+
+
+def carry_forward_product_updates(meeting, project_ids):
+    """
+    Prepare the product updates of a weekly product meeting in one transaction.
+
+    The latest prior update of every project is resolved in one query. Missing
+    updates are bulk-created from it together with copies of its problems, and
+    existing updates are refreshed with a single bulk_update.
+
+    Returns:
+        dict: Baseline values per project id
+    """
+    with transaction.atomic():
+        previous_updates = latest_prior_product_updates(meeting, project_ids)
+        existing_updates = {
+            update.project_id: update
+            for update in WeeklyProductUpdate.objects.filter(meeting=meeting, project_id__in=project_ids)
+        }
+
+        baselines = {}
+        new_updates = []
+        refreshed_updates = []
+        now = timezone.now()
+        for project_id in project_ids:
+            previous = previous_updates.get(project_id)
+            values = carried_product_values(previous)
+            baselines[project_id] = values
+
+            update = existing_updates.get(project_id)
+            if update is None:
+                new_updates.append(WeeklyProductUpdate(meeting=meeting, project_id=project_id, **values))
+            elif previous is not None:
+                for field_name, value in values.items():
+                    setattr(update, field_name, value)
+                update.updated_at = now
+                refreshed_updates.append(update)
+
+        new_updates = WeeklyProductUpdate.objects.bulk_create(new_updates, batch_size=500)
+        WeeklyProductUpdate.objects.bulk_update(
+            refreshed_updates, PRODUCT_CARRY_FORWARD_FIELDS + ['updated_at'], batch_size=500
+        )
+        new_problems = ProductProblem.objects.bulk_create([
+            ProductProblem(
+                product_update=update,
+                problem_description=problem.problem_description,
+                expected_solutions=problem.expected_solutions,
+                solution_timeline=problem.solution_timeline,
+            )
+            for update in new_updates if update.project_id in previous_updates
+            for problem in previous_updates[update.project_id].product_problems.all()
+        ], batch_size=500)
+
+        # bulk writes skip the signal handlers that maintain the search index
+        index_objects(WeeklyProductUpdate, [update.pk for update in [*new_updates, *refreshed_updates]])
+        index_objects(ProductProblem, [problem.pk for problem in new_problems])
+
+    return baselines
+
+
+# Form/API names of the editable ProductProblem fields
+PROBLEM_EDIT_FIELDS = {
+    'description': 'problem_description',
+    'expected_solutions': 'expected_solutions',
+    'solution_timeline': 'solution_timeline',
+}
+
+
+def parse_problem_edits(data):
+    """
+    Collect the problem_<id>_<field> entries of a submitted form.
+
+    Returns:
+        dict: {problem_id: {field: value}} where field is a PROBLEM_EDIT_FIELDS key or 'delete'
+    """
+    edits = {}
+    for key, value in data.items():
+        if not key.startswith('problem_'):
+            continue
+        problem_id, _, field = key[len('problem_'):].partition('_')
+        if problem_id.isdigit() and (field in PROBLEM_EDIT_FIELDS or field == 'delete'):
+            edits.setdefault(int(problem_id), {})[field] = value
+    return edits
+
+
+def apply_problem_edits(product_update, edits):
+    """
+    Apply parsed problem edits to the problems of a product update.
+
+    The affected problems are fetched with one query, changed rows are saved
+    with one bulk_update and deleted rows with one delete. Edits for problems
+    of other product updates are ignored.
+
+    Returns:
+        list: Names of the modified fields, e.g. 'problem_3_description' or 'deleted_problem_4'
+    """
+    if not edits:
+        return []
+
+    modified_fields = []
+    changed_problems = []
+    changed_columns = set()
+    deleted_ids = []
+    now = timezone.now()
+    for problem in ProductProblem.objects.filter(product_update=product_update, id__in=edits).order_by('pk'):
+        problem_edits = edits[problem.id]
+        if problem_edits.get('delete') in ('true', True):
+            deleted_ids.append(problem.id)
+            modified_fields.append(f'deleted_problem_{problem.id}')
+            continue
+
+        changed = False
+        for field, column in PROBLEM_EDIT_FIELDS.items():
+            if field in problem_edits and problem_edits[field] != getattr(problem, column):
+                setattr(problem, column, problem_edits[field])
+                changed_columns.add(column)
+                modified_fields.append(f'problem_{problem.id}_{field}')
+                changed = True
+        if changed:
+            problem.updated_at = now
+            changed_problems.append(problem)
+
+    if changed_problems:
+        ProductProblem.objects.bulk_update(changed_problems, sorted(changed_columns) + ['updated_at'])
+        index_objects(ProductProblem, [problem.pk for problem in changed_problems])
+    if deleted_ids:
+        ProductProblem.objects.filter(id__in=deleted_ids).delete()
+    return modified_fields
+
+
+def save_meeting_baselines(baseline_model, meeting, baselines):
+    """
+    Store the baseline values of a meeting in one statement.
+
+    baselines maps project ids to value dicts. Restarting a meeting replaces the
+    stored values but keeps the fields already marked as modified.
+    """
+    baseline_model.objects.bulk_create(
+        [
+            baseline_model(meeting=meeting, project_id=project_id, values=values)
+            for project_id, values in baselines.items()
+        ],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['meeting', 'project'],
+        update_fields=['values'],
+    )
+
+
+def load_meeting_state(baseline_model, meeting):
+    """
+    Return the stored state of a meeting.
+
+    Returns:
+        tuple: ({project_id: baseline values}, {project_id: list of modified fields})
+    """
+    baselines = {}
+    modified_fields = {}
+    for project_id, values, fields in baseline_model.objects.filter(meeting=meeting).values_list(
+        'project_id', 'values', 'modified_fields'
+    ):
+        if values is not None:
+            baselines[project_id] = values
+        modified_fields[project_id] = fields
+    return baselines, modified_fields
+
+
+def record_modified_fields(baseline_model, meeting, project, fields):
+    """Add fields to the set of fields changed for a project during a meeting."""
+    baseline, _ = baseline_model.objects.get_or_create(meeting=meeting, project=project)
+    merged = list(dict.fromkeys([*baseline.modified_fields, *fields]))
+    if merged != baseline.modified_fields:
+        baseline.modified_fields = merged
+        baseline.save(update_fields=['modified_fields'])
+
+
+def clear_meeting_state(baseline_model, meeting):
+    """Drop the stored state once a meeting has ended."""
+    baseline_model.objects.filter(meeting=meeting).delete()
+
+
+def _text(value):
+    return str(value or '').strip()
+
+
+def _quoted(value):
+    return f"'{value or 'Not specified'}'"
+
+
+def _not_specified(value):
+    return value or 'Not specified'
+
+
+def _choice(choices):
+    labels = dict(choices)
+    return lambda value: f"'{labels.get(value, value)}'"
+
+
+def _cycle_name(cycle):
+    return cycle.name if cycle else ''
+
+
+def _zero_time(value):
+    return value.strip() == "0h 0m"
+
+
+@dataclass(frozen=True)
+class MeetingField:
+    """
+    Declares how a WeeklyProjectUpdate field is compared with the meeting
+    baseline and written back to its Project.
+
+    old / new return comparable values from the baseline dict and the update,
+    display formats one of them for the summary and project_value gives the
+    value stored on the project when one of modified_names was edited.
+    """
+    label: str
+    update_field: str
+    project_field: str
+    old: Callable[[dict], Any]
+    new: Callable[[WeeklyProjectUpdate], Any]
+    display: Callable[[Any], str] = str
+    changed: Callable[[Any, Any], bool] = ne
+    project_value: Callable[[WeeklyProjectUpdate], Any] = None
+    only_if_modified: bool = False
+    modified_names: Tuple[str, ...] = ()
+
+    @property
+    def triggers(self):
+        return self.modified_names or (self.update_field,)
+
+    def describe_change(self, baseline, update, modified_fields):
+        """Return the summary line for this field, or None when it did not change."""
+        if self.only_if_modified and not any(name in modified_fields for name in self.triggers):
+            return None
+        old, new = self.old(baseline), self.new(update)
+        if not self.changed(old, new):
+            return None
+        return f"{self.label} changed from {self.display(old)} to {self.display(new)}"
+
+    def write_back(self, project, update, modified_fields):
+        """Copy the update value onto the project if it was edited; return True if it was."""
+        if not any(name in modified_fields for name in self.triggers):
+            return False
+        value = self.project_value(update) if self.project_value else getattr(update, self.update_field)
+        setattr(project, self.project_field, value)
+        return True
+
+
+def _choice_field(label, field_name, choices):
+    return MeetingField(
+        label, field_name, field_name,
+        old=lambda baseline: baseline[field_name],
+        new=lambda update: getattr(update, field_name),
+        display=_choice(choices),
+        changed=lambda old, new: str(old) != str(new),
+    )
+
+
+def _count_field(label, update_field, project_field, display=str):
+    return MeetingField(
+        label, update_field, project_field,
+        old=lambda baseline: int(baseline[project_field]),
+        new=lambda update: int(getattr(update, update_field)),
+        display=display,
+    )
+
+
+def _text_field(label, update_field, project_field):
+    return MeetingField(
+        label, update_field, project_field,
+        old=lambda baseline: _text(baseline[project_field]),
+        new=lambda update: _text(getattr(update, update_field)),
+        display=_quoted,
+    )
+
+
+def _cycle_field(label, field_name):
+    return MeetingField(
+        label, field_name, field_name,
+        old=lambda baseline: _text(baseline[field_name]),
+        new=lambda update: _cycle_name(getattr(update, field_name)).strip(),
+        display=_not_specified,
+        project_value=lambda update: _cycle_name(getattr(update, field_name)),
+        only_if_modified=True,
+    )
+
+
+# Fields compared and written back when a weekly automation meeting ends, in summary order
+WEEKLY_MEETING_FIELDS = [
+    _choice_field('Smoke Automation Status', 'smoke_automation_status', Project.AUTOMATION_STATUS_CHOICES),
+    _choice_field('Regression Automation Status', 'regression_automation_status', Project.AUTOMATION_STATUS_CHOICES),
+    _choice_field('Pipeline Schedule', 'pipeline_schedule', Project.PIPELINE_SCHEDULE_CHOICES),
+    _count_field('Total Available Test Cases', 'total_available_test_cases', 'total_number_of_available_test_cases'),
+    _count_field('Regression Coverage', 'regression_coverage', 'regression_coverage', display=lambda value: f"{value}%"),
+    _count_field('Bugs Found Through Automation', 'bugs_found_through_automation', 'bugs_found_through_automation'),
+    MeetingField(
+        'Execution Time', 'execution_time_hours', 'execution_time_of_smoke',
+        old=lambda baseline: _text(baseline['execution_time_of_smoke']) or "0h 0m",
+        new=WeeklyProjectUpdate.get_execution_time_display,
+        changed=lambda old, new: old != new and not (_zero_time(old) and _zero_time(new)),
+        project_value=WeeklyProjectUpdate.get_execution_time_display,
+        only_if_modified=True,
+        modified_names=('execution_time_hours', 'execution_time_minutes'),
+    ),
+    _count_field('Total Automatable Test Cases', 'total_automatable_test_cases', 'total_automatable_test_cases'),
+    _count_field('Total Automated Test Cases', 'total_automated_test_cases', 'total_automated_test_cases'),
+    _count_field('Total Automated Smoke Test Cases', 'total_automated_smoke_test_cases', 'total_automated_smoke_test_cases'),
+    _count_field('Functional Test Cases', 'functional_test_cases_count', 'total_number_of_functional_test_cases'),
+    _count_field('Business Test Cases', 'business_test_cases_count', 'total_number_of_business_test_cases'),
+    _text_field('Last Automation Run Status', 'last_automation_run_status', 'status_of_last_automation_run'),
+    _text_field('Automation Framework/Tech Stack', 'automation_framework_tech_stack', 'automation_framework_tech_stack'),
+    MeetingField(
+        'Last Automation Run Date', 'last_automation_run_date', 'date_of_last_automation_run',
+        old=lambda baseline: baseline['date_of_last_automation_run'] or None,
+        new=lambda update: update.last_automation_run_date.strftime('%Y-%m-%d') if update.last_automation_run_date else None,
+        display=_not_specified,
+    ),
+    MeetingField(
+        'Readiness for Production', 'readiness_for_production', 'readiness_for_production',
+        old=lambda baseline: bool(baseline['readiness_for_production']),
+        new=lambda update: bool(update.readiness_for_production),
+        display=lambda ready: 'Ready' if ready else 'Not Ready',
+    ),
+    MeetingField(
+        'Team Lead', 'team_lead', 'team_lead',
+        old=lambda baseline: (baseline['team_lead_id'], baseline['team_lead_name']),
+        new=lambda update: (update.team_lead_id, update.team_lead.name if update.team_lead else 'Not assigned'),
+        display=lambda lead: lead[1],
+        changed=lambda old, new: old[0] != new[0],
+    ),
+    _cycle_field('Sprint Cycle', 'sprint_cycle'),
+    _cycle_field('OAT Release Cycle', 'oat_release_cycle'),
+]
+
+
+def complete_weekly_meeting(meeting, fields=WEEKLY_MEETING_FIELDS):
+    """
+    End a weekly automation meeting.
+
+    Compares every project update with the stored baseline to build the summary
+    notes, writes the edited fields back to the projects with one bulk_update,
+    records the automation metric points and clears the meeting state. The
+    number of queries does not depend on the number of projects.
+
+    Returns:
+        list: Summary note per project with changes
+    """
+    with transaction.atomic():
+        baselines, modified_fields_by_project = load_meeting_state(MeetingBaseline, meeting)
+        updates = WeeklyProjectUpdate.objects.filter(meeting=meeting).select_related(
+            'project', 'project__team_lead', 'team_lead', 'sprint_cycle', 'oat_release_cycle',
+        ).order_by('pk')
+
+        summary_notes = []
+        changed_projects = []
+        changed_columns = set()
+        snapshot_delta = Counter()
+        for update in updates:
+            project = update.project
+            modified_fields = modified_fields_by_project.get(project.id, [])
+
+            if project.id in baselines:
+                changes = [
+                    change for change in (
+                        field.describe_change(baselines[project.id], update, modified_fields) for field in fields
+                    ) if change
+                ]
+                if changes:
+                    summary_notes.append(f"Project: {project.name}\n" + "\n".join(f"- {change}" for change in changes))
+
+            previous = DashboardSnapshot.project_contribution(project)
+            written = [field.project_field for field in fields if field.write_back(project, update, modified_fields)]
+            if written:
+                changed_projects.append(project)
+                changed_columns.update(written)
+                snapshot_delta.update(DashboardSnapshot.project_contribution(project))
+                snapshot_delta.subtract(previous)
+
+        if changed_projects:
+            now = timezone.now()
+            for project in changed_projects:
+                project.updated_at = now
+            Project.objects.bulk_update(changed_projects, sorted(changed_columns | {'updated_at'}), batch_size=500)
+            # bulk_update bypasses the post_save signals that maintain the snapshot and the team lead options
+            DashboardSnapshot.apply_delta(snapshot_delta)
+            if 'team_lead' in changed_columns:
+                invalidate_team_lead_options()
+
+        meeting.is_completed = True
+        if summary_notes:
+            meeting_summary = "Meeting Summary:\n\n" + "\n\n".join(summary_notes)
+            meeting.notes = f"{meeting.notes}\n\n{meeting_summary}" if meeting.notes else meeting_summary
+        meeting.save()
+
+        clear_meeting_state(MeetingBaseline, meeting)
+        record_meeting_metrics(meeting)
+
+    return summary_notes
@@ -0,0 +1,141 @@
+"""
+Aggregate layer for the main dashboard.
+
+All product metrics shown on the landing page (status counts, overdue products,
+automation backlog and smoke/regression coverage) are computed here with two
+queries: one conditional aggregation over Project and one annotated pass over
+the products that contribute to any of the per-product charts. Both the
+dashboard view and the AI agent consume the resulting DashboardMetrics object.
+"""
+from dataclasses import dataclass, field
+
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, FloatField, Q
+from django.db.models.functions import Cast, Round
+from django.utils import timezone
+
+from .models import Project
+
+
+@dataclass
+class DashboardMetrics:
+    """Typed result of compute_dashboard_metrics()."""
+    total_products: int = 0
+    status_counts: dict = field(default_factory=dict)
+    overdue_products: list = field(default_factory=list)
+    automation_backlog: list = field(default_factory=list)
+    smoke_coverage_data: list = field(default_factory=list)
+    regression_coverage_data: list = field(default_factory=list)
+
+    @property
+    def active_products(self):
+        return self.status_counts.get('in_progress', 0)
+
+    @property
+    def completed_products(self):
+        return self.status_counts.get('completed', 0)
+
+    @property
+    def products_by_status(self):
+        """Status/count rows for the status chart, in STATUS_CHOICES order."""
+        return [
+            {'status': status, 'count': self.status_counts[status]}
+            for status, _ in Project.STATUS_CHOICES
+            if self.status_counts.get(status)
+        ]
+
+    def as_context(self):
+        """Return the template context entries for the dashboard view."""
+        return {
+            'total_products': self.total_products,
+            'active_products': self.active_products,
+            'completed_products': self.completed_products,
+            'products_by_status': self.products_by_status,
+            'overdue_products': self.overdue_products,
+            'automation_backlog': self.automation_backlog,
+            'smoke_coverage_data': self.smoke_coverage_data,
+            'regression_coverage_data': self.regression_coverage_data,
+        }
+
+    def to_dict(self):
+        """Return a JSON-serializable representation (used by the AI agent)."""
+        data = self.as_context()
+        data['overdue_products'] = [
+            {
+                'id': product.id,
+                'name': product.name,
+                'status': product.status,
+                'end_date': product.end_date.isoformat() if product.end_date else None,
+            }
+            for product in self.overdue_products
+        ]
+        return data
+
+
+def _status_aggregates():
+    aggregates = {'total': Count('id')}
+    for status, _ in Project.STATUS_CHOICES:
+        aggregates[status] = Count('id', filter=Q(status=status))
+    return aggregates
+
+
+def _percentage(numerator, denominator):
+    return Round(Cast(numerator, FloatField()) * 100.0 / F(denominator), 2)
+
+
+def compute_dashboard_metrics(projects=None, today=None, snapshot=None):
+    """
+    Compute all product metrics for the dashboard.
+
+    Args:
+        projects: Optional Project queryset to restrict the metrics to
+        today: Optional date used for the overdue comparison (defaults to today)
+        snapshot: Optional DashboardSnapshot; when given, status counts are read
+                  from it instead of being aggregated (only valid for all projects)
+
+    Returns:
+        DashboardMetrics: The computed metrics
+    """
+    if projects is None:
+        projects = Project.objects.all()
+    if today is None:
+        today = timezone.now().date()
+
+    # Query 1: status counts in a single conditional aggregation
+    if snapshot is not None:
+        counts = snapshot.status_counts()
+        total_products = snapshot.total_products
+    else:
+        counts = projects.aggregate(**_status_aggregates())
+        total_products = counts.pop('total')
+
+    # Query 2: one annotated pass over products that feed any per-product chart
+    overdue_q = Project.overdue_q(today)
+    backlog_q = Q(total_automatable_test_cases__isnull=False, total_automated_test_cases__isnull=False)
+    smoke_q = Q(total_automatable_smoke_test_cases__gt=0, total_automated_smoke_test_cases__isnull=False)
+    regression_q = Q(total_automatable_test_cases__gt=0, total_automated_test_cases__isnull=False)
+
+    rows = projects.filter(
+        overdue_q | backlog_q | smoke_q | regression_q
+    ).annotate(
+        is_overdue_flag=ExpressionWrapper(overdue_q, output_field=BooleanField()),
+        backlog=F('total_automatable_test_cases') - F('total_automated_test_cases'),
+        smoke_coverage_pct=_percentage('total_automated_smoke_test_cases', 'total_automatable_smoke_test_cases'),
+        regression_coverage_pct=_percentage('total_automated_test_cases', 'total_automatable_test_cases'),
+    ).only(
+        'id', 'name', 'status', 'end_date',
+        'total_automatable_test_cases', 'total_automated_test_cases',
+        'total_automatable_smoke_test_cases', 'total_automated_smoke_test_cases',
+    ).order_by('pk')
+
+    metrics = DashboardMetrics(total_products=total_products, status_counts=counts)
+    for project in rows:
+        if project.is_overdue_flag:
+            metrics.overdue_products.append(project)
+        if project.backlog is not None and project.backlog > 0:
+            metrics.automation_backlog.append({'name': project.name, 'backlog': project.backlog})
+        if (project.total_automatable_smoke_test_cases or 0) > 0 and project.smoke_coverage_pct is not None:
+            metrics.smoke_coverage_data.append({'name': project.name, 'coverage': project.smoke_coverage_pct})
+        if (project.total_automatable_test_cases or 0) > 0 and project.regression_coverage_pct is not None:
+            metrics.regression_coverage_data.append({'name': project.name, 'coverage': project.regression_coverage_pct})
+
+    return metrics
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0038_automationsprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_products', models.IntegerField(default=0)),
+                ('not_started_products', models.IntegerField(default=0)),
+                ('active_products', models.IntegerField(default=0)),
+                ('completed_products', models.IntegerField(default=0)),
+                ('on_hold_products', models.IntegerField(default=0)),
+                ('total_resources', models.IntegerField(default=0)),
+                ('total_assignments', models.IntegerField(default=0)),
+                ('total_automatable_test_cases', models.IntegerField(default=0)),
+                ('total_automated_test_cases', models.IntegerField(default=0)),
+                ('total_automatable_smoke_test_cases', models.IntegerField(default=0)),
+                ('total_automated_smoke_test_cases', models.IntegerField(default=0)),
+                ('bugs_found_through_automation', models.IntegerField(default=0)),
+                ('feedback_month', models.IntegerField(default=0)),
+                ('feedback_year', models.IntegerField(default=0)),
+                ('submitted_feedbacks', models.IntegerField(default=0)),
+                ('rebuilt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Dashboard Snapshot',
+                'verbose_name_plural': 'Dashboard Snapshot',
+            },
+        ),
+    ]
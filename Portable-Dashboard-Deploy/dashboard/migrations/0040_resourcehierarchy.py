@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_resource_hierarchy(apps, schema_editor):
+    from dashboard.hierarchy import compute_closure
+
+    Resource = apps.get_model('dashboard', 'Resource')
+    ResourceHierarchy = apps.get_model('dashboard', 'ResourceHierarchy')
+    resources = list(Resource.objects.values_list('id', 'lead_id', 'manager_id'))
+    rows = []
+    for relation, index in (('lead', 1), ('manager', 2)):
+        parents = {resource[0]: resource[index] for resource in resources}
+        rows.extend(
+            ResourceHierarchy(ancestor_id=ancestor, descendant_id=descendant, depth=depth, relation=relation)
+            for ancestor, descendant, depth in compute_closure(parents)
+        )
+    ResourceHierarchy.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0039_dashboardsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceHierarchy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(help_text='Number of reporting steps between ancestor and descendant')),
+                ('relation', models.CharField(choices=[('lead', 'Lead'), ('manager', 'Manager')], max_length=10)),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reporting_descendants', to='dashboard.resource')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reporting_ancestors', to='dashboard.resource')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ancestor', 'relation', 'depth'], name='dashboard_rh_anc_rel_idx'), models.Index(fields=['descendant', 'relation'], name='dashboard_rh_desc_rel_idx')],
+                'unique_together': {('ancestor', 'descendant', 'relation')},
+            },
+        ),
+        migrations.RunPython(populate_resource_hierarchy, migrations.RunPython.noop),
+    ]
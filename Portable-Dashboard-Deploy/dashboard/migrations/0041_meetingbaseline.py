@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0040_resourcehierarchy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeetingBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('values', models.JSONField(blank=True, help_text='Project values when the meeting started', null=True)),
+                ('modified_fields', models.JSONField(blank=True, default=list, help_text='Fields changed during the meeting')),
+                ('meeting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='baselines', to='dashboard.weeklymeeting')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='dashboard.project')),
+            ],
+            options={
+                'unique_together': {('meeting', 'project')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductMeetingBaseline',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('values', models.JSONField(blank=True, help_text='Product update values when the meeting started', null=True)),
+                ('modified_fields', models.JSONField(blank=True, default=list, help_text='Fields changed during the meeting')),
+                ('meeting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='baselines', to='dashboard.weeklyproductmeeting')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='dashboard.project')),
+            ],
+            options={
+                'unique_together': {('meeting', 'project')},
+            },
+        ),
+    ]
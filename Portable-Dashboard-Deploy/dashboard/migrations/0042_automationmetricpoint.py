@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0041_meetingbaseline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutomationMetricPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.DateField(help_text='Monday of the meeting week')),
+                ('metric', models.CharField(choices=[('regression_coverage', 'Regression Coverage'), ('total_available_test_cases', 'Available Test Cases'), ('total_automatable_test_cases', 'Automatable Test Cases'), ('total_automated_test_cases', 'Automated Test Cases'), ('total_automated_smoke_test_cases', 'Automated Smoke Test Cases'), ('bugs_found_through_automation', 'Bugs Found Through Automation')], max_length=40)),
+                ('value', models.FloatField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metric_points', to='dashboard.project')),
+            ],
+            options={
+                'verbose_name': 'Automation Metric Point',
+                'verbose_name_plural': 'Automation Metric Points',
+                'indexes': [models.Index(fields=['metric', 'week'], name='dashboard_amp_metric_week_idx')],
+                'unique_together': {('project', 'metric', 'week')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0042_automationmetricpoint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', 'team_lead'], name='dashboard_proj_status_lead_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['smoke_automation_status', 'regression_automation_status'], name='dashboard_proj_automation_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['pipeline_schedule'], name='dashboard_proj_pipeline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['in_production', 'in_development'], name='dashboard_proj_prod_dev_idx'),
+        ),
+    ]
@@ -0,0 +1,137 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:27
+
+from django.db import migrations, models
+
+SQLITE_FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE dashboard_searchdocument_fts USING fts5(
+        title, body, content='dashboard_searchdocument', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER dashboard_searchdocument_ai AFTER INSERT ON dashboard_searchdocument BEGIN
+        INSERT INTO dashboard_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_searchdocument_ad AFTER DELETE ON dashboard_searchdocument BEGIN
+        INSERT INTO dashboard_searchdocument_fts(dashboard_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_searchdocument_au AFTER UPDATE ON dashboard_searchdocument BEGIN
+        INSERT INTO dashboard_searchdocument_fts(dashboard_searchdocument_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO dashboard_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+SQLITE_DROP_SQL = [
+    'DROP TRIGGER IF EXISTS dashboard_searchdocument_au',
+    'DROP TRIGGER IF EXISTS dashboard_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS dashboard_searchdocument_ai',
+    'DROP TABLE IF EXISTS dashboard_searchdocument_fts',
+]
+
+POSTGRES_INDEX_NAME = 'dashboard_search_vector_idx'
+
+
+def _join(*parts):
+    return '\n'.join(part for part in parts if part)
+
+
+# Frozen copies of the document builders of dashboard.search as of this
+# migration: (kind, model, select_related, obj -> (title, body, url))
+DOCUMENT_SOURCES = [
+    ('project', 'Project', (), lambda project: (
+        project.name, project.description, f'/dashboard/products/{project.pk}/',
+    )),
+    ('production_bug', 'ProductionBug', ('project',), lambda bug: (
+        bug.title, _join(bug.project.name, bug.details), f'/dashboard/production-bugs/{bug.pk}/',
+    )),
+    ('product_update', 'WeeklyProductUpdate', ('project', 'meeting'), lambda update: (
+        f"{update.project.name} update ({update.meeting.meeting_date:%Y-%m-%d})",
+        _join(update.latest_project_updates, update.product_notes, update.problems, update.expected_solution),
+        f'/dashboard/weekly-product-updates/{update.pk}/',
+    )),
+    ('product_problem', 'ProductProblem', ('product_update__project',), lambda problem: (
+        f"{problem.product_update.project.name} problem",
+        _join(problem.problem_description, problem.expected_solutions),
+        f'/dashboard/weekly-product-updates/{problem.product_update_id}/',
+    )),
+    ('product_documentation', 'ProductDocumentation', ('project',), lambda document: (
+        document.title, document.project.name, document.link,
+    )),
+    ('department_document', 'DepartmentDocument', (), lambda document: (
+        document.title, '', document.confluence_link,
+    )),
+    ('sop', 'SOP', (), lambda sop: (sop.name, '', f'/dashboard/sop-management/{sop.pk}/')),
+]
+
+
+def index_existing_rows(apps, chunk_size=500):
+    SearchDocument = apps.get_model('dashboard', 'SearchDocument')
+    for kind, model_name, related, build in DOCUMENT_SOURCES:
+        model = apps.get_model('dashboard', model_name)
+        documents = []
+        for obj in model.objects.select_related(*related).order_by('pk').iterator(chunk_size=chunk_size):
+            title, body, url = build(obj)
+            documents.append(SearchDocument(
+                kind=kind, object_id=obj.pk, title=title[:300], body=body or '', url=(url or '')[:500],
+            ))
+            if len(documents) >= chunk_size:
+                SearchDocument.objects.bulk_create(documents)
+                documents = []
+        SearchDocument.objects.bulk_create(documents)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for statement in SQLITE_FTS_SQL:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+
+        SearchDocument = apps.get_model('dashboard', 'SearchDocument')
+        vector = SearchVector('title', weight='A', config='simple') + SearchVector('body', weight='B', config='simple')
+        schema_editor.add_index(SearchDocument, GinIndex(vector, name=POSTGRES_INDEX_NAME))
+    index_existing_rows(apps)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for statement in SQLITE_DROP_SQL:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {POSTGRES_INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0043_project_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('project', 'Product'), ('production_bug', 'Production Bug'), ('product_update', 'Product Update'), ('product_problem', 'Product Problem'), ('product_documentation', 'Product Documentation'), ('department_document', 'Department Document'), ('sop', 'SOP')], max_length=30)),
+                ('object_id', models.PositiveIntegerField()),
+                ('title', models.CharField(max_length=300)),
+                ('body', models.TextField(blank=True)),
+                ('url', models.CharField(blank=True, max_length=500)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
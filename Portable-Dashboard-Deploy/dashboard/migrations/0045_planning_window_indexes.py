@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0044_searchdocument'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectresource',
+            index=models.Index(fields=['start_date', 'end_date'], name='dashboard_pr_window_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectresource',
+            index=models.Index(fields=['resource', 'start_date'], name='dashboard_pr_res_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resourceleave',
+            index=models.Index(fields=['start_date', 'end_date'], name='dashboard_leave_window_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resourceleave',
+            index=models.Index(fields=['resource', 'start_date'], name='dashboard_leave_res_start_idx'),
+        ),
+    ]
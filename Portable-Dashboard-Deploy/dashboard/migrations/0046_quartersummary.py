@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0045_planning_window_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuarterSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_targets', models.IntegerField(default=0)),
+                ('completed_targets', models.IntegerField(default=0)),
+                ('completion_percentage', models.FloatField(default=0)),
+                ('avg_achievement_percentage', models.FloatField(default=0)),
+                ('project_achievement', models.JSONField(blank=True, default=list, help_text='Per-project target statistics')),
+                ('resource_allocations', models.JSONField(blank=True, default=list, help_text='Allocation totals per resource')),
+                ('total_allocation_percentage', models.FloatField(default=0)),
+                ('captured_at', models.DateTimeField(auto_now=True)),
+                ('quarter', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='summary', to='dashboard.quarter')),
+            ],
+            options={
+                'verbose_name_plural': 'Quarter summaries',
+            },
+        ),
+    ]
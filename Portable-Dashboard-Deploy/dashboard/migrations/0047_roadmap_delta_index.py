@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0046_quartersummary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='roadmapitem',
+            index=models.Index(fields=['quarter', 'updated_at'], name='dashboard_roadmap_delta_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:42
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def flag_overdue(apps, schema_editor):
+    today = timezone.now().date()
+    for model_name, date_field in [('Project', 'end_date'), ('Rock', 'due_date'), ('RoadmapItem', 'end_date')]:
+        model = apps.get_model('dashboard', model_name)
+        overdue = model.objects.filter(**{f'{date_field}__lt': today}).exclude(status='completed')
+        # One update per due date, so overdue_since is the day after it
+        for due in list(overdue.order_by().values_list(date_field, flat=True).distinct()):
+            overdue.filter(**{date_field: due}).update(overdue=True, overdue_since=due + timedelta(days=1))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0047_roadmap_delta_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='overdue',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='overdue_since',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='roadmapitem',
+            name='overdue',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='roadmapitem',
+            name='overdue_since',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='rock',
+            name='overdue',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='rock',
+            name='overdue_since',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['overdue', 'end_date'], name='dashboard_proj_overdue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roadmapitem',
+            index=models.Index(fields=['overdue', 'end_date'], name='dashboard_roadmap_overdue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rock',
+            index=models.Index(fields=['overdue', 'due_date'], name='dashboard_rock_overdue_idx'),
+        ),
+        migrations.RunPython(flag_overdue, migrations.RunPython.noop),
+    ]
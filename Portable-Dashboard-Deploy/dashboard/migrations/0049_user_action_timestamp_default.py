@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:44
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0048_overdue_flags'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='useraction',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
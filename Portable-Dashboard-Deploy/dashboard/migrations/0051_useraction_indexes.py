@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+SQLITE_FTS_SQL = [
+    """
+    CREATE VIRTUAL TABLE dashboard_useraction_fts USING fts5(
+        details, model_name, content='dashboard_useraction', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER dashboard_useraction_ai AFTER INSERT ON dashboard_useraction BEGIN
+        INSERT INTO dashboard_useraction_fts(rowid, details, model_name) VALUES (new.id, new.details, new.model_name);
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_useraction_ad AFTER DELETE ON dashboard_useraction BEGIN
+        INSERT INTO dashboard_useraction_fts(dashboard_useraction_fts, rowid, details, model_name)
+        VALUES ('delete', old.id, old.details, old.model_name);
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_useraction_au AFTER UPDATE ON dashboard_useraction BEGIN
+        INSERT INTO dashboard_useraction_fts(dashboard_useraction_fts, rowid, details, model_name)
+        VALUES ('delete', old.id, old.details, old.model_name);
+        INSERT INTO dashboard_useraction_fts(rowid, details, model_name) VALUES (new.id, new.details, new.model_name);
+    END
+    """,
+    "INSERT INTO dashboard_useraction_fts(dashboard_useraction_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_SQL = [
+    'DROP TRIGGER IF EXISTS dashboard_useraction_au',
+    'DROP TRIGGER IF EXISTS dashboard_useraction_ad',
+    'DROP TRIGGER IF EXISTS dashboard_useraction_ai',
+    'DROP TABLE IF EXISTS dashboard_useraction_fts',
+]
+
+POSTGRES_INDEX_NAME = 'dashboard_ua_search_idx'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for statement in SQLITE_FTS_SQL:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+
+        UserAction = apps.get_model('dashboard', 'UserAction')
+        vector = SearchVector('details', 'model_name', config='simple')
+        schema_editor.add_index(UserAction, GinIndex(vector, name=POSTGRES_INDEX_NAME))
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for statement in SQLITE_DROP_SQL:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {POSTGRES_INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0050_useractiondailyrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='useraction',
+            index=models.Index(fields=['timestamp'], name='dashboard_ua_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useraction',
+            index=models.Index(fields=['user', 'timestamp'], name='dashboard_ua_user_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useraction',
+            index=models.Index(fields=['action_type', 'timestamp'], name='dashboard_ua_type_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useraction',
+            index=models.Index(fields=['model_name', 'timestamp'], name='dashboard_ua_model_time_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
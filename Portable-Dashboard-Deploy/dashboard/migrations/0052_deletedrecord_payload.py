@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0051_useraction_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deletedrecord',
+            name='payload',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='deletedrecord',
+            name='related_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of related rows deleted with the record'),
+        ),
+    ]
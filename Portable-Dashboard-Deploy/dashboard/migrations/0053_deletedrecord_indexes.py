@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0052_deletedrecord_payload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deletedrecord',
+            index=models.Index(fields=['deleted_at'], name='dashboard_dr_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deletedrecord',
+            index=models.Index(fields=['model_name', 'deleted_at'], name='dashboard_dr_model_deleted_idx'),
+        ),
+    ]
@@ -1,10 +1,71 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.urls import reverse
 import json
 from datetime import timedelta, date
 from django.contrib.auth.models import User
 
+# Persisted overdue flag shared by Project, Rock and RoadmapItem
+class OverdueFlagMixin:
+    """
+    Keeps the overdue / overdue_since columns of a model with a status and a
+    due date in step with is_overdue: save() recomputes them, and
+    flag_overdue() (run daily by the scan_overdue command) flips the rows
+    whose due date has passed since the last run.
+
+    overdue_since is the first day the row was overdue, i.e. the day after
+    its due date.
+    """
+    OVERDUE_DATE_FIELD = 'end_date'
+
+    def refresh_overdue(self, today=None):
+        today = today or timezone.now().date()
+        due = getattr(self, self.OVERDUE_DATE_FIELD)
+        self.overdue = bool(due and self.status != 'completed' and due < today)
+        self.overdue_since = due + timedelta(days=1) if self.overdue else None
+
+    def save(self, *args, **kwargs):
+        self.refresh_overdue()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'status', self.OVERDUE_DATE_FIELD} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'overdue', 'overdue_since'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def overdue_q(cls, today=None):
+        """
+        Q object selecting the overdue rows through the (overdue, due date)
+        index. Rows that fell due since the last scan are included as well.
+        """
+        today = today or timezone.now().date()
+        return (
+            models.Q(overdue=True) | models.Q(overdue=False, **{f'{cls.OVERDUE_DATE_FIELD}__lt': today})
+        ) & ~models.Q(status='completed')
+
+    @classmethod
+    def flag_overdue(cls, today=None):
+        """
+        Flag the rows that became overdue and clear the ones that no longer are.
+        Returns (flagged, cleared) row counts.
+        """
+        return flag_overdue_rows(cls, cls.OVERDUE_DATE_FIELD, today or timezone.now().date())
+
+
+def flag_overdue_rows(model, date_field, today):
+    """OverdueFlagMixin.flag_overdue for any model with the overdue columns."""
+    became_overdue = model.objects.filter(overdue=False, **{f'{date_field}__lt': today}).exclude(status='completed')
+    flagged = 0
+    # One update per due date, so overdue_since is exact without date arithmetic in SQL
+    for due in list(became_overdue.order_by().values_list(date_field, flat=True).distinct()):
+        flagged += became_overdue.filter(**{date_field: due}).update(overdue=True, overdue_since=due + timedelta(days=1))
+    cleared = model.objects.filter(overdue=True).filter(
+        models.Q(status='completed')
+        | models.Q(**{f'{date_field}__gte': today})
+        | models.Q(**{f'{date_field}__isnull': True})
+    ).update(overdue=False, overdue_since=None)
+    return flagged, cleared
+
+
 # Create your models here.
 # Admin-configurable models for dropdown lists
 class SprintCycle(models.Model):
@@ -44,7 +105,34 @@ class Resource(models.Model):
     def __str__(self):
         return self.name
 
-class Project(models.Model):
+class ResourceHierarchy(models.Model):
+    """
+    Closure table for the Resource reporting hierarchy.
+    Holds one row for every (ancestor, descendant) pair reachable through the
+    lead or manager chain, so "everyone under X" is a single indexed lookup.
+    Maintained by dashboard.hierarchy from Resource signals.
+    """
+    RELATION_CHOICES = [
+        ('lead', 'Lead'),
+        ('manager', 'Manager'),
+    ]
+
+    ancestor = models.ForeignKey(Resource, on_delete=models.CASCADE, related_name='reporting_descendants')
+    descendant = models.ForeignKey(Resource, on_delete=models.CASCADE, related_name='reporting_ancestors')
+    depth = models.PositiveIntegerField(help_text="Number of reporting steps between ancestor and descendant")
+    relation = models.CharField(max_length=10, choices=RELATION_CHOICES)
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant', 'relation')
+        indexes = [
+            models.Index(fields=['ancestor', 'relation', 'depth'], name='dashboard_rh_anc_rel_idx'),
+            models.Index(fields=['descendant', 'relation'], name='dashboard_rh_desc_rel_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.relation}, depth {self.depth})"
+
+class Project(OverdueFlagMixin, models.Model):
     STATUS_CHOICES = [
         ('not_started', 'Not Started'),
         ('in_progress', 'In Progress'),
@@ -97,10 +185,23 @@ class Project(models.Model):
 
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
+    # Maintained by OverdueFlagMixin and the scan_overdue command
+    overdue = models.BooleanField(default=False)
+    overdue_since = models.DateField(null=True, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Match the filter combinations used by ProductListView
+        indexes = [
+            models.Index(fields=['status', 'team_lead'], name='dashboard_proj_status_lead_idx'),
+            models.Index(fields=['smoke_automation_status', 'regression_automation_status'], name='dashboard_proj_automation_idx'),
+            models.Index(fields=['pipeline_schedule'], name='dashboard_proj_pipeline_idx'),
+            models.Index(fields=['in_production', 'in_development'], name='dashboard_proj_prod_dev_idx'),
+            models.Index(fields=['overdue', 'end_date'], name='dashboard_proj_overdue_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -136,6 +237,11 @@ class ProjectResource(models.Model):
 
     class Meta:
         unique_together = ('project', 'resource')
+        # Date window queries of the resource planning calendar feed
+        indexes = [
+            models.Index(fields=['start_date', 'end_date'], name='dashboard_pr_window_idx'),
+            models.Index(fields=['resource', 'start_date'], name='dashboard_pr_res_start_idx'),
+        ]
 
     def __str__(self):
         return f"{self.resource.name} assigned to {self.project.name}"
@@ -246,6 +352,61 @@ class WeeklyProjectUpdate(models.Model):
             'updated_at': self.updated_at.isoformat(),
         }
 
+class MeetingBaseline(models.Model):
+    """
+    Server-side state of a project during an active weekly meeting: the project
+    values recorded when the meeting started and the fields changed since then.
+    """
+    meeting = models.ForeignKey(WeeklyMeeting, on_delete=models.CASCADE, related_name='baselines')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    values = models.JSONField(null=True, blank=True, help_text="Project values when the meeting started")
+    modified_fields = models.JSONField(default=list, blank=True, help_text="Fields changed during the meeting")
+
+    class Meta:
+        unique_together = ('meeting', 'project')
+
+    def __str__(self):
+        return f"Baseline of project #{self.project_id} for meeting #{self.meeting_id}"
+
+class AutomationMetricPoint(models.Model):
+    """
+    Weekly time series of automation metrics per project, taken from the
+    WeeklyProjectUpdate rows when a meeting ends. One row per (project, week, metric).
+    """
+    # Metric name -> WeeklyProjectUpdate field it is read from
+    METRIC_FIELDS = {
+        'regression_coverage': 'regression_coverage',
+        'total_available_test_cases': 'total_available_test_cases',
+        'total_automatable_test_cases': 'total_automatable_test_cases',
+        'total_automated_test_cases': 'total_automated_test_cases',
+        'total_automated_smoke_test_cases': 'total_automated_smoke_test_cases',
+        'bugs_found_through_automation': 'bugs_found_through_automation',
+    }
+    METRIC_CHOICES = [
+        ('regression_coverage', 'Regression Coverage'),
+        ('total_available_test_cases', 'Available Test Cases'),
+        ('total_automatable_test_cases', 'Automatable Test Cases'),
+        ('total_automated_test_cases', 'Automated Test Cases'),
+        ('total_automated_smoke_test_cases', 'Automated Smoke Test Cases'),
+        ('bugs_found_through_automation', 'Bugs Found Through Automation'),
+    ]
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='metric_points')
+    week = models.DateField(help_text="Monday of the meeting week")
+    metric = models.CharField(max_length=40, choices=METRIC_CHOICES)
+    value = models.FloatField()
+
+    class Meta:
+        unique_together = ('project', 'metric', 'week')
+        indexes = [
+            models.Index(fields=['metric', 'week'], name='dashboard_amp_metric_week_idx'),
+        ]
+        verbose_name = "Automation Metric Point"
+        verbose_name_plural = "Automation Metric Points"
+
+    def __str__(self):
+        return f"{self.project_id} {self.metric} @ {self.week}: {self.value}"
+
 class WeeklyProductMeeting(models.Model):
     meeting_date = models.DateTimeField(default=timezone.now)
     title = models.CharField(max_length=200, default="Manual Updates")
@@ -338,6 +499,22 @@ class WeeklyProductUpdate(models.Model):
     def get_solution_timeline_display(self):
         return dict(ProductProblem.TIMELINE_CHOICES).get(self.solution_timeline, self.solution_timeline)
 
+class ProductMeetingBaseline(models.Model):
+    """
+    Server-side state of a product during an active weekly product meeting.
+    Same layout as MeetingBaseline.
+    """
+    meeting = models.ForeignKey(WeeklyProductMeeting, on_delete=models.CASCADE, related_name='baselines')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    values = models.JSONField(null=True, blank=True, help_text="Product update values when the meeting started")
+    modified_fields = models.JSONField(default=list, blank=True, help_text="Fields changed during the meeting")
+
+    class Meta:
+        unique_together = ('meeting', 'project')
+
+    def __str__(self):
+        return f"Baseline of product #{self.project_id} for meeting #{self.meeting_id}"
+
 
 class Quarter(models.Model):
     QUARTER_CHOICES = [
@@ -405,25 +582,12 @@ class Quarter(models.Model):
         }
 
     def get_statistics(self):
-        """Return statistics for the quarter completion summary"""
-        targets = self.targets.all()
-        total_targets = targets.count()
-        completed_targets = targets.exclude(achieved_value__isnull=True).count()
-
-        # Calculate average achievement percentage
-        achievement_percentages = [
-            target.achievement_percentage 
-            for target in targets 
-            if target.achievement_percentage is not None
-        ]
-        avg_achievement = sum(achievement_percentages) / len(achievement_percentages) if achievement_percentages else 0
-
-        return {
-            'total_targets': total_targets,
-            'completed_targets': completed_targets,
-            'completion_percentage': (completed_targets / total_targets * 100) if total_targets > 0 else 0,
-            'avg_achievement_percentage': avg_achievement,
-        }
+        """Return statistics for the quarter completion summary, from its snapshot once completed"""
+        if self.completed:
+            summary = QuarterSummary.objects.filter(quarter=self).first()
+            if summary is not None:
+                return summary.statistics()
+        return QuarterTarget.statistics_by_quarter([self.pk]).get(self.pk, QuarterTarget.empty_statistics())
 
 
 class QuarterTarget(models.Model):
@@ -453,6 +617,84 @@ class QuarterTarget(models.Model):
             self.achievement_percentage = (self.achieved_value / self.target_value) * 100
         super().save(*args, **kwargs)
 
+    # Grouped statistics: a target is completed once achieved_value is recorded, and
+    # the average achievement only counts targets with an achievement_percentage
+
+    @staticmethod
+    def empty_statistics():
+        return {'total_targets': 0, 'completed_targets': 0, 'completion_percentage': 0, 'avg_achievement_percentage': 0}
+
+    @classmethod
+    def _grouped(cls, group_by, quarter_ids=None):
+        queryset = cls.objects.all()
+        if quarter_ids is not None:
+            queryset = queryset.filter(quarter_id__in=quarter_ids)
+        return queryset.values(*group_by).annotate(
+            total_targets=models.Count('id'),
+            completed_targets=models.Count('achieved_value'),
+            avg_achievement_percentage=models.Avg('achievement_percentage'),
+            achievement_count=models.Count('achievement_percentage'),
+        ).order_by(*group_by)
+
+    @classmethod
+    def statistics_by_quarter(cls, quarter_ids=None):
+        """Return {quarter_id: statistics} for the quarters that have targets, in one grouped query."""
+        statistics = {}
+        for row in cls._grouped(['quarter_id'], quarter_ids):
+            total, completed = row['total_targets'], row['completed_targets']
+            statistics[row['quarter_id']] = {
+                'total_targets': total,
+                'completed_targets': completed,
+                'completion_percentage': completed / total * 100,
+                'avg_achievement_percentage': row['avg_achievement_percentage'] or 0,
+            }
+        return statistics
+
+    @classmethod
+    def statistics_by_project(cls, quarter_ids=None):
+        """Return the target statistics of every project with targets, ordered by name, in one grouped query."""
+        return [
+            {
+                'project_id': row['project_id'],
+                'project_name': row['project__name'],
+                'target_count': row['total_targets'],
+                'completed_targets': row['completed_targets'],
+                'avg_achievement': row['avg_achievement_percentage'] or 0,
+                'achievement_count': row['achievement_count'],
+            }
+            for row in cls._grouped(['project__name', 'project_id'], quarter_ids)
+        ]
+
+    @staticmethod
+    def merge_project_statistics(*row_lists):
+        """
+        Combine statistics_by_project() rows of disjoint sets of quarters (e.g.
+        live rows and QuarterSummary snapshots), weighting the averages by
+        achievement_count. Ordered by project name.
+        """
+        merged = {}
+        for rows in row_lists:
+            for row in rows:
+                total = merged.setdefault(row['project_id'], {
+                    'project_id': row['project_id'], 'project_name': row['project_name'],
+                    'target_count': 0, 'completed_targets': 0, 'achievement_sum': 0.0, 'achievement_count': 0,
+                })
+                total['target_count'] += row['target_count']
+                total['completed_targets'] += row['completed_targets']
+                total['achievement_sum'] += float(row['avg_achievement']) * row['achievement_count']
+                total['achievement_count'] += row['achievement_count']
+        results = []
+        for total in sorted(merged.values(), key=lambda total: (total['project_name'], total['project_id'])):
+            achievement_sum = total.pop('achievement_sum')
+            total['avg_achievement'] = achievement_sum / total['achievement_count'] if total['achievement_count'] else 0
+            results.append(total)
+        return results
+
+    @classmethod
+    def grouped_statistics(cls, quarter_ids=None):
+        """Return (statistics_by_quarter, statistics_by_project), two SQL queries in total."""
+        return cls.statistics_by_quarter(quarter_ids), cls.statistics_by_project(quarter_ids)
+
 
 class QuarterTargetResource(models.Model):
     quarter_target = models.ForeignKey(QuarterTarget, on_delete=models.CASCADE)
@@ -474,6 +716,69 @@ class QuarterTargetResource(models.Model):
             raise ValidationError({'allocation_percentage': 'Allocation percentage cannot exceed 100%'})
 
 
+class QuarterSummary(models.Model):
+    """
+    Frozen statistics of a completed quarter, written in the same transaction
+    that completes it so summaries and the quarter dashboard no longer
+    aggregate its targets on every request.
+    """
+    quarter = models.OneToOneField(Quarter, on_delete=models.CASCADE, related_name='summary')
+    total_targets = models.IntegerField(default=0)
+    completed_targets = models.IntegerField(default=0)
+    completion_percentage = models.FloatField(default=0)
+    avg_achievement_percentage = models.FloatField(default=0)
+    project_achievement = models.JSONField(default=list, blank=True, help_text="Per-project target statistics")
+    resource_allocations = models.JSONField(default=list, blank=True, help_text="Allocation totals per resource")
+    total_allocation_percentage = models.FloatField(default=0)
+    captured_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Quarter summaries"
+
+    def __str__(self):
+        return f"Summary of {self.quarter}"
+
+    def statistics(self):
+        """Return the stored statistics in the shape of Quarter.get_statistics()"""
+        return {
+            'total_targets': self.total_targets,
+            'completed_targets': self.completed_targets,
+            'completion_percentage': self.completion_percentage,
+            'avg_achievement_percentage': self.avg_achievement_percentage,
+        }
+
+    @classmethod
+    def capture(cls, quarter):
+        """Compute the statistics of a quarter from its targets and store (or replace) its summary."""
+        statistics = QuarterTarget.statistics_by_quarter([quarter.pk]).get(quarter.pk, QuarterTarget.empty_statistics())
+        project_achievement = [
+            {**row, 'avg_achievement': float(row['avg_achievement'])}
+            for row in QuarterTarget.statistics_by_project([quarter.pk])
+        ]
+        resource_allocations = [
+            {
+                'resource_id': row['resource_id'],
+                'resource_name': row['resource__name'],
+                'target_count': row['target_count'],
+                'allocation_percentage': float(row['allocation_percentage'] or 0),
+            }
+            for row in QuarterTargetResource.objects.filter(quarter_target__quarter=quarter)
+            .values('resource__name', 'resource_id')
+            .annotate(target_count=models.Count('quarter_target'), allocation_percentage=models.Sum('allocation_percentage'))
+            .order_by('resource__name', 'resource_id')
+        ]
+        summary, _ = cls.objects.update_or_create(quarter=quarter, defaults={
+            'total_targets': statistics['total_targets'],
+            'completed_targets': statistics['completed_targets'],
+            'completion_percentage': float(statistics['completion_percentage']),
+            'avg_achievement_percentage': float(statistics['avg_achievement_percentage']),
+            'project_achievement': project_achievement,
+            'resource_allocations': resource_allocations,
+            'total_allocation_percentage': sum(row['allocation_percentage'] for row in resource_allocations),
+        })
+        return summary
+
+
 class ResourceLeave(models.Model):
     LEAVE_TYPE_CHOICES = [
         ('vacation', 'Vacation'),
@@ -496,11 +801,18 @@ class ResourceLeave(models.Model):
         if self.end_date < self.start_date:
             raise ValidationError({'end_date': 'End date cannot be before start date'})
 
+    class Meta:
+        # Date window queries of the resource planning calendar feed
+        indexes = [
+            models.Index(fields=['start_date', 'end_date'], name='dashboard_leave_window_idx'),
+            models.Index(fields=['resource', 'start_date'], name='dashboard_leave_res_start_idx'),
+        ]
+
     def __str__(self):
         return f"{self.resource.name} - {self.get_leave_type_display()} ({self.start_date} to {self.end_date})"
 
 
-class Rock(models.Model):
+class Rock(OverdueFlagMixin, models.Model):
     """
     A Rock represents an important task or goal that needs to be accomplished.
     Rocks can be assigned to resources and optionally associated with projects or quarter targets.
@@ -533,9 +845,17 @@ class Rock(models.Model):
     start_date = models.DateField(null=True, blank=True, help_text="Date when work on the rock started")
     due_date = models.DateField(null=True, blank=True, help_text="Date when the rock is due")
     completed_at = models.DateTimeField(null=True, blank=True, help_text="Date and time when the rock was completed")
+    # Maintained by OverdueFlagMixin and the scan_overdue command
+    overdue = models.BooleanField(default=False)
+    overdue_since = models.DateField(null=True, blank=True)
+
+    OVERDUE_DATE_FIELD = 'due_date'
 
     class Meta:
         ordering = ['-priority', 'due_date', 'title']
+        indexes = [
+            models.Index(fields=['overdue', 'due_date'], name='dashboard_rock_overdue_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -653,7 +973,7 @@ class ProductionBug(models.Model):
         return reverse('production-bug-detail', kwargs={'pk': self.pk})
 
 
-class RoadmapItem(models.Model):
+class RoadmapItem(OverdueFlagMixin, models.Model):
     """
     A RoadmapItem represents a strategic goal, milestone, or deliverable in the roadmap.
     It can be associated with a project or quarterly target and assigned to an owner.
@@ -688,9 +1008,17 @@ class RoadmapItem(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True, help_text="Date and time when the item was completed")
+    # Maintained by OverdueFlagMixin and the scan_overdue command
+    overdue = models.BooleanField(default=False)
+    overdue_since = models.DateField(null=True, blank=True)
 
     class Meta:
         ordering = ['start_date', 'end_date', 'title']
+        indexes = [
+            # Timeline delta reads: a quarter's items changed since a timestamp
+            models.Index(fields=['quarter', 'updated_at'], name='dashboard_roadmap_delta_idx'),
+            models.Index(fields=['overdue', 'end_date'], name='dashboard_roadmap_overdue_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -788,10 +1116,19 @@ class UserAction(models.Model):
     record_id = models.IntegerField(blank=True, null=True, help_text="The primary key of the related record")
     details = models.TextField(blank=True, null=True, help_text="Additional details about the action")
     ip_address = models.GenericIPAddressField(blank=True, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the action happens, not when the buffered audit writer inserts it
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ['-timestamp']
+        # The action log filters on one of these columns and pages on timestamp;
+        # details and model_name are also full-text indexed (migration 0051)
+        indexes = [
+            models.Index(fields=['timestamp'], name='dashboard_ua_time_idx'),
+            models.Index(fields=['user', 'timestamp'], name='dashboard_ua_user_time_idx'),
+            models.Index(fields=['action_type', 'timestamp'], name='dashboard_ua_type_time_idx'),
+            models.Index(fields=['model_name', 'timestamp'], name='dashboard_ua_model_time_idx'),
+        ]
         verbose_name = "User Action"
         verbose_name_plural = "User Actions"
 
@@ -799,6 +1136,30 @@ class UserAction(models.Model):
         return f"{self.user.username} - {self.get_action_type_display()} - {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
 
 
+class UserActionDailyRollup(models.Model):
+    """
+    Number of UserActions per day, user, action type and model name. Rollups
+    outlive the raw rows, which are archived once they leave the retention
+    window (see dashboard.activity).
+    """
+    day = models.DateField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='action_rollups')
+    action_type = models.CharField(max_length=20, choices=UserAction.ACTION_TYPES)
+    # '' rather than NULL, so the unique constraint also covers actions without a model
+    model_name = models.CharField(max_length=100, blank=True, default='')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-day', 'user', 'action_type', 'model_name']
+        unique_together = ('day', 'user', 'action_type', 'model_name')
+        indexes = [
+            models.Index(fields=['day', 'action_type'], name='dashboard_uarollup_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.action_type} - {self.day}: {self.count}"
+
+
 class DeletedRecord(models.Model):
     """
     Stores information about deleted records for potential restoration.
@@ -807,11 +1168,20 @@ class DeletedRecord(models.Model):
     model_name = models.CharField(max_length=100, help_text="The model class name of the deleted record")
     record_id = models.IntegerField(help_text="The primary key of the deleted record")
     data = models.TextField(help_text="JSON serialized data of the deleted record")
+    # Compressed snapshot of the record and every row deleted with it (see dashboard.recycle);
+    # empty for records deleted before snapshots were introduced
+    payload = models.BinaryField(null=True, blank=True, editable=False)
+    related_count = models.PositiveIntegerField(default=0, help_text="Number of related rows deleted with the record")
     deleted_at = models.DateTimeField(auto_now_add=True)
     deleted_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
 
     class Meta:
         ordering = ['-deleted_at']
+        # The recycle bin lists newest first, optionally for one model; retention purges by age
+        indexes = [
+            models.Index(fields=['deleted_at'], name='dashboard_dr_deleted_idx'),
+            models.Index(fields=['model_name', 'deleted_at'], name='dashboard_dr_model_deleted_idx'),
+        ]
         verbose_name = "Deleted Record"
         verbose_name_plural = "Deleted Records"
 
@@ -832,6 +1202,15 @@ class DeletedRecord(models.Model):
         # Get the model class
         model_class = apps.get_model('dashboard', self.model_name)
 
+        # Records with a snapshot restore the whole deleted graph
+        if self.payload:
+            from .recycle import restore_payload
+
+            with transaction.atomic():
+                restore_payload(self.payload)
+                self.delete()
+            return model_class._base_manager.get(pk=self.record_id)
+
         # Create a new instance with the stored data
         data_dict = self.get_data_dict()
 
@@ -1179,3 +1558,170 @@ class AutomationSprint(models.Model):
 
     def get_absolute_url(self):
         return reverse('automation-sprint-detail', kwargs={'pk': self.pk})
+
+
+class DashboardSnapshot(models.Model):
+    """
+    Materialized dashboard totals, kept as a single row.
+    Signal handlers in dashboard.signals apply deltas whenever products, resources,
+    assignments or monthly feedback change; the rebuild_dashboard_snapshot command
+    recomputes it from scratch.
+    """
+    # Maps Project.status values to the counter that tracks them
+    STATUS_FIELDS = {
+        'not_started': 'not_started_products',
+        'in_progress': 'active_products',
+        'completed': 'completed_products',
+        'on_hold': 'on_hold_products',
+    }
+
+    # Project fields summed into the automation totals
+    AUTOMATION_FIELDS = [
+        'total_automatable_test_cases',
+        'total_automated_test_cases',
+        'total_automatable_smoke_test_cases',
+        'total_automated_smoke_test_cases',
+        'bugs_found_through_automation',
+    ]
+
+    # Product totals
+    total_products = models.IntegerField(default=0)
+    not_started_products = models.IntegerField(default=0)
+    active_products = models.IntegerField(default=0)
+    completed_products = models.IntegerField(default=0)
+    on_hold_products = models.IntegerField(default=0)
+
+    # Resource totals
+    total_resources = models.IntegerField(default=0)
+    total_assignments = models.IntegerField(default=0)
+
+    # Automation totals
+    total_automatable_test_cases = models.IntegerField(default=0)
+    total_automated_test_cases = models.IntegerField(default=0)
+    total_automatable_smoke_test_cases = models.IntegerField(default=0)
+    total_automated_smoke_test_cases = models.IntegerField(default=0)
+    bugs_found_through_automation = models.IntegerField(default=0)
+
+    # Monthly feedback totals for feedback_month/feedback_year
+    feedback_month = models.IntegerField(default=0)
+    feedback_year = models.IntegerField(default=0)
+    submitted_feedbacks = models.IntegerField(default=0)
+
+    rebuilt_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Dashboard Snapshot"
+        verbose_name_plural = "Dashboard Snapshot"
+
+    def __str__(self):
+        return f"Dashboard snapshot (rebuilt {self.rebuilt_at.strftime('%Y-%m-%d %H:%M')})"
+
+    def status_counts(self):
+        """Return product counts keyed by Project.status"""
+        return {status: getattr(self, field_name) for status, field_name in self.STATUS_FIELDS.items()}
+
+    @classmethod
+    def project_contribution(cls, project):
+        """Return the counters a single project adds to the snapshot."""
+        contribution = {'total_products': 1}
+        status_field = cls.STATUS_FIELDS.get(project.status)
+        if status_field:
+            contribution[status_field] = 1
+        for field_name in cls.AUTOMATION_FIELDS:
+            contribution[field_name] = getattr(project, field_name) or 0
+        return contribution
+
+    @classmethod
+    def load(cls):
+        """
+        Return the snapshot row, rebuilding it if it does not exist yet.
+        The feedback counter is refreshed when the calendar month has rolled over.
+        """
+        snapshot = cls.objects.filter(pk=1).first()
+        if snapshot is None:
+            return cls.rebuild()
+
+        now = timezone.now()
+        if (snapshot.feedback_month, snapshot.feedback_year) != (now.month, now.year):
+            snapshot.feedback_month = now.month
+            snapshot.feedback_year = now.year
+            snapshot.submitted_feedbacks = MonthlyFeedback.objects.filter(
+                month=now.month, year=now.year, status='submitted'
+            ).count()
+            snapshot.save(update_fields=['feedback_month', 'feedback_year', 'submitted_feedbacks', 'updated_at'])
+        return snapshot
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every total from the source tables and store it."""
+        aggregates = {'total_products': models.Count('id')}
+        for status, field_name in cls.STATUS_FIELDS.items():
+            aggregates[field_name] = models.Count('id', filter=models.Q(status=status))
+        for field_name in cls.AUTOMATION_FIELDS:
+            aggregates[field_name] = models.Sum(field_name)
+        values = Project.objects.aggregate(**aggregates)
+        values = {key: value or 0 for key, value in values.items()}
+
+        now = timezone.now()
+        values.update({
+            'total_resources': Resource.objects.count(),
+            'total_assignments': ProjectResource.objects.count(),
+            'feedback_month': now.month,
+            'feedback_year': now.year,
+            'submitted_feedbacks': MonthlyFeedback.objects.filter(
+                month=now.month, year=now.year, status='submitted'
+            ).count(),
+            'rebuilt_at': now,
+        })
+        snapshot, _ = cls.objects.update_or_create(pk=1, defaults=values)
+        return snapshot
+
+    @classmethod
+    def apply_delta(cls, deltas, feedback_period=None):
+        """
+        Atomically add the given deltas to the snapshot counters.
+        Feedback deltas are only applied when feedback_period matches the stored month.
+        Nothing happens if the snapshot has not been built yet; the next load() rebuilds it.
+        """
+        deltas = {key: value for key, value in deltas.items() if value}
+        if not deltas:
+            return
+        queryset = cls.objects.filter(pk=1)
+        if feedback_period is not None:
+            queryset = queryset.filter(feedback_month=feedback_period[0], feedback_year=feedback_period[1])
+        queryset.update(
+            updated_at=timezone.now(),
+            **{key: models.F(key) + value for key, value in deltas.items()}
+        )
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of an indexed row (product, production bug, product update, ...).
+
+    dashboard.search keeps these rows in sync with their source objects and
+    queries them through the database's full-text index.
+    """
+    KIND_CHOICES = [
+        ('project', 'Product'),
+        ('production_bug', 'Production Bug'),
+        ('product_update', 'Product Update'),
+        ('product_problem', 'Product Problem'),
+        ('product_documentation', 'Product Documentation'),
+        ('department_document', 'Department Document'),
+        ('sop', 'SOP'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=300)
+    body = models.TextField(blank=True)
+    url = models.CharField(max_length=500, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('kind', 'object_id')
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
@@ -0,0 +1,180 @@
+"""
+Keyset (cursor) pagination.
+
+Instead of COUNT(*) + OFFSET, pages are fetched with a WHERE clause on the
+(sort key, pk) tuple of the last row seen, so page N costs the same as page 1
+as long as the sort key is indexed. Cursors are opaque url-safe tokens.
+
+Sort keys must be non-nullable; CursorPaginator.supports() tells callers when
+they should fall back to the offset paginator.
+"""
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder keeps milliseconds only; cursors need exact key values."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def _split_ordering(ordering):
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def _resolve_field(model, path):
+    """Return the model field at the end of a '__' separated path."""
+    field = None
+    for part in path.split('__'):
+        if model is None:
+            raise FieldDoesNotExist(path)
+        field = model._meta.pk if part == 'pk' else model._meta.get_field(part)
+        model = field.related_model
+    return field
+
+
+def _value(obj, path):
+    for part in path.split('__'):
+        obj = getattr(obj, part)
+        if obj is None:
+            break
+    if hasattr(obj, '_meta'):
+        obj = obj.pk
+    return obj
+
+
+class CursorPage:
+    """A page of results with opaque next/previous cursors."""
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Paginate a queryset on an ordering such as ['-timestamp', '-pk'].
+
+    The ordering must end with a unique field (normally pk) so rows are never
+    skipped or repeated. count_limit, if given, caps the count query: count
+    returns at most count_limit and count_is_approximate tells whether the
+    real total is higher.
+    """
+
+    def __init__(self, queryset, per_page, ordering, count_limit=None):
+        self.queryset = queryset.order_by(*ordering)
+        self.per_page = per_page
+        self.ordering = _split_ordering(ordering)
+        self.count_limit = count_limit
+        self._fields = [_resolve_field(queryset.model, name) for name, _ in self.ordering]
+        self._count = None
+
+    @classmethod
+    def supports(cls, model, ordering):
+        """Return True if every ordering field exists and is non-nullable."""
+        try:
+            return all(not _resolve_field(model, name).null for name, _ in _split_ordering(ordering))
+        except FieldDoesNotExist:
+            return False
+
+    # Cursor encoding
+
+    def encode_cursor(self, obj, direction):
+        values = [_value(obj, name) for name, _ in self.ordering]
+        payload = json.dumps({'d': direction, 'v': values}, cls=_CursorEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, token):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            direction, values = payload['d'], payload['v']
+            if direction not in ('next', 'prev') or len(values) != len(self.ordering):
+                raise ValueError('cursor does not match the ordering')
+            target_fields = [getattr(field, 'target_field', field) for field in self._fields]
+            return direction, [field.to_python(value) for field, value in zip(target_fields, values)]
+        except (TypeError, ValueError, KeyError, AttributeError) as e:
+            raise InvalidCursor(str(e)) from e
+
+    # Querying
+
+    def _after(self, values, reverse=False):
+        """Q object selecting the rows after the given key values in (possibly reversed) order."""
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.ordering, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def page(self, cursor=None):
+        """Return the CursorPage for a cursor token (None for the first page)."""
+        if not cursor:
+            direction, values = 'next', None
+        else:
+            direction, values = self.decode_cursor(cursor)
+
+        if direction == 'next':
+            queryset = self.queryset
+            if values is not None:
+                queryset = queryset.filter(self._after(values))
+            rows = list(queryset[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_next, has_previous = has_more, values is not None
+        else:
+            queryset = self.queryset.reverse().filter(self._after(values, reverse=True))
+            rows = list(queryset[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next, has_previous = True, has_more
+
+        next_cursor = self.encode_cursor(rows[-1], 'next') if rows and has_next else None
+        previous_cursor = self.encode_cursor(rows[0], 'prev') if rows and has_previous else None
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    @property
+    def count(self):
+        if self._count is None:
+            if self.count_limit is None:
+                self._count = self.queryset.count()
+            else:
+                self._count = self.queryset.order_by()[:self.count_limit + 1].count()
+        return min(self._count, self.count_limit) if self.count_limit is not None else self._count
+
+    @property
+    def count_is_approximate(self):
+        count = self.count  # runs the count query if needed
+        return self.count_limit is not None and self._count > count
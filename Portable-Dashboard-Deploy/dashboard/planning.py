@@ -0,0 +1,156 @@
+"""
+Resource planning calendar feed.
+
+The resource planning calendar fetches its events for the visible date window
+only, so the page no longer embeds every assignment and leave ever recorded.
+Both sources are selected with range conditions on the indexed
+start_date / end_date columns.
+
+The assignment and leave tables of the page likewise list only what is current
+or upcoming; past rows are found with the page's search, which returns at most
+TABLE_ROW_LIMIT rows per table.
+"""
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import ProjectResource, ResourceLeave
+
+# Assignments without an end date are shown for this many days
+DEFAULT_ASSIGNMENT_DAYS = 30
+
+# Largest window a single feed request may cover
+MAX_WINDOW_DAYS = 400
+
+# Rows rendered per table of the planning page
+TABLE_ROW_LIMIT = 200
+
+ASSIGNMENT_COLOR = '#3788d8'
+LEAVE_COLOR = '#e74c3c'
+
+
+def _parse_day(value, name):
+    if not value:
+        raise ValueError(f'{name} is required')
+    # FullCalendar sends ISO datetimes such as 2024-01-28T00:00:00+05:00; an
+    # unencoded '+' in the query string arrives as a space
+    parsed = parse_datetime(value.replace(' ', '+'))
+    if parsed is None:
+        raise ValueError(f'{name} must be an ISO date')
+    return parsed.date()
+
+
+def parse_window(start, end):
+    """
+    Parse the start (inclusive) / end (exclusive) bounds of a calendar window.
+
+    Raises:
+        ValueError: If a bound is missing or invalid, or the window is empty or too large
+    """
+    start, end = _parse_day(start, 'start'), _parse_day(end, 'end')
+    if end <= start:
+        raise ValueError('end must be after start')
+    if (end - start).days > MAX_WINDOW_DAYS:
+        raise ValueError(f'the window cannot exceed {MAX_WINDOW_DAYS} days')
+    return start, end
+
+
+def assignments_in_window(start, end, resource_id=None, project_id=None):
+    """Return the project assignments overlapping [start, end)."""
+    queryset = ProjectResource.objects.filter(start_date__lt=end).filter(
+        Q(end_date__gte=start)
+        | Q(end_date__isnull=True, start_date__gte=start - timedelta(days=DEFAULT_ASSIGNMENT_DAYS))
+    )
+    if resource_id is not None:
+        queryset = queryset.filter(resource_id=resource_id)
+    if project_id is not None:
+        queryset = queryset.filter(project_id=project_id)
+    return queryset.select_related('project', 'resource').order_by('start_date', 'pk')
+
+
+def leaves_in_window(start, end, resource_id=None):
+    """Return the leaves overlapping [start, end)."""
+    queryset = ResourceLeave.objects.filter(start_date__lt=end, end_date__gte=start)
+    if resource_id is not None:
+        queryset = queryset.filter(resource_id=resource_id)
+    return queryset.select_related('resource').order_by('start_date', 'pk')
+
+
+def table_rows(today, search=None, limit=TABLE_ROW_LIMIT):
+    """
+    Return (assignments, leaves, truncated) for the tables of the planning page.
+
+    Without a search they hold the assignments and leaves that have not ended
+    by today, soonest first. A search matches resource names, project names and
+    leave types over all dates, newest first. Each list has at most limit rows;
+    truncated tells whether either had more.
+    """
+    assignments = ProjectResource.objects.select_related('project', 'resource')
+    leaves = ResourceLeave.objects.select_related('resource')
+    if search:
+        assignments = assignments.filter(
+            Q(resource__name__icontains=search) | Q(project__name__icontains=search)
+        ).order_by('-start_date', '-pk')
+        leaves = leaves.filter(
+            Q(resource__name__icontains=search) | Q(leave_type__icontains=search)
+        ).order_by('-start_date', '-pk')
+    else:
+        assignments = assignments.filter(Q(end_date__gte=today) | Q(end_date__isnull=True)).order_by('start_date', 'pk')
+        leaves = leaves.filter(end_date__gte=today).order_by('start_date', 'pk')
+
+    assignments, leaves = list(assignments[:limit + 1]), list(leaves[:limit + 1])
+    truncated = len(assignments) > limit or len(leaves) > limit
+    return assignments[:limit], leaves[:limit], truncated
+
+
+def assignment_event(assignment):
+    end_date = assignment.end_date or (assignment.start_date + timedelta(days=DEFAULT_ASSIGNMENT_DAYS))
+    return {
+        'id': f'project_{assignment.id}',
+        'title': f'{assignment.resource.name} - {assignment.project.name}',
+        'start': assignment.start_date.isoformat(),
+        'end': end_date.isoformat(),
+        'color': ASSIGNMENT_COLOR,
+        'extendedProps': {
+            'type': 'project',
+            'resource_id': assignment.resource_id,
+            'project_id': assignment.project_id,
+            'utilization': float(assignment.utilization_percentage),
+            'hours': float(assignment.hours_allocated),
+            'notes': assignment.notes,
+        },
+    }
+
+
+def leave_event(leave, today):
+    is_past_leave = leave.end_date < today
+    title = f'{leave.resource.name} - {leave.get_leave_type_display()}'
+    if is_past_leave:
+        title += ' (Past Leave)'
+    return {
+        'id': f'leave_{leave.id}',
+        'title': title,
+        'start': leave.start_date.isoformat(),
+        'end': leave.end_date.isoformat(),
+        'color': LEAVE_COLOR,
+        'extendedProps': {
+            'type': 'leave',
+            'resource_id': leave.resource_id,
+            'leave_type': leave.leave_type,
+            'description': leave.description,
+            'is_past_leave': is_past_leave,
+        },
+    }
+
+
+def calendar_events(start, end, resource_id=None, project_id=None):
+    """
+    Return the FullCalendar events of the window: project assignments
+    (filtered by resource and project) followed by leaves (filtered by resource).
+    """
+    today = timezone.now().date()
+    events = [assignment_event(assignment) for assignment in assignments_in_window(start, end, resource_id, project_id)]
+    events.extend(leave_event(leave, today) for leave in leaves_in_window(start, end, resource_id))
+    return events
@@ -0,0 +1,42 @@
+"""
+Filter options for the product list.
+
+The team lead dropdown needs the distinct set of resources leading at least one
+product. That DISTINCT join only changes when a Project.team_lead changes (or a
+lead is renamed or deleted), so the list is cached under a version key that the
+signal handlers bump.
+"""
+import uuid
+
+from django.core.cache import cache
+
+from .models import Resource
+
+TEAM_LEAD_CACHE_VERSION_KEY = 'dashboard:team-lead-options:version'
+TEAM_LEAD_CACHE_TIMEOUT = 60 * 60
+
+
+def invalidate_team_lead_options():
+    """Invalidate the cached team lead option list."""
+    cache.set(TEAM_LEAD_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _team_lead_cache_version():
+    version = cache.get(TEAM_LEAD_CACHE_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(TEAM_LEAD_CACHE_VERSION_KEY, version, None)
+    return version
+
+
+def team_lead_options():
+    """Return [{'id', 'name'}, ...] for every resource that leads a product, ordered by name."""
+    key = f'dashboard:team-lead-options:{_team_lead_cache_version()}'
+    options = cache.get(key)
+    if options is None:
+        options = list(
+            Resource.objects.filter(products_as_lead__isnull=False)
+            .distinct().order_by('name', 'pk').values('id', 'name')
+        )
+        cache.set(key, options, TEAM_LEAD_CACHE_TIMEOUT)
+    return options
@@ -0,0 +1,330 @@
+"""
+Recycle bin snapshots.
+
+Deleting an object through RecyclableDeleteView removes everything Django
+cascades to as well (a product takes its assignments, weekly updates, quarter
+targets, ...). The view hands the object to recycle_object(), which runs the
+deletion through one Collector and, in the same transaction, stores every
+collected row, plus the foreign keys that on_delete=SET_NULL is about to
+clear, in DeletedRecord.payload as zlib-compressed JSON.
+
+restore_payload() replays a snapshot: rows are re-inserted with bulk_create,
+parents before children, their auto_now / auto_now_add timestamps are written
+back, then the cleared foreign keys are set back. Since
+bulk_create sends no signals, the denormalized data the signal handlers
+maintain (search index, dashboard totals, reporting hierarchy, cached filter
+options) is refreshed explicitly afterwards.
+
+bulk_restore() and bulk_purge() work through a selection of records in
+chunked transactions and report progress after each chunk; the
+purge_deleted_records command applies the retention period.
+"""
+import datetime
+import json
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field as dataclass_field
+from typing import List, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import router, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.db.models.deletion import Collector
+
+from . import hierarchy, product_filters, search
+from .models import DashboardSnapshot, DeletedRecord, ResourceHierarchy
+
+PAYLOAD_VERSION = 1
+
+# Rows derived from other tables; they are rebuilt on restore instead of stored
+DERIVED_MODELS = {ResourceHierarchy}
+
+# Models whose restore changes the totals of the DashboardSnapshot
+SNAPSHOT_MODELS = {'dashboard.Project', 'dashboard.Resource', 'dashboard.ProjectResource', 'dashboard.MonthlyFeedback'}
+
+RESTORE_BATCH_SIZE = 500
+
+# Records restored or purged per transaction by the bulk operations
+BULK_CHUNK_SIZE = 100
+
+DEFAULT_RETENTION_DAYS = 180
+
+
+class _SnapshotEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder keeps milliseconds only; restored timestamps must be exact."""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _row(obj):
+    return {field.attname: field.value_from_object(obj) for field in obj._meta.concrete_fields}
+
+
+def _collected_rows(collector):
+    """Return {model: {pk: row}} of every row the collector is going to delete."""
+    rows = defaultdict(dict)
+    for model, instances in collector.data.items():
+        for obj in instances:
+            rows[model][obj.pk] = _row(obj)
+    for queryset in collector.fast_deletes:
+        for obj in queryset:
+            rows[queryset.model][obj.pk] = _row(obj)
+    return {model: model_rows for model, model_rows in rows.items() if model not in DERIVED_MODELS}
+
+
+def _cleared_references(collector):
+    """Return [(model label, attname, [[pk, value], ...])] for the foreign keys the deletion sets to NULL."""
+    references = []
+    for (field, value), instances_list in collector.field_updates.items():
+        if field.model in DERIVED_MODELS:
+            continue
+        values = []
+        for instances in instances_list:
+            if isinstance(instances, QuerySet):
+                # Read the current values without evaluating the queryset the collector will update
+                rows = instances.values_list('pk', field.attname)
+            else:
+                rows = [(obj.pk, getattr(obj, field.attname)) for obj in instances]
+            values.extend([pk, old] for pk, old in rows if old is not None)
+        if values:
+            references.append((field.model._meta.label, field.attname, values))
+    return references
+
+
+def _insert_order(models):
+    """Order models so that each comes after the models it has a foreign key to."""
+    models = list(models)
+    ordered = []
+    while models:
+        for model in models:
+            parents = {
+                field.related_model for field in model._meta.concrete_fields
+                if field.is_relation and field.related_model is not model
+            }
+            if not parents.intersection(models):
+                break
+        else:
+            # A cycle between the models: fall back to the remaining order
+            model = models[0]
+        models.remove(model)
+        ordered.append(model)
+    return ordered
+
+
+def encode_payload(rows, references):
+    document = {
+        'version': PAYLOAD_VERSION,
+        'models': [
+            [model._meta.label, list(rows[model].values())] for model in _insert_order(rows)
+        ],
+        'references': references,
+    }
+    return zlib.compress(json.dumps(document, cls=_SnapshotEncoder, separators=(',', ':')).encode())
+
+
+def decode_payload(payload):
+    return json.loads(zlib.decompress(bytes(payload)))
+
+
+def recycle_object(obj, deleted_by=None):
+    """
+    Delete obj and everything that cascades from it, storing all of it in one
+    DeletedRecord. Returns the DeletedRecord.
+    """
+    using = router.db_for_write(type(obj), instance=obj)
+    with transaction.atomic(using=using):
+        collector = Collector(using=using, origin=obj)
+        collector.collect([obj])
+        rows = _collected_rows(collector)
+        record = DeletedRecord.objects.create(
+            model_name=type(obj).__name__,
+            record_id=obj.pk,
+            data=json.dumps(_row(obj), cls=DjangoJSONEncoder),
+            payload=encode_payload(rows, _cleared_references(collector)),
+            related_count=sum(len(model_rows) for model_rows in rows.values()) - 1,
+            deleted_by=deleted_by,
+        )
+        collector.delete()
+    return record
+
+
+def _value(field, row):
+    target = field.target_field if field.is_relation else field
+    return target.to_python(row[field.attname])
+
+
+def _instance(model, row):
+    return model(**{
+        field.attname: _value(field, row) for field in model._meta.concrete_fields if field.attname in row
+    })
+
+
+def _auto_timestamp_fields(model):
+    """The auto_now / auto_now_add fields, which bulk_create overwrites with the current time."""
+    return [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+
+
+def restore_payload(payload, refresh=True):
+    """
+    Re-create the rows of a snapshot and re-link the foreign keys its deletion
+    cleared. Returns {model label: [restored pks]}. Pass refresh=False to
+    batch the refresh of denormalized data with refresh_restored(). Raises
+    IntegrityError if a row the snapshot refers to no longer exists.
+    """
+    document = decode_payload(payload)
+    restored = {}
+    with transaction.atomic():
+        for label, rows in document['models']:
+            model = apps.get_model(label)
+            objs = [_instance(model, row) for row in rows]
+            model._base_manager.bulk_create(objs, batch_size=RESTORE_BATCH_SIZE)
+            # Put back the snapshotted timestamps; bulk_update does not call pre_save
+            timestamp_fields = [field for field in _auto_timestamp_fields(model) if field.attname in rows[0]]
+            if timestamp_fields:
+                for obj, row in zip(objs, rows):
+                    for field in timestamp_fields:
+                        setattr(obj, field.attname, _value(field, row))
+                model._base_manager.bulk_update(
+                    objs, [field.name for field in timestamp_fields], batch_size=RESTORE_BATCH_SIZE
+                )
+            restored[label] = [row[model._meta.pk.attname] for row in rows]
+
+        for label, attname, values in document['references']:
+            model = apps.get_model(label)
+            field = next(field for field in model._meta.concrete_fields if field.attname == attname)
+            pks_by_value = defaultdict(list)
+            for pk, value in values:
+                pks_by_value[field.target_field.to_python(value)].append(pk)
+            for value, pks in pks_by_value.items():
+                model._base_manager.filter(pk__in=pks).update(**{attname: value})
+
+        # Foreign keys are only checked at commit (SQLite, PostgreSQL); check them
+        # here so a snapshot whose parents are gone fails on its own
+        tables = {apps.get_model(label)._meta.db_table for label, _ in document['models']}
+        tables.update(apps.get_model(label)._meta.db_table for label, _, _ in document['references'])
+        transaction.get_connection().check_constraints(table_names=sorted(tables))
+
+        if refresh:
+            refresh_restored(restored)
+    return restored
+
+
+def refresh_restored(restored):
+    """Bring the data the signal handlers maintain up to date with restored rows ({label: [pks]})."""
+    labels = set(restored)
+    for label, pks in restored.items():
+        search.index_objects(apps.get_model(label), pks)
+    if labels & SNAPSHOT_MODELS:
+        DashboardSnapshot.rebuild()
+    if 'dashboard.Resource' in labels:
+        hierarchy.rebuild_resource_hierarchy()
+    if labels & {'dashboard.Project', 'dashboard.Resource'}:
+        product_filters.invalidate_team_lead_options()
+
+
+# Bulk operations
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk restore or purge."""
+    total: int
+    done: int = 0
+    errors: List[Tuple[int, str]] = dataclass_field(default_factory=list)
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+
+def deleted_records(model_name=None, search=None, deleted_after=None, deleted_before=None, ids=None):
+    """
+    Return the DeletedRecords matching the recycle bin filters. A numeric
+    search matches the deleted record's id, anything else the model name.
+    """
+    queryset = DeletedRecord.objects.all()
+    if ids is not None:
+        queryset = queryset.filter(pk__in=ids)
+    if model_name:
+        queryset = queryset.filter(model_name=model_name)
+    if deleted_after:
+        queryset = queryset.filter(deleted_at__gte=deleted_after)
+    if deleted_before:
+        queryset = queryset.filter(deleted_at__lt=deleted_before)
+    search = (search or '').strip()
+    if search.isdigit():
+        queryset = queryset.filter(record_id=int(search))
+    elif search:
+        queryset = queryset.filter(model_name__icontains=search)
+    return queryset
+
+
+def _chunks(queryset, chunk_size):
+    """Yield lists of pks of queryset, oldest deletion first, reading one chunk at a time."""
+    queryset = queryset.order_by('deleted_at', 'pk')
+    last = None
+    while True:
+        chunk = queryset
+        if last is not None:
+            chunk = chunk.filter(Q(deleted_at__gt=last[0]) | Q(deleted_at=last[0], pk__gt=last[1]))
+        rows = list(chunk.values_list('deleted_at', 'pk')[:chunk_size])
+        if not rows:
+            return
+        last = rows[-1]
+        yield [pk for _, pk in rows]
+
+
+def bulk_restore(queryset, chunk_size=BULK_CHUNK_SIZE, progress=None):
+    """
+    Restore every DeletedRecord of queryset, chunk_size records per
+    transaction. A record that cannot be restored (e.g. its id was reused)
+    is skipped and reported without undoing the rest of its chunk.
+    progress(result) is called after each chunk. Returns a BulkResult.
+    """
+    result = BulkResult(total=queryset.count())
+    for pks in _chunks(queryset, chunk_size):
+        restored = defaultdict(list)
+        with transaction.atomic():
+            for record in DeletedRecord.objects.filter(pk__in=pks).order_by('deleted_at', 'pk'):
+                try:
+                    with transaction.atomic():
+                        if record.payload:
+                            for label, restored_pks in restore_payload(record.payload, refresh=False).items():
+                                restored[label].extend(restored_pks)
+                            record.delete()
+                        else:
+                            record.restore()
+                except Exception as e:
+                    result.errors.append((record.pk, str(e)))
+                else:
+                    result.done += 1
+            refresh_restored(restored)
+        if progress is not None:
+            progress(result)
+    return result
+
+
+def bulk_purge(queryset, chunk_size=BULK_CHUNK_SIZE, progress=None):
+    """Permanently delete every DeletedRecord of queryset, chunk_size per transaction. Returns a BulkResult."""
+    result = BulkResult(total=queryset.count())
+    for pks in _chunks(queryset, chunk_size):
+        with transaction.atomic():
+            result.done += DeletedRecord.objects.filter(pk__in=pks).delete()[0]
+        if progress is not None:
+            progress(result)
+    return result
+
+
+def expired_records(days=None, now=None):
+    """The DeletedRecords older than the retention period (settings.RECYCLE_BIN_RETENTION_DAYS)."""
+    if days is None:
+        days = getattr(settings, 'RECYCLE_BIN_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    return DeletedRecord.objects.filter(deleted_at__lt=(now or timezone.now()) - datetime.timedelta(days=days))
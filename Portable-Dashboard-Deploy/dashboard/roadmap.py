@@ -0,0 +1,73 @@
+"""
+Roadmap timeline serialization.
+
+Timeline items are read with values() and joined owner / project / target
+names, so building the timeline costs one query however many items the
+quarter has. The timeline API can return only the items changed since a
+given updated_at, together with the ids of every item still on the
+timeline so clients can drop deleted ones.
+"""
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import RoadmapItem
+
+TIMELINE_FIELDS = [
+    'id', 'title', 'start_date', 'end_date', 'status', 'priority', 'progress', 'updated_at',
+    'owner__name', 'project__name',
+    'quarter_target_id', 'quarter_target__project__name', 'quarter_target__quarter__name',
+    'quarter_target__quarter__quarter_number', 'quarter_target__quarter__year',
+]
+
+
+def timeline_queryset(quarter, owner=None, project=None, status=None, priority=None):
+    """Return the roadmap items of a quarter, filtered like the timeline page."""
+    queryset = RoadmapItem.objects.filter(quarter=quarter)
+    if owner:
+        queryset = queryset.filter(owner_id=owner)
+    if project:
+        queryset = queryset.filter(project_id=project)
+    if status:
+        queryset = queryset.filter(status=status)
+    if priority:
+        queryset = queryset.filter(priority=priority)
+    return queryset
+
+
+def _quarter_target_label(row):
+    """str(QuarterTarget) rebuilt from joined values."""
+    quarter = f"Q{row['quarter_target__quarter__quarter_number']} {row['quarter_target__quarter__year']}"
+    if row['quarter_target__quarter__name']:
+        quarter = f"{row['quarter_target__quarter__name']} ({quarter})"
+    return f"{row['quarter_target__project__name']} - {quarter}"
+
+
+def timeline_row(row, today):
+    """Turn a TIMELINE_FIELDS values() row into the dict of RoadmapItem.get_timeline_data()."""
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'start_date': row['start_date'].isoformat(),
+        'end_date': row['end_date'].isoformat(),
+        'status': row['status'],
+        'priority': row['priority'],
+        'progress': row['progress'],
+        'owner': row['owner__name'],
+        'project': row['project__name'],
+        'quarter_target': _quarter_target_label(row) if row['quarter_target_id'] else None,
+        'is_overdue': row['status'] != 'completed' and row['end_date'] < today,
+    }
+
+
+def timeline_items(queryset, since=None):
+    """Serialize the items of queryset (only those updated after since, if given)."""
+    if since is not None:
+        queryset = queryset.filter(updated_at__gt=since)
+    today = timezone.now().date()
+    return [timeline_row(row, today) for row in queryset.values(*TIMELINE_FIELDS)]
+
+
+def timeline_version(queryset):
+    """Return (item count, latest updated_at) of queryset; together they change whenever the timeline does."""
+    version = queryset.order_by().aggregate(count=Count('id'), last_modified=Max('updated_at'))
+    return version['count'], version['last_modified']
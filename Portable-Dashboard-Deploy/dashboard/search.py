@@ -0,0 +1,244 @@
+"""
+Full-text search over products, production bugs, product updates and documents.
+
+Every indexed row is mirrored into a SearchDocument (kind, object_id, title,
+body, url) and searched through the database's full-text index:
+
+- SQLite: an external-content FTS5 table that triggers keep in sync with
+  dashboard_searchdocument, ranked with bm25()
+- PostgreSQL: a weighted tsvector over title and body backed by a GIN index,
+  ranked with ts_rank()
+- anything else: icontains matching, unranked
+
+Both are created by migration 0044, which also indexes the existing rows;
+the rebuild_search_index command rebuilds the index from scratch. Documents are refreshed by the signal
+handlers in dashboard.signals; code that writes indexed models with
+bulk_create/bulk_update calls index_objects() itself.
+"""
+import re
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from django.apps import apps as django_apps
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+
+from .models import SearchDocument
+
+FTS_TABLE = 'dashboard_searchdocument_fts'
+
+# bm25 column weights: a match in the title counts ten times a match in the body
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+# Only the first terms of a query are used
+MAX_TERMS = 10
+
+
+def _join(*parts):
+    return '\n'.join(part for part in parts if part)
+
+
+def _project_document(project):
+    return project.name, project.description, reverse('product-detail', kwargs={'pk': project.pk})
+
+
+def _production_bug_document(bug):
+    return bug.title, _join(bug.project.name, bug.details), reverse('production-bug-detail', kwargs={'pk': bug.pk})
+
+
+def _product_update_document(update):
+    title = f"{update.project.name} update ({update.meeting.meeting_date:%Y-%m-%d})"
+    body = _join(update.latest_project_updates, update.product_notes, update.problems, update.expected_solution)
+    return title, body, reverse('weekly-product-update-detail', kwargs={'pk': update.pk})
+
+
+def _product_problem_document(problem):
+    title = f"{problem.product_update.project.name} problem"
+    body = _join(problem.problem_description, problem.expected_solutions)
+    return title, body, reverse('weekly-product-update-detail', kwargs={'pk': problem.product_update_id})
+
+
+def _product_documentation_document(document):
+    return document.title, document.project.name, document.link
+
+
+def _department_document_document(document):
+    return document.title, '', document.confluence_link
+
+
+def _sop_document(sop):
+    return sop.name, '', reverse('sop-detail', kwargs={'pk': sop.pk})
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """How one model is turned into SearchDocuments."""
+    kind: str
+    model: str
+    build: Callable  # obj -> (title, body, url)
+    related: Tuple[str, ...] = ()
+    # Lookup from the model to its Project, for documents that include the product name
+    project_path: Optional[str] = None
+
+
+SEARCH_SOURCES = {source.kind: source for source in [
+    SearchSource('project', 'dashboard.Project', _project_document),
+    SearchSource('production_bug', 'dashboard.ProductionBug', _production_bug_document, ('project',), 'project'),
+    SearchSource(
+        'product_update', 'dashboard.WeeklyProductUpdate', _product_update_document, ('project', 'meeting'), 'project'
+    ),
+    SearchSource(
+        'product_problem', 'dashboard.ProductProblem', _product_problem_document,
+        ('product_update__project',), 'product_update__project',
+    ),
+    SearchSource(
+        'product_documentation', 'dashboard.ProductDocumentation', _product_documentation_document,
+        ('project',), 'project',
+    ),
+    SearchSource('department_document', 'dashboard.DepartmentDocument', _department_document_document),
+    SearchSource('sop', 'dashboard.SOP', _sop_document),
+]}
+
+_SOURCES_BY_MODEL = {source.model: source for source in SEARCH_SOURCES.values()}
+
+
+def indexed_models():
+    """Return the model classes that are mirrored into the search index."""
+    return [django_apps.get_model(source.model) for source in SEARCH_SOURCES.values()]
+
+
+def source_for_model(model):
+    return _SOURCES_BY_MODEL.get(model._meta.label)
+
+
+# Indexing
+
+def _documents(source, objects):
+    documents = []
+    for obj in objects:
+        title, body, url = source.build(obj)
+        documents.append(SearchDocument(
+            kind=source.kind, object_id=obj.pk, title=title[:300], body=body or '', url=(url or '')[:500],
+        ))
+    return documents
+
+
+def _save_documents(documents):
+    SearchDocument.objects.bulk_create(
+        documents,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['title', 'body', 'url', 'updated_at'],
+    )
+    return len(documents)
+
+
+def index_object(obj):
+    """Create or refresh the SearchDocument of a saved object. Unindexed models are ignored."""
+    source = source_for_model(type(obj))
+    if source is not None:
+        _save_documents(_documents(source, [obj]))
+
+
+def index_objects(model, pks):
+    """Refresh the SearchDocuments of many objects with one read and one upsert."""
+    source = source_for_model(model)
+    if source is None or not pks:
+        return 0
+    objects = model.objects.filter(pk__in=pks).select_related(*source.related)
+    return _save_documents(_documents(source, objects))
+
+
+def remove_object(obj):
+    """Remove the SearchDocument of a deleted object."""
+    source = source_for_model(type(obj))
+    if source is not None:
+        SearchDocument.objects.filter(kind=source.kind, object_id=obj.pk).delete()
+
+
+def reindex_project_dependents(project_id):
+    """Refresh the documents that include a product's name, e.g. after it is renamed."""
+    for source in SEARCH_SOURCES.values():
+        if source.project_path:
+            model = django_apps.get_model(source.model)
+            pks = list(model.objects.filter(**{source.project_path: project_id}).values_list('pk', flat=True))
+            index_objects(model, pks)
+
+
+def rebuild_search_index(chunk_size=500):
+    """
+    Rebuild every SearchDocument from the source tables, chunk by chunk.
+    Returns the number of documents written.
+    """
+    SearchDocument.objects.all().delete()
+    written = 0
+    for source in SEARCH_SOURCES.values():
+        model = django_apps.get_model(source.model)
+        chunk = []
+        for obj in model.objects.select_related(*source.related).order_by('pk').iterator(chunk_size=chunk_size):
+            chunk.append(obj)
+            if len(chunk) >= chunk_size:
+                written += _save_documents(_documents(source, chunk))
+                chunk = []
+        if chunk:
+            written += _save_documents(_documents(source, chunk))
+    return written
+
+
+# Querying
+
+def search_terms(text):
+    """Split a query into lower-cased word terms; punctuation and operators are dropped."""
+    return re.findall(r'\w+', (text or '').lower())[:MAX_TERMS]
+
+
+def search_vector():
+    """The weighted tsvector used by the PostgreSQL backend (and its GIN index)."""
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector('title', weight='A', config='simple') + SearchVector('body', weight='B', config='simple')
+
+
+def search_documents(text, kinds=None):
+    """
+    Return the SearchDocuments matching every term of text as a prefix,
+    annotated with rank (higher is better) and ordered best match first.
+    """
+    queryset = SearchDocument.objects.all()
+    if kinds:
+        queryset = queryset.filter(kind__in=kinds)
+    terms = search_terms(text)
+    if not terms:
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField())).none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        table = SearchDocument._meta.db_table
+        queryset = queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+        ).annotate(rank=RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, %s, %s) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id',
+            (TITLE_WEIGHT, BODY_WEIGHT, match),
+            output_field=FloatField(),
+        ))
+    elif vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        query = SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config='simple')
+        queryset = queryset.annotate(search=search_vector()).filter(search=query).annotate(
+            rank=SearchRank(search_vector(), query)
+        )
+    else:
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        queryset = queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+    return queryset.order_by('-rank', '-updated_at', 'pk')
+
+
+def matching_ids(kind, text):
+    """Subquery of the object ids of one kind matching text, for use in pk__in filters."""
+    return search_documents(text, [kind]).order_by().values('object_id')
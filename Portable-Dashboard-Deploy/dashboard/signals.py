@@ -0,0 +1,178 @@
+"""
+Signal handlers that keep denormalized dashboard data in sync with the source models.
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import activity, hierarchy, product_filters, search
+from .models import DashboardSnapshot, MonthlyFeedback, Project, ProjectResource, Resource, UserAction
+
+
+def _subtract(new, old):
+    keys = set(new) | set(old)
+    return {key: new.get(key, 0) - old.get(key, 0) for key in keys}
+
+
+def _negate(contribution):
+    return {key: -value for key, value in contribution.items()}
+
+
+@receiver(pre_save, sender=Project)
+def remember_project_contribution(sender, instance, raw=False, **kwargs):
+    """Store the project's previous contribution so post_save can apply a delta."""
+    instance._snapshot_previous = {}
+    instance._previous_team_lead_id = None
+    instance._previous_name = None
+    if raw or not instance.pk:
+        return
+    previous = Project.objects.filter(pk=instance.pk).only(
+        'name', 'status', 'team_lead', *DashboardSnapshot.AUTOMATION_FIELDS
+    ).first()
+    if previous is not None:
+        instance._snapshot_previous = DashboardSnapshot.project_contribution(previous)
+        instance._previous_team_lead_id = previous.team_lead_id
+        instance._previous_name = previous.name
+
+
+@receiver(post_save, sender=Project)
+def update_snapshot_on_project_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_snapshot_previous', {})
+    DashboardSnapshot.apply_delta(_subtract(DashboardSnapshot.project_contribution(instance), previous))
+    if instance.team_lead_id != getattr(instance, '_previous_team_lead_id', None):
+        product_filters.invalidate_team_lead_options()
+    previous_name = getattr(instance, '_previous_name', None)
+    if previous_name is not None and previous_name != instance.name:
+        # Bug, update and document search entries include the product name
+        search.reindex_project_dependents(instance.pk)
+
+
+@receiver(post_delete, sender=Project)
+def update_snapshot_on_project_delete(sender, instance, **kwargs):
+    DashboardSnapshot.apply_delta(_negate(DashboardSnapshot.project_contribution(instance)))
+    if instance.team_lead_id is not None:
+        product_filters.invalidate_team_lead_options()
+
+
+@receiver(post_save, sender=Resource)
+def update_snapshot_on_resource_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        DashboardSnapshot.apply_delta({'total_resources': 1})
+
+
+@receiver(post_delete, sender=Resource)
+def update_snapshot_on_resource_delete(sender, instance, **kwargs):
+    DashboardSnapshot.apply_delta({'total_resources': -1})
+
+
+@receiver(pre_save, sender=Resource)
+def remember_resource_parents(sender, instance, raw=False, **kwargs):
+    """Store the previous lead/manager so post_save can update the closure table."""
+    instance._hierarchy_previous = {}
+    if raw or not instance.pk:
+        return
+    previous = Resource.objects.filter(pk=instance.pk).values(*hierarchy.PARENT_FIELDS.values()).first()
+    if previous is not None:
+        instance._hierarchy_previous = previous
+
+
+@receiver(post_save, sender=Resource)
+def update_hierarchy_on_resource_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_hierarchy_previous', {})
+    for relation, field_name in hierarchy.PARENT_FIELDS.items():
+        parent_id = getattr(instance, field_name)
+        if (created and parent_id is not None) or (not created and previous.get(field_name) != parent_id):
+            hierarchy.move_resource(instance.pk, relation, parent_id)
+    # The linked user or reporting lines may have changed
+    hierarchy.invalidate_access_cache()
+    # A renamed lead shows up in the product list filter
+    product_filters.invalidate_team_lead_options()
+
+
+@receiver(pre_delete, sender=Resource)
+def update_hierarchy_on_resource_delete(sender, instance, **kwargs):
+    hierarchy.detach_resource(instance.pk)
+    hierarchy.invalidate_access_cache()
+    # Deleting a lead nulls Project.team_lead with a queryset update, which sends no Project signals
+    product_filters.invalidate_team_lead_options()
+
+
+@receiver(post_save, sender=ProjectResource)
+def update_snapshot_on_assignment_save(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        DashboardSnapshot.apply_delta({'total_assignments': 1})
+
+
+@receiver(post_delete, sender=ProjectResource)
+def update_snapshot_on_assignment_delete(sender, instance, **kwargs):
+    DashboardSnapshot.apply_delta({'total_assignments': -1})
+
+
+def _feedback_key(feedback):
+    return (feedback.month, feedback.year, feedback.status == 'submitted')
+
+
+@receiver(pre_save, sender=MonthlyFeedback)
+def remember_feedback_state(sender, instance, raw=False, **kwargs):
+    instance._snapshot_previous = None
+    if raw or not instance.pk:
+        return
+    previous = MonthlyFeedback.objects.filter(pk=instance.pk).only('month', 'year', 'status').first()
+    if previous is not None:
+        instance._snapshot_previous = _feedback_key(previous)
+
+
+@receiver(post_save, sender=MonthlyFeedback)
+def update_snapshot_on_feedback_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_snapshot_previous', None)
+    current = _feedback_key(instance)
+    if previous == current:
+        return
+    if previous and previous[2]:
+        DashboardSnapshot.apply_delta({'submitted_feedbacks': -1}, feedback_period=previous[:2])
+    if current[2]:
+        DashboardSnapshot.apply_delta({'submitted_feedbacks': 1}, feedback_period=current[:2])
+
+
+@receiver(post_delete, sender=MonthlyFeedback)
+def update_snapshot_on_feedback_delete(sender, instance, **kwargs):
+    if instance.status == 'submitted':
+        DashboardSnapshot.apply_delta({'submitted_feedbacks': -1}, feedback_period=(instance.month, instance.year))
+
+
+@receiver(post_save, sender=User)
+def update_action_facets_on_user_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Logging in only updates last_login, which the user dropdown does not show
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    activity.invalidate_action_facets()
+
+
+@receiver(post_delete, sender=User)
+def update_action_facets_on_user_delete(sender, instance, **kwargs):
+    activity.invalidate_action_facets()
+
+
+@receiver(post_save, sender=UserAction)
+def update_action_facets_on_action_save(sender, instance, raw=False, **kwargs):
+    activity.note_written_actions([instance.model_name])
+
+
+def index_search_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_object(instance)
+
+
+def remove_search_document(sender, instance, **kwargs):
+    search.remove_object(instance)
+
+
+for _model in search.indexed_models():
+    post_save.connect(index_search_document, sender=_model, dispatch_uid=f'search-index-{_model._meta.label}')
+    post_delete.connect(remove_search_document, sender=_model, dispatch_uid=f'search-remove-{_model._meta.label}')
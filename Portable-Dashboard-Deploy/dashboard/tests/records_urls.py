@@ -0,0 +1,10 @@
+"""URLconf for tests of the records section, which dashboard.urls keeps hidden."""
+from django.urls import include, path
+
+from dashboard import views
+
+urlpatterns = [
+    path('records/', views.RecordsListView.as_view(), name='records-list'),
+    path('records/password-verify/', views.RecordsPasswordVerifyView.as_view(), name='records-password-verify'),
+    path('', include('dashboard_project.urls')),
+]
@@ -0,0 +1,113 @@
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import datetime, time, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from dashboard.activity import activity_counts, archive_expired_actions, rollup_days
+from dashboard.models import UserAction, UserActionDailyRollup
+
+
+@override_settings(USER_ACTION_AUDIT={'ENABLED': False, 'RETENTION_DAYS': 30})
+class UserActionRetentionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='auditor', password='testpassword')
+        self.other = User.objects.create_user(username='other', password='testpassword')
+        self.today = timezone.localdate()
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir, ignore_errors=True)
+
+    def log(self, user, action_type, days_ago, model_name=None, count=1):
+        at = timezone.make_aware(datetime.combine(self.today - timedelta(days=days_ago), time(12)))
+        UserAction.objects.bulk_create([
+            UserAction(user=user, action_type=action_type, model_name=model_name, timestamp=at)
+            for _ in range(count)
+        ])
+
+    def test_rollup_counts_per_day_and_is_idempotent(self):
+        """Test that rollups count actions per day, user, action type and model and can be rebuilt"""
+        self.log(self.user, 'view', 3, 'project', count=2)
+        self.log(self.user, 'view', 3)
+        self.log(self.other, 'update', 2, 'rock')
+
+        start, end = self.today - timedelta(days=5), self.today
+        self.assertEqual(rollup_days(start, end), 3)
+        self.assertEqual(rollup_days(start, end), 3)
+
+        rollups = {
+            (r.day, r.user_id, r.action_type, r.model_name): r.count
+            for r in UserActionDailyRollup.objects.all()
+        }
+        three_days_ago = self.today - timedelta(days=3)
+        self.assertEqual(rollups, {
+            (three_days_ago, self.user.pk, 'view', 'project'): 2,
+            (three_days_ago, self.user.pk, 'view', ''): 1,
+            (self.today - timedelta(days=2), self.other.pk, 'update', 'rock'): 1,
+        })
+
+    def test_archive_streams_expired_rows_and_keeps_totals(self):
+        """Test that archiving writes expired rows to NDJSON, deletes them and counts stay the same"""
+        self.log(self.user, 'view', 45, 'project', count=3)
+        self.log(self.user, 'update', 40, 'rock')
+        self.log(self.user, 'view', 5, 'project')
+        self.log(self.other, 'create', 1)
+        # Days before the raw window are only counted once rolled up
+        self.assertEqual(activity_counts(), {'view': 1, 'create': 1})
+        rollup_days(self.today - timedelta(days=60), self.today)
+        before = activity_counts()
+
+        archived, path = archive_expired_actions(self.archive_dir, chunk_size=2)
+
+        self.assertEqual(archived, 4)
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            rows = [json.loads(line) for line in archive]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual({row['action_type'] for row in rows}, {'view', 'update'})
+        self.assertEqual(UserAction.objects.count(), 2)
+        self.assertEqual(activity_counts(), before)
+        self.assertEqual(before, {'view': 4, 'update': 1, 'create': 1})
+        self.assertEqual(activity_counts(user_ids=[self.user.pk], action_type='view'), {'view': 4})
+
+        # Nothing left to archive
+        self.assertEqual(archive_expired_actions(self.archive_dir), (0, None))
+
+    def test_rollup_over_archived_days_keeps_their_rollups(self):
+        """Test that rolling up a range reaching into archived days leaves those days' rollups alone"""
+        self.log(self.user, 'view', 45, 'project', count=3)
+        self.log(self.user, 'view', 2, 'project')
+        archive_expired_actions(self.archive_dir)
+        self.assertEqual(UserActionDailyRollup.objects.count(), 1)
+
+        call_command('rollup_user_actions', days=365, stdout=StringIO())
+
+        self.assertEqual(UserActionDailyRollup.objects.count(), 2)
+        self.assertEqual(activity_counts(), {'view': 4})
+
+    def test_commands_and_list_view_report_archived_activity(self):
+        """Test that the commands run and the action list shows the archived totals"""
+        self.log(self.user, 'delete', 60, 'project', count=2)
+        self.log(self.user, 'view', 1, 'project')
+
+        out = StringIO()
+        call_command('rollup_user_actions', days=3, stdout=out)
+        self.assertIn('Wrote 1 rollup rows', out.getvalue())
+        call_command('archive_user_actions', archive_dir=self.archive_dir, stdout=out)
+        self.assertIn('Archived and deleted 2 user actions', out.getvalue())
+
+        self.client.login(username='auditor', password='testpassword')
+        response = self.client.get(reverse('user-action-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['archived_activity'], [('Delete', 2)])
+        self.assertEqual(len(response.context['actions']), 1)
+
+        # A range inside the raw window does not read the rollups
+        start = (self.today - timedelta(days=10)).isoformat()
+        response = self.client.get(reverse('user-action-list'), {'start_date': start})
+        self.assertNotIn('archived_activity', response.context)
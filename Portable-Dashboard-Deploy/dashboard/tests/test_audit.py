@@ -0,0 +1,96 @@
+import threading
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve
+from django.utils import timezone
+
+from dashboard.audit import AuditRecord, AuditWriter, write_user_actions
+from dashboard.middleware.user_action_middleware import UserActionMiddleware
+from dashboard.models import UserAction
+
+
+def _record(i=0, user_id=1):
+    return AuditRecord(user_id, 'view', None, i, f'Action {i}', '127.0.0.1', timezone.now())
+
+
+class AuditWriterTest(TestCase):
+    def test_background_flusher_writes_in_batches(self):
+        """Test that the flusher thread writes full batches and the remainder after the interval"""
+        batches = []
+        written = threading.Event()
+
+        def write(batch):
+            batches.append(len(batch))
+            if sum(batches) == 5:
+                written.set()
+
+        writer = AuditWriter(batch_size=2, flush_interval_ms=20, write=write)
+        for i in range(5):
+            self.assertTrue(writer.enqueue(_record(i)))
+        self.assertTrue(written.wait(2))
+        writer.stop()
+        self.assertEqual(sum(batches), 5)
+        self.assertTrue(all(size <= 2 for size in batches))
+
+    def test_overflow_policies(self):
+        """Test that a full queue drops, or writes synchronously, according to the policy"""
+        blocked = threading.Event()
+        writes = []
+
+        def slow_write(batch):
+            blocked.wait(2)
+            writes.append(len(batch))
+
+        dropping = AuditWriter(max_queue_size=1, batch_size=1, flush_interval_ms=10, write=slow_write)
+        accepted = [dropping.enqueue(_record(i)) for i in range(4)]
+        self.assertFalse(all(accepted))
+        self.assertEqual(dropping.dropped, accepted.count(False))
+        blocked.set()
+        dropping.stop()
+
+        synchronous = AuditWriter(max_queue_size=1, overflow='sync', write=writes.append)
+        synchronous._stopping.set()  # no flusher thread: the queue only empties through the sync overflow
+        self.assertTrue(synchronous.enqueue(_record(1)))
+        self.assertTrue(synchronous.enqueue(_record(2)))
+        self.assertEqual(len(writes[-1]), 2)
+        with self.assertRaises(ValueError):
+            AuditWriter(overflow='spill')
+
+    def test_stop_flushes_the_queue_into_user_actions(self):
+        """Test that shutdown writes the queued records with their request-time timestamps"""
+        user = User.objects.create_user(username='audited', password='testpassword')
+        writer = AuditWriter(write=write_user_actions)
+        writer._stopping.set()  # write in this thread, inside the test transaction
+        records = [_record(i, user.pk) for i in range(3)]
+        for record in records:
+            writer.enqueue(record)
+        with self.assertNumQueries(1):
+            writer.stop()
+        self.assertEqual(
+            list(UserAction.objects.order_by('record_id').values_list('record_id', 'timestamp')),
+            [(record.record_id, record.timestamp) for record in records],
+        )
+
+
+@override_settings(USER_ACTION_AUDIT={'ENABLED': False})
+class UserActionMiddlewareTest(TestCase):
+    def test_disabled_audit_has_no_writer(self):
+        """Test that the middleware does not start the audit writer when the audit log is disabled"""
+        self.assertIsNone(UserActionMiddleware(lambda request: None).writer)
+
+    def test_record_uses_the_resolver_match(self):
+        """Test that the middleware builds its record from request.resolver_match without resolving again"""
+        user = User.objects.create_user(username='viewer', password='testpassword')
+        middleware = UserActionMiddleware(lambda request: None)
+        request = RequestFactory().get('/dashboard/resources/7/', HTTP_X_FORWARDED_FOR='10.0.0.1, 10.0.0.2')
+        request.user = user
+        request.resolver_match = resolve('/dashboard/resources/7/')
+
+        record = middleware.build_record(request)
+        self.assertEqual(
+            (record.user_id, record.action_type, record.model_name, record.record_id, record.ip_address),
+            (user.pk, 'view', 'resource', 7, '10.0.0.1'),
+        )
+        request.path = '/admin/'
+        self.assertIsNone(middleware.build_record(request))
@@ -0,0 +1,67 @@
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from dashboard.meetings import complete_weekly_meeting
+from dashboard.models import AutomationMetricPoint, Project, WeeklyMeeting, WeeklyProjectUpdate
+from dashboard.timeseries import MAX_POINTS, backfill_automation_metrics, downsample, week_start
+
+
+class AutomationMetricsTest(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(name='Product A')
+        self.monday = timezone.make_aware(datetime(2024, 1, 1, 10, 0))
+
+    def add_meeting(self, days, coverage):
+        meeting = WeeklyMeeting.objects.create(meeting_date=self.monday + timedelta(days=days))
+        WeeklyProjectUpdate.objects.create(meeting=meeting, project=self.project, regression_coverage=coverage)
+        return meeting
+
+    def points(self):
+        return list(AutomationMetricPoint.objects.filter(metric='regression_coverage').order_by('week').values_list('week', 'value'))
+
+    def test_points_recorded_when_meeting_ends_and_backfill_matches(self):
+        """Test that ending a meeting records the weekly points and the backfill rebuilds them"""
+        for days, coverage in ((0, 10), (3, 20), (7, 30)):
+            complete_weekly_meeting(self.add_meeting(days, coverage))
+
+        expected = [(date(2024, 1, 1), 20.0), (date(2024, 1, 8), 30.0)]
+        self.assertEqual(self.points(), expected)
+        self.assertEqual(AutomationMetricPoint.objects.count(), 2 * len(AutomationMetricPoint.METRIC_FIELDS))
+
+        AutomationMetricPoint.objects.all().delete()
+        backfill_automation_metrics(chunk_size=1)
+        self.assertEqual(self.points(), expected)
+
+    def test_downsample_keeps_last_point_of_each_bucket(self):
+        """Test that long series are reduced to the requested number of points"""
+        points = list(range(10))
+        self.assertEqual(downsample(points, 5), [1, 3, 5, 7, 9])
+        self.assertEqual(downsample(points, 20), points)
+        self.assertEqual(week_start(date(2024, 1, 7)), date(2024, 1, 1))
+
+    def test_api_returns_series(self):
+        """Test that the JSON endpoint serves the series for the requested products"""
+        complete_weekly_meeting(self.add_meeting(0, 45))
+        self.client.force_login(User.objects.create_user(username='viewer', password='testpassword'))
+
+        response = self.client.get(reverse('automation-metrics-api'), {
+            'product': self.project.pk, 'metric': 'regression_coverage',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['series'], [{
+            'product_id': self.project.pk,
+            'product_name': 'Product A',
+            'metric': 'regression_coverage',
+            'metric_label': 'Regression Coverage',
+            'points': [{'week': '2024-01-01', 'value': 45.0}],
+        }])
+
+        bad = self.client.get(reverse('automation-metrics-api'), {'product': self.project.pk, 'metric': 'nope'})
+        self.assertEqual(bad.status_code, 400)
+        for points in (0, -1, MAX_POINTS + 1):
+            bad = self.client.get(reverse('automation-metrics-api'), {'product': self.project.pk, 'points': points})
+            self.assertEqual(bad.status_code, 400)
@@ -0,0 +1,98 @@
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.capacity import (
+    build_capacity_matrix, capacity_report, over_allocation_intervals, resource_totals, team_rollups,
+)
+from dashboard.models import Project, ProjectResource, Resource, ResourceLeave
+
+
+class CapacityEngineTest(TestCase):
+    def setUp(self):
+        self.lead = Resource.objects.create(name='Lead')
+        self.alice = Resource.objects.create(name='Alice', lead=self.lead)
+        self.bob = Resource.objects.create(name='Bob', lead=self.lead)
+        self.checkout = Project.objects.create(name='Checkout')
+        self.catalog = Project.objects.create(name='Catalog')
+
+        # Alice: 60% until Wednesday Jan 10, plus an open-ended 50% from Monday Jan 8, and leave on Friday Jan 12
+        ProjectResource.objects.create(project=self.checkout, resource=self.alice, start_date=date(2024, 1, 1),
+                                       end_date=date(2024, 1, 10), utilization_percentage=60)
+        ProjectResource.objects.create(project=self.catalog, resource=self.alice, start_date=date(2024, 1, 8),
+                                       utilization_percentage=50)
+        ResourceLeave.objects.create(resource=self.alice, start_date=date(2024, 1, 12), end_date=date(2024, 1, 12))
+        # Bob: 120% from Friday Jan 5 to Monday Jan 8, across a weekend
+        ProjectResource.objects.create(project=self.checkout, resource=self.bob, start_date=date(2024, 1, 5),
+                                       end_date=date(2024, 1, 8), utilization_percentage=100)
+        ProjectResource.objects.create(project=self.catalog, resource=self.bob, start_date=date(2024, 1, 5),
+                                       end_date=date(2024, 1, 8), utilization_percentage=20)
+
+        self.matrix = build_capacity_matrix(date(2024, 1, 1), date(2024, 1, 14))
+
+    def test_over_allocation_intervals_count_leaves_and_bridge_weekends(self):
+        """Test that leave days remove capacity and weekends do not split an over-allocation"""
+        intervals = over_allocation_intervals(self.matrix)
+        self.assertEqual(
+            [(i['start'], i['end'], i['working_days'], i['peak_utilization']) for i in intervals[self.alice.pk]],
+            [(date(2024, 1, 8), date(2024, 1, 10), 3, 110.0), (date(2024, 1, 12), date(2024, 1, 12), 1, 50.0)],
+        )
+        self.assertEqual(
+            [(i['start'], i['end'], i['working_days']) for i in intervals[self.bob.pk]],
+            [(date(2024, 1, 5), date(2024, 1, 8), 2)],
+        )
+        self.assertNotIn(self.lead.pk, intervals)
+
+    def test_free_capacity_and_team_rollups(self):
+        """Test person-day totals per resource and their rollup under the lead"""
+        totals = resource_totals(self.matrix)
+        row = [resource.pk for resource in self.matrix.resources].index(self.alice.pk)
+        self.assertEqual(totals['capacity_days'][row], 9)
+        self.assertAlmostEqual(totals['free_days'][row], 2.5)
+
+        [team] = team_rollups(self.matrix, totals)
+        self.assertEqual((team['lead_id'], team['members'], team['over_allocated_members']), (self.lead.pk, 2, 2))
+        self.assertEqual(team['capacity_days'], 19)
+
+    def test_api_and_heatmap(self):
+        """Test the JSON report, the team filter and the heatmap page"""
+        self.client.force_login(User.objects.create_user(username='planner', password='testpassword'))
+        response = self.client.get(reverse('capacity-api'), {'start': '2024-01-01', 'end': '2024-01-14', 'lead': self.lead.pk})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([resource['name'] for resource in body['resources']], ['Alice', 'Bob'])
+        self.assertEqual(body['resources'][1]['over_allocations'][0]['start'], '2024-01-05')
+        self.assertEqual(body['teams'][0]['lead_name'], 'Lead')
+
+        bad = self.client.get(reverse('capacity-api'), {'start': '2024-01-01', 'end': '2025-06-01'})
+        self.assertEqual(bad.status_code, 400)
+
+        daily = self.client.get(reverse('capacity-heatmap'), {'start': '2024-01-01', 'end': '2024-01-14'})
+        self.assertEqual(len(daily.context['columns']), 14)
+        self.assertEqual(daily.context['rows'][0]['cells'][7]['level'], 'over')  # Alice, Monday Jan 8
+        weekly = self.client.get(reverse('capacity-heatmap'), {'start': '2024-01-01', 'end': '2024-12-29'})
+        self.assertEqual(len(weekly.context['columns']), 52)
+
+    def test_year_horizon_for_hundreds_of_resources(self):
+        """Test that a year-long horizon for hundreds of resources is computed well under a second"""
+        resources = Resource.objects.bulk_create([Resource(name=f'Resource {i:03}') for i in range(400)])
+        projects = Project.objects.bulk_create([Project(name=f'Project {i}') for i in range(5)])
+        start = date(2024, 1, 1)
+        ProjectResource.objects.bulk_create([
+            ProjectResource(project=project, resource=resource, start_date=start + timedelta(days=7 * i),
+                            end_date=start + timedelta(days=7 * i + 90), utilization_percentage=40)
+            for i, project in enumerate(projects) for resource in resources
+        ])
+        ResourceLeave.objects.bulk_create([
+            ResourceLeave(resource=resource, start_date=start + timedelta(days=i % 300), end_date=start + timedelta(days=i % 300 + 4))
+            for i, resource in enumerate(resources)
+        ])
+
+        began = time.perf_counter()
+        report = capacity_report(build_capacity_matrix(start, start + timedelta(days=365)))
+        self.assertLess(time.perf_counter() - began, 1.0)
+        self.assertEqual(len(report['resources']), 403)
+        self.assertEqual(report['days'], 366)
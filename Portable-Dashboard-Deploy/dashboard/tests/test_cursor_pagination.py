@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from dashboard.models import UserAction
+from dashboard.pagination import CursorPaginator, InvalidCursor
+
+
+class CursorPaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='auditor', password='testpassword')
+        now = timezone.now()
+        for i in range(45):
+            action = UserAction.objects.create(user=self.user, action_type='view', details=f'Action {i}')
+            # Groups of three share a timestamp so the pk tie-breaker matters
+            UserAction.objects.filter(pk=action.pk).update(timestamp=now - timedelta(minutes=i // 3))
+        self.expected = list(UserAction.objects.order_by('-timestamp', '-pk').values_list('pk', flat=True))
+
+    def test_walks_forward_and_backward(self):
+        """Test that following cursors visits every row once, in both directions"""
+        paginator = CursorPaginator(UserAction.objects.all(), 20, ['-timestamp', '-pk'])
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        self.assertEqual([action.pk for page in pages for action in page], self.expected)
+
+        previous = paginator.page(pages[-1].previous_cursor)
+        self.assertEqual([action.pk for action in previous], self.expected[20:40])
+        first = paginator.page(previous.previous_cursor)
+        self.assertEqual([action.pk for action in first], self.expected[:20])
+        self.assertFalse(first.has_previous())
+
+        with self.assertRaises(InvalidCursor):
+            paginator.page('not-a-cursor')
+
+    def test_approximate_count(self):
+        """Test that the count stops at the configured limit"""
+        paginator = CursorPaginator(UserAction.objects.all(), 20, ['-timestamp', '-pk'], count_limit=30)
+        self.assertEqual(paginator.count, 30)
+        self.assertTrue(paginator.count_is_approximate)
+        self.assertFalse(CursorPaginator.supports(UserAction, ['model_name', 'pk']))
+
+    def test_user_action_list_uses_cursor_mode(self):
+        """Test that the audit log pages with cursors and rejects bad ones"""
+        self.client.force_login(self.user)
+        url = reverse('user-action-list')
+        response = self.client.get(url, {'page_size': 20})
+        self.assertTrue(response.context['cursor_pagination'])
+        self.assertEqual([action.pk for action in response.context['actions']], self.expected[:20])
+
+        page = response.context['page_obj']
+        response = self.client.get(url, {'page_size': 20, 'cursor': page.next_cursor})
+        self.assertEqual([action.pk for action in response.context['actions']], self.expected[20:40])
+
+        self.assertEqual(self.client.get(url, {'cursor': 'bogus'}).status_code, 404)
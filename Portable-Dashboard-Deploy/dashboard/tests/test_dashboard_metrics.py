@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.metrics import compute_dashboard_metrics
+from dashboard.models import Project
+
+
+class DashboardMetricsTest(TestCase):
+    def setUp(self):
+        today = date.today()
+        self.overdue = Project.objects.create(
+            name='Overdue', status='in_progress', end_date=today - timedelta(days=3),
+            total_automatable_test_cases=100, total_automated_test_cases=40,
+            total_automatable_smoke_test_cases=20, total_automated_smoke_test_cases=5,
+        )
+        # Completed products are never overdue, even with a past end date
+        Project.objects.create(
+            name='Done', status='completed', end_date=today - timedelta(days=3),
+            total_automatable_test_cases=50, total_automated_test_cases=50,
+        )
+        Project.objects.create(name='Future', status='not_started', end_date=today + timedelta(days=3))
+
+    def test_metrics_match_python_computation(self):
+        """Test that the aggregate engine matches the per-row Python logic"""
+        with self.assertNumQueries(2):
+            metrics = compute_dashboard_metrics()
+
+        self.assertEqual(metrics.total_products, 3)
+        self.assertEqual(metrics.active_products, 1)
+        self.assertEqual(metrics.completed_products, 1)
+        self.assertEqual(
+            metrics.products_by_status,
+            [{'status': 'not_started', 'count': 1}, {'status': 'in_progress', 'count': 1}, {'status': 'completed', 'count': 1}],
+        )
+        self.assertEqual([p.pk for p in metrics.overdue_products], [self.overdue.pk])
+        self.assertTrue(all(p.is_overdue for p in metrics.overdue_products))
+        self.assertEqual(metrics.automation_backlog, [{'name': 'Overdue', 'backlog': 60}])
+        self.assertEqual(metrics.smoke_coverage_data, [{'name': 'Overdue', 'coverage': 25.0}])
+        self.assertEqual(
+            metrics.regression_coverage_data,
+            [{'name': 'Overdue', 'coverage': 40.0}, {'name': 'Done', 'coverage': 100.0}],
+        )
+        self.assertEqual(metrics.to_dict()['overdue_products'][0]['name'], 'Overdue')
+
+    def test_dashboard_view_uses_metrics(self):
+        """Test that the dashboard renders the aggregated metrics"""
+        User.objects.create_user(username='testuser', password='testpassword')
+        self.client.login(username='testuser', password='testpassword')
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_products'], 3)
+        self.assertEqual(list(response.context['overdue_products']), [self.overdue])
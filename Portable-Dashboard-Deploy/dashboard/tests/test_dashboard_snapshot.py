@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from dashboard.models import DashboardSnapshot, MonthlyFeedback, Project, ProjectResource, Resource
+
+
+class DashboardSnapshotTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.resource = Resource.objects.create(name='Alice')
+        self.project = Project.objects.create(
+            name='Alpha', status='in_progress',
+            total_automatable_test_cases=10, total_automated_test_cases=4,
+        )
+        DashboardSnapshot.rebuild()
+
+    def assertSnapshotMatchesRebuild(self):
+        incremental = DashboardSnapshot.objects.get(pk=1)
+        rebuilt = DashboardSnapshot.rebuild()
+        for field in ['total_products', 'active_products', 'completed_products', 'on_hold_products',
+                      'total_resources', 'total_assignments', 'total_automatable_test_cases',
+                      'total_automated_test_cases', 'submitted_feedbacks']:
+            self.assertEqual(getattr(incremental, field), getattr(rebuilt, field), field)
+
+    def test_project_changes_apply_deltas(self):
+        """Test that creating, updating and deleting products keeps the snapshot in sync"""
+        other = Project.objects.create(name='Beta', status='on_hold', total_automated_test_cases=3)
+        self.project.status = 'completed'
+        self.project.total_automated_test_cases = 10
+        self.project.save()
+        self.assertSnapshotMatchesRebuild()
+
+        other.delete()
+        snapshot = DashboardSnapshot.objects.get(pk=1)
+        self.assertEqual(snapshot.total_products, 1)
+        self.assertEqual(snapshot.completed_products, 1)
+        self.assertEqual(snapshot.total_automated_test_cases, 10)
+
+    def test_resource_assignment_and_feedback_changes_apply_deltas(self):
+        """Test that resources, assignments and monthly feedback update the snapshot"""
+        now = timezone.now()
+        assignment = ProjectResource.objects.create(project=self.project, resource=self.resource)
+        feedback = MonthlyFeedback.objects.create(
+            resource=self.resource, month=now.month, year=now.year,
+            feedback='Great month', submitted_by=self.user,
+        )
+        Resource.objects.create(name='Bob')
+        self.assertSnapshotMatchesRebuild()
+
+        assignment.delete()
+        feedback.delete()
+        snapshot = DashboardSnapshot.objects.get(pk=1)
+        self.assertEqual(snapshot.total_assignments, 0)
+        self.assertEqual(snapshot.submitted_feedbacks, 0)
+        self.assertEqual(snapshot.total_resources, 2)
+
+    def test_load_rebuilds_missing_snapshot(self):
+        """Test that load() builds the snapshot when it does not exist yet"""
+        DashboardSnapshot.objects.all().delete()
+        snapshot = DashboardSnapshot.load()
+        self.assertEqual(snapshot.total_products, 1)
+        self.assertEqual(snapshot.total_resources, 1)
@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from dashboard.models import ProductProblem, Project, WeeklyProductMeeting, WeeklyProductUpdate
+
+
+class LatestProductUpdatesTest(TestCase):
+    def create_history(self, project_count, meeting_count=3):
+        now = timezone.now()
+        meetings = [
+            WeeklyProductMeeting.objects.create(meeting_date=now - timedelta(weeks=weeks))
+            for weeks in range(meeting_count)
+        ]
+        for i in range(project_count):
+            project = Project.objects.create(name=f'Product {i}')
+            for meeting in meetings:
+                update = WeeklyProductUpdate.objects.create(
+                    meeting=meeting, project=project, latest_project_updates=f'{project.name} @ {meeting.pk}',
+                )
+                ProductProblem.objects.create(product_update=update, problem_description='Flaky tests')
+        return meetings
+
+    def test_returns_newest_update_per_project(self):
+        """Test that only the newest update of each project is listed"""
+        meetings = self.create_history(2)
+        response = self.client.get(reverse('latest-product-updates'))
+
+        self.assertEqual(response.status_code, 200)
+        updates = list(response.context['product_updates'])
+        self.assertEqual([update.project.name for update in updates], ['Product 0', 'Product 1'])
+        self.assertTrue(all(update.meeting == meetings[0] for update in updates))
+
+    def test_query_count_does_not_grow_with_history(self):
+        """Test that the list costs a constant number of queries"""
+        self.create_history(2)
+        with self.assertNumQueries(3):
+            self.client.get(reverse('latest-product-updates'))
+
+        WeeklyProductUpdate.objects.all().delete()
+        self.create_history(10, meeting_count=5)
+        with self.assertNumQueries(3):
+            self.client.get(reverse('latest-product-updates'))
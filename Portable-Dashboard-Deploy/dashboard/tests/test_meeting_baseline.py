@@ -0,0 +1,65 @@
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from dashboard.models import (
+    MeetingBaseline, ProductMeetingBaseline, Project, WeeklyMeeting, WeeklyProductMeeting, WeeklyProductUpdate,
+)
+
+
+class MeetingBaselineTest(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(name='Product A')
+        self.meeting = WeeklyMeeting.objects.create()
+
+    def activate(self, client, key):
+        session = client.session
+        session[key] = True
+        session.save()
+
+    def test_meeting_state_is_shared_between_facilitators(self):
+        """Test that another facilitator can update and end a meeting started elsewhere"""
+        starter = Client()
+        starter.post(reverse('start-weekly-meeting', args=[self.meeting.pk]))
+
+        baseline = MeetingBaseline.objects.get(meeting=self.meeting, project=self.project)
+        self.assertEqual(baseline.values['bugs_found_through_automation'], 0)
+        self.assertNotIn(f'original_values_{self.meeting.pk}', starter.session)
+
+        editor = Client()
+        self.activate(editor, f'meeting_active_{self.meeting.pk}')
+        editor.post(reverse('update-project-in-meeting', args=[self.meeting.pk, self.project.pk]), {
+            'bugs_found_through_automation': 5,
+        })
+        editor.post(reverse('update-project-in-meeting', args=[self.meeting.pk, self.project.pk]), {
+            'bugs_found_through_automation': 5,
+            'regression_coverage': 40,
+        })
+        baseline.refresh_from_db()
+        self.assertEqual(baseline.modified_fields, ['bugs_found_through_automation', 'regression_coverage'])
+
+        Client().post(reverse('end-weekly-meeting', args=[self.meeting.pk]))
+
+        self.project.refresh_from_db()
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.project.bugs_found_through_automation, 5)
+        self.assertEqual(self.project.regression_coverage, 40)
+        self.assertIn('Bugs Found Through Automation changed from 0 to 5', self.meeting.notes)
+        self.assertFalse(MeetingBaseline.objects.filter(meeting=self.meeting).exists())
+
+    def test_product_meeting_baselines(self):
+        """Test that product meeting baselines are stored in the database and cleared at the end"""
+        meeting = WeeklyProductMeeting.objects.create()
+        client = Client()
+        client.post(reverse('start-weekly-product-meeting', args=[meeting.pk]), {
+            'start_meeting': '1',
+            'selected_projects': [self.project.pk],
+        })
+        baseline = ProductMeetingBaseline.objects.get(meeting=meeting, project=self.project)
+        self.assertEqual(baseline.values['solution_timeline'], 'medium')
+
+        WeeklyProductUpdate.objects.filter(meeting=meeting).update(latest_project_updates='Released v2')
+        Client().post(reverse('end-weekly-product-meeting', args=[meeting.pk]))
+
+        meeting.refresh_from_db()
+        self.assertIn('Latest Project Updates: Released v2', meeting.notes)
+        self.assertFalse(ProductMeetingBaseline.objects.filter(meeting=meeting).exists())
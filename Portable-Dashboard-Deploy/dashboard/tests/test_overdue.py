@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from dashboard.models import Project, Resource, Rock
+
+
+class OverdueFlagTest(TestCase):
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.owner = Resource.objects.create(name='Owner')
+
+    def test_save_maintains_the_flag(self):
+        """Test that saving with a past due date, a new date or a completed status updates the flag"""
+        rock = Rock.objects.create(title='Late', assignee=self.owner, due_date=self.today - timedelta(days=3))
+        rock.refresh_from_db()
+        self.assertTrue(rock.overdue)
+        self.assertEqual(rock.overdue_since, self.today - timedelta(days=2))
+
+        rock.due_date = self.today + timedelta(days=1)
+        rock.save(update_fields=['due_date'])
+        rock.refresh_from_db()
+        self.assertEqual((rock.overdue, rock.overdue_since), (False, None))
+
+        project = Project.objects.create(name='Late product', end_date=self.today - timedelta(days=1))
+        self.assertTrue(Project.objects.get(pk=project.pk).overdue)
+        project.status = 'completed'
+        project.save()
+        self.assertFalse(Project.objects.get(pk=project.pk).overdue)
+
+    def test_scanner_flips_rows_that_fell_due(self):
+        """Test that the daily scan flags rows whose due date passed and clears stale flags"""
+        due_today = Rock.objects.create(title='Due today', assignee=self.owner, due_date=self.today)
+        moved = Rock.objects.create(title='Moved', assignee=self.owner, due_date=self.today - timedelta(days=5))
+        # Writes through update() bypass save(), like a date passing overnight
+        Rock.objects.filter(pk=moved.pk).update(due_date=self.today + timedelta(days=5))
+
+        flagged, cleared = Rock.flag_overdue(self.today + timedelta(days=1))
+        self.assertEqual((flagged, cleared), (1, 1))
+        due_today.refresh_from_db()
+        self.assertEqual(due_today.overdue_since, self.today + timedelta(days=1))
+        self.assertFalse(Rock.objects.get(pk=moved.pk).overdue)
+
+        out = StringIO()
+        call_command('scan_overdue', stdout=out)
+        self.assertIn('Overdue flags refreshed', out.getvalue())
+
+    def test_rock_widgets_use_the_indexed_flag(self):
+        """Test the overdue rocks widget and the overdue filter of the rock list"""
+        late = Rock.objects.create(title='Late', assignee=self.owner, due_date=date(2020, 1, 1))
+        Rock.objects.create(title='Done', assignee=self.owner, due_date=date(2020, 1, 1), status='completed')
+        Rock.objects.create(title='Later', assignee=self.owner, due_date=self.today + timedelta(days=30))
+        self.client.force_login(User.objects.create_user(username='rocker', password='testpassword'))
+
+        response = self.client.get(reverse('rock-dashboard'))
+        self.assertEqual([rock.pk for rock in response.context['overdue_rocks']], [late.pk])
+
+        response = self.client.get(reverse('rock-list'), {'overdue': '1'})
+        self.assertEqual([rock.pk for rock in response.context['rocks']], [late.pk])
+        self.assertTrue(response.context['filters_applied'])
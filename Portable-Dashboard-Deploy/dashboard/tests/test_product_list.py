@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.models import Project, ProjectResource, Resource
+from dashboard.product_filters import team_lead_options
+
+
+class ProductListViewTest(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user(username='viewer', password='testpassword'))
+        self.leads = [Resource.objects.create(name=f'Lead {i}', role='Lead') for i in range(3)]
+        for i in range(9):
+            project = Project.objects.create(name=f'Product {i}', team_lead=self.leads[i % 2], status='in_progress')
+            for resource in self.leads:
+                ProjectResource.objects.create(project=project, resource=resource)
+
+    def test_query_count_does_not_grow_with_products(self):
+        """Test that team leads and resource counts are not fetched per row"""
+        url = reverse('product-list')
+        self.client.get(url)  # warm the team lead cache
+        with self.assertNumQueries(4):
+            response = self.client.get(url, {'status': 'in_progress'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({product.resource_count for product in response.context['products']}, {3})
+        self.assertContains(response, 'Lead 1')
+
+    def test_team_lead_options_follow_project_changes(self):
+        """Test that the cached team lead list is invalidated when a team lead changes"""
+        self.assertEqual([lead['name'] for lead in team_lead_options()], ['Lead 0', 'Lead 1'])
+
+        project = Project.objects.filter(team_lead=self.leads[1]).first()
+        project.team_lead = self.leads[2]
+        project.save()
+        self.assertEqual([lead['name'] for lead in team_lead_options()], ['Lead 0', 'Lead 1', 'Lead 2'])
+
+        self.leads[0].delete()
+        self.assertEqual([lead['name'] for lead in team_lead_options()], ['Lead 1', 'Lead 2'])
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from dashboard.meetings import carry_forward_product_updates
+from dashboard.models import ProductProblem, Project, WeeklyProductMeeting, WeeklyProductUpdate
+
+
+class ProductMeetingCarryForwardTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.older = WeeklyProductMeeting.objects.create(meeting_date=now - timedelta(weeks=2))
+        self.previous = WeeklyProductMeeting.objects.create(meeting_date=now - timedelta(weeks=1))
+        self.meeting = WeeklyProductMeeting.objects.create(meeting_date=now)
+
+    def create_projects(self, count):
+        projects = []
+        for i in range(count):
+            project = Project.objects.create(name=f'Product {i}')
+            WeeklyProductUpdate.objects.create(meeting=self.older, project=project, product_notes='old')
+            update = WeeklyProductUpdate.objects.create(
+                meeting=self.previous, project=project, product_notes='latest', solution_timeline='short',
+            )
+            ProductProblem.objects.create(product_update=update, problem_description='Slow pipeline')
+            ProductProblem.objects.create(product_update=update, problem_description='Flaky login test')
+            projects.append(project)
+        return projects
+
+    def carry_forward_query_count(self, meeting, projects):
+        with CaptureQueriesContext(connection) as queries:
+            carry_forward_product_updates(meeting, [project.id for project in projects])
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_products(self):
+        """Test that starting a product meeting costs a constant number of queries"""
+        small = self.carry_forward_query_count(self.meeting, self.create_projects(2))
+        self.create_projects(20)
+        later = WeeklyProductMeeting.objects.create(meeting_date=timezone.now() + timedelta(days=1))
+        large = self.carry_forward_query_count(later, list(Project.objects.all()))
+
+        self.assertEqual(small, large)
+
+    def test_copies_latest_update_and_problems(self):
+        """Test that new updates start from the latest prior update, including its problems"""
+        project, other = self.create_projects(2)
+        existing = WeeklyProductUpdate.objects.create(meeting=self.meeting, project=other, product_notes='draft')
+
+        baselines = carry_forward_product_updates(self.meeting, [project.id, other.id])
+
+        self.assertEqual(baselines[project.id]['product_notes'], 'latest')
+        update = WeeklyProductUpdate.objects.get(meeting=self.meeting, project=project)
+        self.assertEqual((update.product_notes, update.solution_timeline), ('latest', 'short'))
+        self.assertEqual(
+            sorted(update.product_problems.values_list('problem_description', flat=True)),
+            ['Flaky login test', 'Slow pipeline'],
+        )
+
+        # Existing updates are refreshed but their problems are not duplicated
+        existing.refresh_from_db()
+        self.assertEqual(existing.product_notes, 'latest')
+        self.assertFalse(existing.product_problems.exists())
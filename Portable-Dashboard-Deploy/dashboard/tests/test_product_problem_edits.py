@@ -0,0 +1,89 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.models import ProductMeetingBaseline, ProductProblem, Project, WeeklyProductMeeting, WeeklyProductUpdate
+
+
+class ProductProblemEditsTest(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(name='Product A')
+        self.meeting = WeeklyProductMeeting.objects.create()
+        self.update = WeeklyProductUpdate.objects.create(meeting=self.meeting, project=self.project)
+        self.problems = [
+            ProductProblem.objects.create(product_update=self.update, problem_description=f'Problem {i}')
+            for i in range(20)
+        ]
+        session = self.client.session
+        session[f'product_meeting_active_{self.meeting.pk}'] = True
+        session.save()
+
+    def test_form_edits_use_constant_queries(self):
+        """Test that editing many problems through the form does not cost a query per field"""
+        data = {'latest_project_updates': ''}
+        for problem in self.problems:
+            data[f'problem_{problem.pk}_description'] = f'{problem.problem_description} (edited)'
+            data[f'problem_{problem.pk}_expected_solutions'] = 'Fix it'
+            data[f'problem_{problem.pk}_solution_timeline'] = 'short'
+        data[f'problem_{self.problems[0].pk}_delete'] = 'true'
+
+        url = reverse('update-product-in-meeting', args=[self.meeting.pk, self.project.pk])
+        # Includes keeping the search index in sync: one read and one upsert for the edits, two for the delete
+        with self.assertNumQueries(16):
+            self.client.post(url, data)
+
+        self.assertEqual(ProductProblem.objects.filter(product_update=self.update).count(), 19)
+        problem = ProductProblem.objects.get(pk=self.problems[1].pk)
+        self.assertEqual(
+            (problem.problem_description, problem.expected_solutions, problem.solution_timeline),
+            ('Problem 1 (edited)', 'Fix it', 'short'),
+        )
+
+    def test_patch_api(self):
+        """Test that the JSON PATCH endpoint edits, deletes and adds problems"""
+        url = reverse('update-product-problems-api', args=[self.meeting.pk, self.project.pk])
+        response = self.client.patch(url, json.dumps({
+            'problems': {
+                str(self.problems[0].pk): {'description': 'Renamed', 'solution_timeline': 'long'},
+                str(self.problems[1].pk): {'delete': True},
+            },
+            'new_problems': [{'description': 'New problem'}],
+        }), content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['modified_fields'], [
+            f'problem_{self.problems[0].pk}_description',
+            f'problem_{self.problems[0].pk}_solution_timeline',
+            f'deleted_problem_{self.problems[1].pk}',
+            'added_problem',
+        ])
+        self.assertEqual(len(body['problems']), 20)
+        self.assertEqual(ProductProblem.objects.get(pk=self.problems[0].pk).problem_description, 'Renamed')
+        self.assertIn(
+            'added_problem',
+            ProductMeetingBaseline.objects.get(meeting=self.meeting, project=self.project).modified_fields,
+        )
+
+    def test_patch_api_rejects_invalid_input(self):
+        """Test that invalid bodies and inactive meetings are rejected"""
+        url = reverse('update-product-problems-api', args=[self.meeting.pk, self.project.pk])
+        bad_timeline = json.dumps({'problems': {str(self.problems[0].pk): {'solution_timeline': 'someday'}}})
+        self.assertEqual(self.client.patch(url, bad_timeline, content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.patch(url, 'not json', content_type='application/json').status_code, 400)
+        for body in (
+            {'problems': {str(self.problems[0].pk): {'description': None}}},
+            {'problems': {str(self.problems[0].pk): {'delete': 'yes'}}},
+            {'new_problems': [{'description': 'Outage', 'expected_solutions': None}]},
+            {'new_problems': [{'description': 42}]},
+        ):
+            self.assertEqual(self.client.patch(url, json.dumps(body), content_type='application/json').status_code, 400)
+        self.assertEqual(ProductProblem.objects.get(pk=self.problems[0].pk).problem_description, 'Problem 0')
+        self.assertEqual(ProductProblem.objects.filter(product_update=self.update).count(), 20)
+        self.assertEqual(self.client.post(url).status_code, 405)
+
+        session = self.client.session
+        del session[f'product_meeting_active_{self.meeting.pk}']
+        session.save()
+        self.assertEqual(self.client.patch(url, '{}', content_type='application/json').status_code, 409)
@@ -0,0 +1,93 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.models import Project, Quarter, QuarterSummary, QuarterTarget, QuarterTargetResource, Resource
+
+
+class QuarterStatisticsTest(TestCase):
+    def setUp(self):
+        self.q1 = Quarter.objects.create(year=2024, quarter_number=1)
+        self.q2 = Quarter.objects.create(year=2024, quarter_number=2, completed=True)
+        self.empty = Quarter.objects.create(year=2024, quarter_number=3)
+        self.alpha = Project.objects.create(name='Alpha')
+        self.beta = Project.objects.create(name='Beta')
+        QuarterTarget.objects.create(quarter=self.q1, project=self.alpha, target_description='a', target_value=10, achieved_value=5)
+        QuarterTarget.objects.create(quarter=self.q1, project=self.beta, target_description='b', target_value=10, achieved_value=10)
+        QuarterTarget.objects.create(quarter=self.q1, project=self.beta, target_description='c', target_value=10)
+        QuarterTarget.objects.create(quarter=self.q2, project=self.alpha, target_description='d', target_value=4, achieved_value=3)
+
+    def test_grouped_statistics(self):
+        """Test per-quarter and per-project totals, completed counts and average achievement in two queries"""
+        with self.assertNumQueries(2):
+            by_quarter, by_project = QuarterTarget.grouped_statistics()
+        self.assertEqual(by_quarter[self.q1.pk]['total_targets'], 3)
+        self.assertEqual(by_quarter[self.q1.pk]['completed_targets'], 2)
+        self.assertAlmostEqual(by_quarter[self.q1.pk]['completion_percentage'], 200 / 3)
+        self.assertEqual(by_quarter[self.q1.pk]['avg_achievement_percentage'], Decimal('75'))
+        self.assertNotIn(self.empty.pk, by_quarter)
+        self.assertEqual(
+            [(row['project_name'], row['target_count'], row['completed_targets']) for row in by_project],
+            [('Alpha', 2, 2), ('Beta', 2, 1)],
+        )
+        self.assertEqual(by_project[0]['avg_achievement'], Decimal('62.5'))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.empty.get_statistics(), QuarterTarget.empty_statistics())
+        self.assertEqual(self.q2.get_statistics()['avg_achievement_percentage'], Decimal('75'))
+
+    def test_dashboard_query_count_does_not_grow_with_quarters(self):
+        """Test that the quarter target dashboard runs a fixed number of queries"""
+        self.client.force_login(User.objects.create_user(username='planner', password='testpassword'))
+        url = reverse('quarter-target-dashboard')
+        with self.assertNumQueries(6):
+            response = self.client.get(url)
+        self.assertEqual(response.context['total_targets'], 4)
+        self.assertEqual(response.context['projects_with_targets_count'], 2)
+        self.assertEqual(response.context['completed_quarters'], 1)
+
+        Quarter.objects.create(year=2025, quarter_number=1)
+        with self.assertNumQueries(6):
+            self.client.get(url)
+
+    def test_completing_a_quarter_freezes_its_summary(self):
+        """Test that complete_quarter stores a snapshot that later target edits do not change"""
+        self.client.force_login(User.objects.create_user(username='planner', password='testpassword'))
+        tester = Resource.objects.create(name='Tester')
+        for target in self.q1.targets.all():
+            QuarterTargetResource.objects.create(quarter_target=target, resource=tester, allocation_percentage=25)
+        targets = list(self.q1.targets.order_by('pk'))
+        data = {
+            'completion_date': '2024-04-01', 'completion_notes': 'Done', 'completed': 'on',
+            'form-TOTAL_FORMS': len(targets), 'form-INITIAL_FORMS': len(targets),
+        }
+        for i, target in enumerate(targets):
+            data.update({f'form-{i}-id': target.pk, f'form-{i}-achieved_value': target.achieved_value or ''})
+        response = self.client.post(reverse('quarter-complete', args=[self.q1.pk]), data)
+        self.assertRedirects(response, reverse('quarter-summary', args=[self.q1.pk]))
+
+        summary = QuarterSummary.objects.get(quarter=self.q1)
+        self.assertEqual((summary.total_targets, summary.completed_targets), (3, 2))
+        self.assertEqual([row['project_name'] for row in summary.project_achievement], ['Alpha', 'Beta'])
+        self.assertEqual(summary.resource_allocations, [
+            {'resource_id': tester.pk, 'resource_name': 'Tester', 'target_count': 3, 'allocation_percentage': 75.0},
+        ])
+
+        QuarterTarget.objects.filter(quarter=self.q1).update(achieved_value=None)
+        response = self.client.get(reverse('quarter-summary', args=[self.q1.pk]))
+        self.assertEqual(response.context['statistics']['completed_targets'], 2)
+        response = self.client.get(reverse('quarter-target-dashboard'))
+        stats = {row['id']: row for row in response.context['quarter_stats']}
+        self.assertEqual(stats[self.q1.pk]['completed_targets'], 2)
+        alpha = response.context['project_achievement_data'][0]
+        self.assertEqual((alpha['target_count'], alpha['avg_achievement']), (2, 62.5))
+
+    def test_backfill_command(self):
+        """Test that the backfill command snapshots completed quarters that have no summary"""
+        call_command('backfill_quarter_summaries', stdout=StringIO())
+        self.assertEqual(list(QuarterSummary.objects.values_list('quarter_id', flat=True)), [self.q2.pk])
+        self.assertEqual(self.q2.get_statistics()['total_targets'], 1)
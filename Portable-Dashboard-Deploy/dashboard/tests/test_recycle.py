@@ -0,0 +1,172 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from dashboard import views
+from dashboard.models import (
+    DashboardSnapshot, DeletedRecord, Project, ProjectResource, Quarter, QuarterTarget, QuarterTargetResource,
+    Resource, RoadmapItem, SearchDocument,
+)
+from dashboard.recycle import bulk_purge, bulk_restore, decode_payload, deleted_records, recycle_object
+
+
+class RecycleSnapshotTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpassword')
+        self.lead = Resource.objects.create(name='Lead')
+        self.engineer = Resource.objects.create(name='Engineer', lead=self.lead)
+        self.project = Project.objects.create(name='Alpha', description='Checkout service', team_lead=self.lead)
+        ProjectResource.objects.create(project=self.project, resource=self.engineer, hours_allocated=20)
+        quarter = Quarter.objects.create(year=2024, quarter_number=1)
+        target = QuarterTarget.objects.create(
+            quarter=quarter, project=self.project, target_description='Ship', target_value=10, achieved_value=5,
+        )
+        QuarterTargetResource.objects.create(quarter_target=target, resource=self.engineer, allocation_percentage=50)
+        self.roadmap_item = RoadmapItem.objects.create(
+            title='Launch', owner=self.engineer, project=self.project, quarter=quarter,
+            start_date=date(2024, 1, 1), end_date=date(2024, 3, 31),
+        )
+        DashboardSnapshot.rebuild()
+
+    def test_delete_view_snapshots_the_cascade(self):
+        """Test that deleting a product stores it with every cascaded row and the references it cleared"""
+        self.client.force_login(self.user)
+        response = self.client.post(reverse('product-delete', kwargs={'pk': self.project.pk}))
+        self.assertRedirects(response, reverse('product-list'), fetch_redirect_response=False)
+
+        self.assertFalse(Project.objects.exists())
+        self.assertFalse(QuarterTargetResource.objects.exists())
+        record = DeletedRecord.objects.get()
+        self.assertEqual((record.model_name, record.record_id, record.deleted_by), ('Project', self.project.pk, self.user))
+        self.assertEqual(record.related_count, 3)
+        document = decode_payload(record.payload)
+        labels = [label for label, _ in document['models']]
+        self.assertLess(labels.index('dashboard.Project'), labels.index('dashboard.QuarterTarget'))
+        self.assertLess(labels.index('dashboard.QuarterTarget'), labels.index('dashboard.QuarterTargetResource'))
+        self.assertEqual(document['references'], [['dashboard.RoadmapItem', 'project_id', [[self.roadmap_item.pk, self.project.pk]]]])
+
+    def test_restore_replays_the_graph(self):
+        """Test that restoring brings back the record, its children, cleared references and derived data"""
+        project_id = self.project.pk
+        record = recycle_object(self.project, deleted_by=self.user)
+        self.assertIsNone(RoadmapItem.objects.get().project_id)
+        self.assertEqual(DashboardSnapshot.objects.get(pk=1).total_assignments, 0)
+
+        restored = DeletedRecord.objects.get(pk=record.pk).restore()
+
+        self.assertEqual((restored.pk, restored.name, restored.team_lead_id), (project_id, 'Alpha', self.lead.pk))
+        self.assertEqual(ProjectResource.objects.get().hours_allocated, 20)
+        self.assertEqual(QuarterTargetResource.objects.get().quarter_target.project_id, project_id)
+        self.assertEqual(RoadmapItem.objects.get().project_id, project_id)
+        self.assertTrue(SearchDocument.objects.filter(kind='project', object_id=project_id).exists())
+        self.assertEqual(DashboardSnapshot.objects.get(pk=1).total_assignments, 1)
+        self.assertFalse(DeletedRecord.objects.exists())
+
+    def test_restore_keeps_the_original_timestamps(self):
+        """Test that created_at and updated_at of the record and its children survive a delete and restore"""
+        old = timezone.now() - timedelta(days=400, microseconds=1234)
+        Project.objects.filter(pk=self.project.pk).update(created_at=old, updated_at=old + timedelta(days=1))
+        QuarterTarget.objects.update(created_at=old, updated_at=old + timedelta(days=2))
+        project_id = self.project.pk
+        record = recycle_object(Project.objects.get(pk=project_id))
+
+        record.restore()
+
+        project = Project.objects.get(pk=project_id)
+        self.assertEqual((project.created_at, project.updated_at), (old, old + timedelta(days=1)))
+        target = QuarterTarget.objects.get()
+        self.assertEqual((target.created_at, target.updated_at), (old, old + timedelta(days=2)))
+
+    def test_restoring_a_resource_relinks_products_and_hierarchy(self):
+        """Test that a restored resource leads its products again and is back in the reporting hierarchy"""
+        lead_id = self.lead.pk
+        record = recycle_object(self.lead)
+        self.assertIsNone(Project.objects.get().team_lead_id)
+        self.assertIsNone(Resource.objects.get(pk=self.engineer.pk).lead_id)
+
+        lead = record.restore()
+
+        self.assertEqual(Project.objects.get().team_lead_id, lead_id)
+        self.assertEqual(Resource.objects.get(pk=self.engineer.pk).lead_id, lead_id)
+        self.assertTrue(lead.reporting_descendants.filter(descendant=self.engineer, relation='lead').exists())
+
+
+class BulkRestoreOrphanTest(TransactionTestCase):
+    def test_record_whose_parent_is_gone_is_skipped(self):
+        """Test that a record referencing a since-deleted row fails alone instead of rolling back its chunk"""
+        lead = Resource.objects.create(name='Lead')
+        orphan = recycle_object(Project.objects.create(name='Alpha', team_lead=lead))
+        recycle_object(lead)
+        other = recycle_object(Project.objects.create(name='Beta'))
+
+        result = bulk_restore(deleted_records(ids=[orphan.pk, other.pk]))
+
+        self.assertEqual((result.done, result.failed), (1, 1))
+        self.assertEqual(result.errors[0][0], orphan.pk)
+        self.assertEqual(list(Project.objects.values_list('name', flat=True)), ['Beta'])
+        self.assertTrue(DeletedRecord.objects.filter(pk=orphan.pk).exists())
+
+class RecycleBinBulkTest(TestCase):
+    def setUp(self):
+        self.products = [Project.objects.create(name=f'Product {i}') for i in range(5)]
+        self.product_ids = [product.pk for product in self.products]
+        self.records = [recycle_object(product) for product in self.products]
+
+    def test_bulk_restore_runs_in_chunks_and_reports_failures(self):
+        """Test that bulk restore works chunk by chunk, reports progress and skips records that cannot be restored"""
+        # The id of the third product was taken again after it was deleted
+        Project.objects.create(pk=self.product_ids[2], name='Reused id')
+        progress = []
+
+        result = bulk_restore(deleted_records(), chunk_size=2, progress=lambda r: progress.append(r.done))
+
+        self.assertEqual((result.total, result.done, result.failed), (5, 4, 1))
+        self.assertEqual(progress, [2, 3, 4])
+        self.assertEqual(result.errors[0][0], self.records[2].pk)
+        self.assertEqual(set(Project.objects.values_list('pk', flat=True)), set(self.product_ids))
+        self.assertEqual(list(DeletedRecord.objects.values_list('pk', flat=True)), [self.records[2].pk])
+
+    def test_retention_purge(self):
+        """Test that the purge command removes only records older than the retention period"""
+        DeletedRecord.objects.filter(pk__in=[r.pk for r in self.records[:3]]).update(
+            deleted_at=timezone.now() - timedelta(days=200)
+        )
+        out = StringIO()
+        call_command('purge_deleted_records', dry_run=True, stdout=out)
+        self.assertIn('3 deleted records are older than 180 days', out.getvalue())
+        self.assertEqual(DeletedRecord.objects.count(), 5)
+
+        call_command('purge_deleted_records', chunk_size=2, stdout=out)
+        self.assertIn('Purged 2 of 3', out.getvalue())
+        self.assertEqual(set(DeletedRecord.objects.values_list('pk', flat=True)), {r.pk for r in self.records[3:]})
+
+        self.assertEqual(bulk_purge(deleted_records(search=str(self.product_ids[4]))).done, 1)
+
+    @override_settings(ROOT_URLCONF='dashboard.tests.records_urls')
+    def test_bulk_view_applies_to_selection_or_filter(self):
+        """Test that the bulk action restores the selected records or purges everything matching the filters"""
+        factory = RequestFactory()
+
+        def post(data):
+            request = factory.post('/records/bulk/', data)
+            request.session = {'records_password_verified': True}
+            request._messages = FallbackStorage(request)
+            response = views.bulk_records_action(request)
+            return response, [str(message) for message in get_messages(request)]
+
+        response, notices = post({'action': 'restore', 'selected': [self.records[0].pk, self.records[1].pk]})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(notices, ['Restored 2 of 2 records.'])
+        self.assertEqual(Project.objects.count(), 2)
+
+        response, notices = post({'action': 'purge', 'apply_to_filter': '1', 'model_name': 'Project'})
+        self.assertEqual(notices, ['Permanently deleted 3 of 3 records.'])
+        self.assertFalse(DeletedRecord.objects.exists())
+        self.assertEqual(Project.objects.count(), 2)
@@ -0,0 +1,56 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.models import Project, ProjectResource, Resource
+
+
+class ResourceAlignmentTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='aligner', password='testpassword')
+        self.client.force_login(self.user)
+        self.lead = Resource.objects.create(name='Lead', role='Team Lead')
+        self.resources = [Resource.objects.create(name=f'Tester {i:02}', role='QA') for i in range(6)]
+        self.projects = [Project.objects.create(name=f'Product {i:02}', team_lead=self.lead) for i in range(25)]
+        for i, project in enumerate(self.projects):
+            for resource in self.resources[i % 3:i % 3 + 2]:
+                ProjectResource.objects.create(project=project, resource=resource, utilization_percentage=50)
+
+    def test_assignments_are_loaded_for_the_page_only(self):
+        """Test that the page prefetches only its own products' assignments in a fixed number of queries"""
+        url = reverse('resource-alignment')
+        self.client.get(url, {'page_size': 20})  # warm the team lead options cache
+        with self.assertNumQueries(5):
+            response = self.client.get(url, {'page_size': 20})
+        page_ids = {product.id for product in response.context['products']}
+        self.assertEqual(set(response.context['resources_by_project']), page_ids)
+        self.assertEqual(len(response.context['resources_by_project'][self.projects[0].id]), 2)
+        self.assertEqual([lead['name'] for lead in response.context['team_leads']], ['Lead'])
+        self.assertNotIn('resources', response.context)
+
+    def test_resource_picker_searches_and_excludes_assigned(self):
+        """Test that the picker matches by name or role and leaves out resources already on the product"""
+        url = reverse('resource-picker-api')
+        response = self.client.get(url, {'q': 'tester', 'exclude_project': self.projects[0].id})
+        names = [resource['name'] for resource in response.json()['results']]
+        self.assertEqual(names, ['Tester 02', 'Tester 03', 'Tester 04', 'Tester 05'])
+
+        response = self.client.get(url, {'q': 'qa', 'limit': 2})
+        self.assertEqual(len(response.json()['results']), 2)
+        self.assertTrue(response.json()['has_more'])
+        self.assertEqual(self.client.get(url, {'limit': 'many'}).status_code, 400)
+
+        page = self.client.get(reverse('assign-resource', args=[self.projects[0].id]))
+        self.assertTrue(page.context['has_available_resources'])
+
+    def test_export_streams_filtered_rows(self):
+        """Test that the CSV export streams the assignments of the filtered products"""
+        Project.objects.filter(pk=self.projects[0].pk).update(status='completed')
+        response = self.client.get(reverse('resource-alignment-export'), {'format': 'csv', 'status': 'completed'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith('product_name,product_status,resource_name'))
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(all(line.startswith('Product 00,') for line in lines[1:]))
@@ -0,0 +1,81 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from dashboard.hierarchy import accessible_resources, can_view_resource, move_resource, rebuild_resource_hierarchy
+from dashboard.models import Resource, ResourceHierarchy
+
+
+class ResourceHierarchyTest(TestCase):
+    def setUp(self):
+        self.lead_user = User.objects.create_user(username='lead', password='testpassword')
+        self.manager_user = User.objects.create_user(username='manager', password='testpassword')
+        self.member_user = User.objects.create_user(username='member', password='testpassword')
+
+        self.manager = Resource.objects.create(name='Manager', user=self.manager_user)
+        self.lead = Resource.objects.create(name='Lead', user=self.lead_user)
+        self.sub_lead = Resource.objects.create(name='Sub Lead', lead=self.lead, manager=self.manager)
+        self.member = Resource.objects.create(name='Member', lead=self.sub_lead, user=self.member_user)
+        self.outsider = Resource.objects.create(name='Outsider')
+
+    def closure(self):
+        return set(ResourceHierarchy.objects.values_list('ancestor_id', 'descendant_id', 'depth', 'relation'))
+
+    def test_closure_matches_full_rebuild(self):
+        """Test that incremental maintenance matches a full rebuild after moves and deletes"""
+        self.member.lead = self.outsider
+        self.member.save()
+        self.member.lead = self.sub_lead
+        self.member.save()
+        self.sub_lead.lead = None
+        self.sub_lead.save()
+        self.sub_lead.lead = self.lead
+        self.sub_lead.save()
+        incremental = self.closure()
+        self.assertIn((self.lead.pk, self.member.pk, 2, 'lead'), incremental)
+
+        rebuild_resource_hierarchy()
+        self.assertEqual(incremental, self.closure())
+
+        self.sub_lead.delete()
+        incremental = self.closure()
+        rebuild_resource_hierarchy()
+        self.assertEqual(incremental, self.closure())
+        self.assertNotIn((self.lead.pk, self.member.pk, 2, 'lead'), incremental)
+
+    def test_move_that_would_create_a_cycle_keeps_the_links(self):
+        """Test that refusing a move under its own subtree leaves the closure untouched"""
+        before = self.closure()
+        move_resource(self.sub_lead.pk, 'lead', self.member.pk)
+        self.assertEqual(self.closure(), before)
+
+    def test_accessible_resources_follow_multi_level_tree(self):
+        """Test that leads see all levels below them and managers see everyone"""
+        self.assertEqual(set(accessible_resources(self.lead_user)), {self.sub_lead, self.member})
+        self.assertEqual(set(accessible_resources(self.manager_user)), set(Resource.objects.all()))
+        self.assertEqual(list(accessible_resources(self.member_user)), [self.member])
+
+        outsider_user = User.objects.create_user(username='outsider', password='testpassword')
+        self.assertEqual(list(accessible_resources(outsider_user)), [])
+
+    def test_scope_is_cached_and_invalidated(self):
+        """Test that the access scope is cached until a resource changes"""
+        list(accessible_resources(self.lead_user))
+        with self.assertNumQueries(1):
+            list(accessible_resources(self.lead_user))
+
+        self.member.lead = None
+        self.member.save()
+        self.assertEqual(set(accessible_resources(self.lead_user)), {self.sub_lead})
+
+    def test_can_view_resource(self):
+        """Test that visibility checks cover self and every ancestor in either chain"""
+        self.assertTrue(can_view_resource(self.lead_user, self.member))
+        self.assertTrue(can_view_resource(self.member_user, self.member))
+        self.assertFalse(can_view_resource(self.member_user, self.lead))
+        self.assertFalse(can_view_resource(self.lead_user, self.outsider))
+
+    def test_managers_only_view_resources_they_manage(self):
+        """Test that a manager's view of a single resource is limited to their manager chain"""
+        self.assertTrue(can_view_resource(self.manager_user, self.sub_lead))
+        self.assertFalse(can_view_resource(self.manager_user, self.lead))
+        self.assertFalse(can_view_resource(self.manager_user, self.outsider))
@@ -0,0 +1,77 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.models import Project, ProjectResource, Resource, ResourceLeave
+from dashboard.planning import table_rows
+
+
+class ResourcePlanningEventsTest(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user(username='planner', password='testpassword'))
+        self.alice = Resource.objects.create(name='Alice')
+        self.bob = Resource.objects.create(name='Bob')
+        self.checkout = Project.objects.create(name='Checkout')
+        self.catalog = Project.objects.create(name='Catalog')
+        self.open_ended = ProjectResource.objects.create(
+            project=self.checkout, resource=self.alice, start_date=date(2024, 1, 20), utilization_percentage=50,
+        )
+        self.old = ProjectResource.objects.create(
+            project=self.catalog, resource=self.alice, start_date=date(2023, 1, 1), end_date=date(2023, 6, 30),
+        )
+        self.current = ProjectResource.objects.create(
+            project=self.catalog, resource=self.bob, start_date=date(2023, 12, 1), end_date=date(2024, 3, 1),
+        )
+        self.leave = ResourceLeave.objects.create(
+            resource=self.bob, start_date=date(2024, 2, 5), end_date=date(2024, 2, 9), leave_type='vacation',
+        )
+        self.url = reverse('resource-planning-events')
+
+    def event_ids(self, **params):
+        response = self.client.get(self.url, {'start': '2024-01-29T00:00:00+05:00', 'end': '2024-03-11', **params})
+        self.assertEqual(response.status_code, 200)
+        return [event['id'] for event in response.json()]
+
+    def test_returns_events_overlapping_window(self):
+        """Test that only assignments and leaves overlapping the window are returned"""
+        self.assertEqual(self.event_ids(), [
+            f'project_{self.current.pk}', f'project_{self.open_ended.pk}', f'leave_{self.leave.pk}',
+        ])
+        self.assertEqual(self.event_ids(resource=self.alice.pk), [f'project_{self.open_ended.pk}'])
+        self.assertEqual(self.event_ids(project=self.catalog.pk), [f'project_{self.current.pk}', f'leave_{self.leave.pk}'])
+
+        page = self.client.get(reverse('resource-planning'))
+        self.assertContains(page, self.url)
+        self.assertNotIn('calendar_data', page.context)
+
+    def test_etag_and_invalid_windows(self):
+        """Test that unchanged windows answer 304 and invalid windows 400"""
+        params = {'start': '2024-02-01', 'end': '2024-03-01'}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.url, params, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        self.leave.description = 'Ski trip'
+        self.leave.save()
+        self.assertEqual(self.client.get(self.url, params, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+        self.assertEqual(self.client.get(self.url, {'start': '2024-03-01', 'end': '2024-02-01'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'start': '2020-01-01', 'end': '2024-02-01'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'end': '2024-02-01'}).status_code, 400)
+
+    def test_tables_list_current_rows_or_search_matches(self):
+        """Test that the page tables skip ended rows unless searched for, and are capped"""
+        upcoming = ResourceLeave.objects.create(
+            resource=self.alice, start_date=date(2024, 3, 4), end_date=date(2024, 3, 8), leave_type='sick',
+        )
+        today = date(2024, 3, 2)
+        self.assertEqual(table_rows(today), ([self.open_ended], [upcoming], False))
+        self.assertEqual(table_rows(today, 'bob'), ([self.current], [self.leave], False))
+        self.assertEqual(table_rows(today, 'vacation')[1], [self.leave])
+        self.assertEqual(table_rows(today, 'alice', limit=1), ([self.open_ended], [upcoming], True))
+
+        page = self.client.get(reverse('resource-planning'), {'search': 'Catalog'})
+        self.assertEqual(list(page.context['project_resources']), [self.current, self.old])
+        self.assertEqual(list(page.context['leaves']), [])
@@ -0,0 +1,70 @@
+import json
+from datetime import date, timedelta
+
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from dashboard.models import Project, Quarter, QuarterTarget, Resource, RoadmapItem
+from dashboard.views import roadmap_timeline_api
+
+
+class RoadmapTimelineApiTest(TestCase):
+    # The roadmap URLs are hidden, so the view is called directly
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.quarter = Quarter.objects.create(year=2024, quarter_number=1)
+        owner = Resource.objects.create(name='Owner')
+        project = Project.objects.create(name='Checkout')
+        target = QuarterTarget.objects.create(quarter=self.quarter, project=project, target_description='Ship')
+        self.items = [
+            RoadmapItem.objects.create(
+                title=f'Item {i}', owner=owner, project=project, quarter_target=target if i == 0 else None,
+                quarter=self.quarter, start_date=date(2024, 1, 1) + timedelta(days=i), end_date=date(2024, 2, 1),
+            )
+            for i in range(3)
+        ]
+        # Spread the timestamps so deltas are deterministic
+        base = timezone.now() - timedelta(hours=1)
+        for i, item in enumerate(self.items):
+            RoadmapItem.objects.filter(pk=item.pk).update(updated_at=base + timedelta(minutes=i))
+
+    def get(self, **params):
+        headers = {key: params.pop(key) for key in list(params) if key.startswith('HTTP_')}
+        return roadmap_timeline_api(self.factory.get('/timeline.json', params, **headers), quarter_id=self.quarter.pk)
+
+    def test_full_timeline_matches_model_serialization(self):
+        """Test that the values() serialization matches RoadmapItem.get_timeline_data in one query for the items"""
+        with self.assertNumQueries(4):  # quarter, version, items, ids
+            response = self.get()
+        body = json.loads(response.content)
+        self.assertTrue(body['full'])
+        expected = [item.get_timeline_data() for item in RoadmapItem.objects.filter(quarter=self.quarter)]
+        self.assertEqual(body['items'], expected)
+        self.assertEqual(body['items'][0]['quarter_target'], 'Checkout - Q1 2024')
+
+    def test_since_returns_changed_items_and_remaining_ids(self):
+        """Test that a delta request returns only newer items and the ids still on the timeline"""
+        first = json.loads(self.get().content)
+        self.items[2].delete()
+        self.items[1].title = 'Renamed'
+        self.items[1].save()
+
+        body = json.loads(self.get(since=first['last_modified']).content)
+        self.assertFalse(body['full'])
+        self.assertEqual([item['title'] for item in body['items']], ['Renamed'])
+        self.assertEqual(sorted(body['ids']), [self.items[0].pk, self.items[1].pk])
+        self.assertEqual(self.get(since='yesterday').status_code, 400)
+
+    def test_conditional_requests(self):
+        """Test that the ETag answers an unchanged timeline with 304 and changes when items are edited or deleted"""
+        response = self.get()
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        self.items[0].save()
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+        response = self.get()
+        self.items[2].delete()
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.models import (
+    ProductionBug, ProductProblem, Project, SearchDocument, WeeklyProductMeeting, WeeklyProductUpdate,
+)
+from dashboard.search import rebuild_search_index, search_documents
+
+
+class SearchTest(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user(username='viewer', password='testpassword'))
+        self.checkout = Project.objects.create(name='Checkout Service', description='Payments and invoices')
+        self.catalog = Project.objects.create(name='Catalog', description='Product listing')
+        self.bug = ProductionBug.objects.create(
+            title='Timeout on payment capture', project=self.checkout, details='Gateway latency spikes',
+        )
+        update = WeeklyProductUpdate.objects.create(meeting=WeeklyProductMeeting.objects.create(), project=self.catalog)
+        self.problem = ProductProblem.objects.create(product_update=update, problem_description='Flaky payment mocks')
+
+    def kinds(self, text):
+        return [(document.kind, document.object_id) for document in search_documents(text)]
+
+    def test_index_follows_saves_and_deletes(self):
+        """Test that signals keep the index in sync and titles outrank bodies"""
+        # Prefix matching: 'payment' also finds 'Payments' in the product description
+        results = self.kinds('payment')
+        self.assertEqual(results[0], ('production_bug', self.bug.pk))
+        self.assertEqual(set(results[1:]), {('product_problem', self.problem.pk), ('project', self.checkout.pk)})
+        self.assertEqual(self.kinds('checkout pay'), [('project', self.checkout.pk), ('production_bug', self.bug.pk)])
+
+        self.checkout.name = 'Billing'
+        self.checkout.save()
+        self.assertEqual(self.kinds('billing'), [('project', self.checkout.pk), ('production_bug', self.bug.pk)])
+
+        self.problem.delete()
+        self.assertEqual(self.kinds('mocks'), [])
+        self.assertEqual(self.kinds('"; DROP'), [])
+
+    def test_rebuild_matches_incremental_index(self):
+        """Test that rebuilding the index produces the same documents"""
+        before = set(SearchDocument.objects.values_list('kind', 'object_id', 'title', 'body'))
+        self.assertEqual(rebuild_search_index(chunk_size=2), len(before))
+        self.assertEqual(set(SearchDocument.objects.values_list('kind', 'object_id', 'title', 'body')), before)
+        self.assertEqual(self.kinds('gateway'), [('production_bug', self.bug.pk)])
+
+    def test_search_endpoint_and_list_views(self):
+        """Test the /search/ page and the list view search boxes"""
+        response = self.client.get(reverse('search'), {'q': 'payment', 'kind': 'production_bug'})
+        self.assertEqual([result.object_id for result in response.context['results']], [self.bug.pk])
+        self.assertContains(response, 'Timeout on payment capture')
+
+        response = self.client.get(reverse('production-bug-list'), {'search': 'checkout'})
+        self.assertEqual([bug.pk for bug in response.context['bugs']], [self.bug.pk])
+        response = self.client.get(reverse('product-list'), {'search': 'invoice'})
+        self.assertEqual([product.pk for product in response.context['products']], [self.checkout.pk])
@@ -0,0 +1,64 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from dashboard.activity import action_model_names, action_user_options, search_actions
+from dashboard.audit import AuditRecord, write_user_actions
+from dashboard.models import UserAction
+
+
+class UserActionSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='auditor', password='testpassword')
+        self.other = User.objects.create_user(username='reviewer', password='testpassword')
+        self.project_view = UserAction.objects.create(
+            user=self.user, action_type='view', model_name='product', details='URL: /products/12/, Method: GET'
+        )
+        self.rock_edit = UserAction.objects.create(
+            user=self.other, action_type='update', model_name='rock', details='URL: /rocks/3/edit/, Method: POST'
+        )
+
+    def test_search_uses_words_of_details_model_and_username(self):
+        """Test that search matches word prefixes of details and model names, and usernames"""
+        def found(text):
+            return set(search_actions(UserAction.objects.all(), text).values_list('pk', flat=True))
+
+        self.assertEqual(found('products'), {self.project_view.pk})
+        self.assertEqual(found('rock edit'), {self.rock_edit.pk})
+        self.assertEqual(found('POS'), {self.rock_edit.pk})
+        self.assertEqual(found('review'), {self.rock_edit.pk})
+        self.assertEqual(found('nothing'), set())
+
+        # Deleted rows leave the index
+        self.rock_edit.delete()
+        self.assertEqual(found('rock'), set())
+
+    def test_facets_are_cached_and_invalidated_on_write(self):
+        """Test that the model name and user options are cached until a write changes them"""
+        self.assertEqual(action_model_names(), ['product', 'rock'])
+        self.assertEqual(len(action_user_options()), 2)
+        with self.assertNumQueries(0):
+            action_model_names()
+            action_user_options()
+
+        write_user_actions([AuditRecord(self.user.pk, 'view', 'sop', 4, '', None, self.project_view.timestamp)])
+        self.assertEqual(action_model_names(), ['product', 'rock', 'sop'])
+
+        User.objects.create_user(username='newcomer')
+        self.assertIn('newcomer', [option['username'] for option in action_user_options()])
+
+    def test_list_view_only_sorts_on_the_whitelist(self):
+        """Test that unknown sort_by values fall back to newest first"""
+        self.client.force_login(self.user)
+        url = reverse('user-action-list')
+
+        response = self.client.get(url, {'sort_by': 'details'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['current_filters']['sort_by'], '-timestamp')
+        self.assertEqual([a.pk for a in response.context['actions']], [self.rock_edit.pk, self.project_view.pk])
+
+        response = self.client.get(url, {'sort_by': 'action_type', 'search': 'method'})
+        self.assertEqual([a.pk for a in response.context['actions']], [self.rock_edit.pk, self.project_view.pk])
+        self.assertEqual(response.context['model_names'], ['product', 'rock'])
@@ -0,0 +1,57 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from dashboard.meetings import bootstrap_weekly_meeting
+from dashboard.models import OATReleaseCycle, Project, Resource, SprintCycle, WeeklyMeeting, WeeklyProjectUpdate
+
+
+class WeeklyMeetingBootstrapTest(TestCase):
+    def setUp(self):
+        self.sprint = SprintCycle.objects.create(name='Sprint 1')
+        self.oat = OATReleaseCycle.objects.create(name='OAT 1')
+        self.lead = Resource.objects.create(name='Lead')
+        self.meeting = WeeklyMeeting.objects.create()
+
+    def create_projects(self, count):
+        for i in range(count):
+            Project.objects.create(
+                name=f'Product {i}', team_lead=self.lead, execution_time_of_smoke='1h 30m',
+                sprint_cycle=' Sprint 1 ', oat_release_cycle='OAT 1', total_automated_test_cases=i,
+            )
+
+    def bootstrap_query_count(self, meeting):
+        with CaptureQueriesContext(connection) as queries:
+            bootstrap_weekly_meeting(meeting)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_projects(self):
+        """Test that bootstrapping a meeting costs a constant number of queries"""
+        self.create_projects(3)
+        small = self.bootstrap_query_count(self.meeting)
+
+        self.create_projects(30)
+        large = self.bootstrap_query_count(WeeklyMeeting.objects.create())
+
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 8)
+
+    def test_creates_missing_updates_from_project_values(self):
+        """Test that updates are pre-filled from the project and existing ones are kept"""
+        self.create_projects(2)
+        first, second = Project.objects.order_by('pk')
+        WeeklyProjectUpdate.objects.create(meeting=self.meeting, project=first, bugs_found_through_automation=7)
+
+        baselines = bootstrap_weekly_meeting(self.meeting)
+
+        self.assertEqual(set(baselines), {first.pk, second.pk})
+        self.assertEqual(baselines[second.pk]['team_lead_name'], 'Lead')
+        self.assertEqual(WeeklyProjectUpdate.objects.filter(meeting=self.meeting).count(), 2)
+        self.assertEqual(WeeklyProjectUpdate.objects.get(project=first).bugs_found_through_automation, 7)
+
+        update = WeeklyProjectUpdate.objects.get(project=second)
+        self.assertEqual((update.execution_time_hours, update.execution_time_minutes), (1, 30))
+        self.assertEqual(update.sprint_cycle, self.sprint)
+        self.assertEqual(update.oat_release_cycle, self.oat)
+        self.assertEqual(update.team_lead, self.lead)
+        self.assertEqual(update.total_automated_test_cases, 1)
@@ -0,0 +1,91 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from dashboard.meetings import bootstrap_weekly_meeting, complete_weekly_meeting, record_modified_fields
+from dashboard.models import (
+    DashboardSnapshot, MeetingBaseline, Project, Resource, SprintCycle, WeeklyMeeting, WeeklyProjectUpdate,
+)
+from dashboard.product_filters import team_lead_options
+
+
+class WeeklyMeetingCompletionTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.sprint = SprintCycle.objects.create(name='Sprint 2')
+        self.lead = Resource.objects.create(name='Lead')
+
+    def start_meeting(self, project_count):
+        for i in range(project_count):
+            Project.objects.create(name=f'Product {i}', team_lead=self.lead, bugs_found_through_automation=1)
+        meeting = WeeklyMeeting.objects.create()
+        bootstrap_weekly_meeting(meeting)
+        return meeting
+
+    def edit(self, meeting, project, **values):
+        WeeklyProjectUpdate.objects.filter(meeting=meeting, project=project).update(**values)
+        record_modified_fields(MeetingBaseline, meeting, project, list(values))
+
+    def complete_query_count(self, meeting):
+        for project in Project.objects.all():
+            self.edit(meeting, project, bugs_found_through_automation=3, sprint_cycle=self.sprint)
+        with CaptureQueriesContext(connection) as queries:
+            complete_weekly_meeting(meeting)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_projects(self):
+        """Test that ending a meeting costs a constant number of queries"""
+        small = self.complete_query_count(self.start_meeting(3))
+        Project.objects.all().delete()
+        large = self.complete_query_count(self.start_meeting(30))
+
+        self.assertEqual(small, large)
+
+    def test_summary_and_write_back(self):
+        """Test that the summary lists changes and only modified fields are written back"""
+        meeting = self.start_meeting(2)
+        snapshot = DashboardSnapshot.load()
+        first, second = Project.objects.order_by('pk')
+        self.edit(meeting, first, bugs_found_through_automation=4, execution_time_hours=2,
+                  smoke_automation_status='completed', team_lead=None, sprint_cycle=self.sprint)
+        # Changed on the update but never edited during the meeting
+        WeeklyProjectUpdate.objects.filter(meeting=meeting, project=second).update(regression_coverage=50)
+
+        complete_weekly_meeting(meeting)
+
+        meeting.refresh_from_db()
+        self.assertTrue(meeting.is_completed)
+        self.assertIn(
+            f"Project: {first.name}\n"
+            "- Smoke Automation Status changed from 'N/A' to 'Completed'\n"
+            "- Bugs Found Through Automation changed from 1 to 4\n"
+            "- Execution Time changed from 0h 0m to 2h 0m\n"
+            "- Team Lead changed from Lead to Not assigned\n"
+            "- Sprint Cycle changed from Not specified to Sprint 2",
+            meeting.notes,
+        )
+        self.assertIn("Regression Coverage changed from 0% to 50%", meeting.notes)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.bugs_found_through_automation, 4)
+        self.assertEqual(first.execution_time_of_smoke, '2h 0m')
+        self.assertEqual(first.sprint_cycle, 'Sprint 2')
+        self.assertIsNone(first.team_lead)
+        self.assertIsNone(second.regression_coverage)
+
+        snapshot.refresh_from_db()
+        self.assertEqual(snapshot.bugs_found_through_automation, 5)
+        self.assertFalse(MeetingBaseline.objects.filter(meeting=meeting).exists())
+
+    def test_team_lead_write_back_refreshes_lead_options(self):
+        """Test that writing a new team lead back to the products invalidates the cached team lead options"""
+        other_lead = Resource.objects.create(name='Other lead')
+        meeting = self.start_meeting(1)
+        self.assertEqual([option['id'] for option in team_lead_options()], [self.lead.pk])
+
+        self.edit(meeting, Project.objects.get(), team_lead=other_lead)
+        complete_weekly_meeting(meeting)
+
+        self.assertEqual([option['id'] for option in team_lead_options()], [other_lead.pk])
@@ -0,0 +1,115 @@
+"""
+Automation metric time series.
+
+AutomationMetricPoint keeps one narrow row per (project, week, metric) so trend
+charts read an indexed table instead of the wide WeeklyProjectUpdate history.
+Points are written when a weekly meeting ends; backfill_automation_metrics()
+rebuilds them from the whole meeting history.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import AutomationMetricPoint, WeeklyProjectUpdate
+
+DEFAULT_MAX_POINTS = 52
+
+# Largest number of points per series a client may ask for (ten years of weeks)
+MAX_POINTS = 520
+
+
+def week_start(value):
+    """Return the Monday of the week containing a date or datetime."""
+    if hasattr(value, 'hour'):
+        value = timezone.localtime(value) if timezone.is_aware(value) else value
+        value = value.date()
+    return value - timedelta(days=value.weekday())
+
+
+def _metric_points(updates):
+    """
+    Build AutomationMetricPoint rows from (project_id, meeting_date, *metric values)
+    tuples ordered by meeting date. A later meeting in the same week wins.
+    """
+    points = {}
+    for project_id, meeting_date, *values in updates:
+        week = week_start(meeting_date)
+        for metric, value in zip(AutomationMetricPoint.METRIC_FIELDS, values):
+            points[(project_id, metric, week)] = AutomationMetricPoint(
+                project_id=project_id, week=week, metric=metric, value=value or 0,
+            )
+    return list(points.values())
+
+
+def _save_points(points):
+    AutomationMetricPoint.objects.bulk_create(
+        points,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['project', 'metric', 'week'],
+        update_fields=['value'],
+    )
+    return len(points)
+
+
+def _update_rows(queryset):
+    return queryset.order_by('meeting__meeting_date', 'pk').values_list(
+        'project_id', 'meeting__meeting_date', *AutomationMetricPoint.METRIC_FIELDS.values()
+    )
+
+
+def record_meeting_metrics(meeting):
+    """Store the metric points of every project update in a meeting. Returns the number of points."""
+    return _save_points(_metric_points(_update_rows(WeeklyProjectUpdate.objects.filter(meeting=meeting))))
+
+
+def backfill_automation_metrics(chunk_size=2000):
+    """
+    Rebuild the metric points from every WeeklyProjectUpdate, chunk by chunk.
+    Chunks are written in meeting date order so later meetings still win.
+    Returns the number of points written.
+    """
+    written = 0
+    chunk = []
+    for row in _update_rows(WeeklyProjectUpdate.objects.all()).iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            written += _save_points(_metric_points(chunk))
+            chunk = []
+    if chunk:
+        written += _save_points(_metric_points(chunk))
+    return written
+
+
+def downsample(points, max_points):
+    """
+    Reduce a list of (week, value) pairs to at most max_points by splitting it
+    into equal buckets and keeping the last point of each bucket.
+    """
+    if max_points < 1:
+        raise ValueError('max_points must be at least 1')
+    if len(points) <= max_points:
+        return points
+    size = len(points) / max_points
+    return [points[min(len(points), int(round((index + 1) * size))) - 1] for index in range(max_points)]
+
+
+def metric_series(project_ids, metrics=None, start=None, end=None, max_points=DEFAULT_MAX_POINTS):
+    """
+    Return {(project_id, metric): [(week, value), ...]} for the given projects,
+    ordered by week and downsampled to at most max_points per series.
+    """
+    queryset = AutomationMetricPoint.objects.filter(project_id__in=project_ids)
+    if metrics:
+        queryset = queryset.filter(metric__in=metrics)
+    if start:
+        queryset = queryset.filter(week__gte=week_start(start))
+    if end:
+        queryset = queryset.filter(week__lte=end)
+
+    series = {}
+    for project_id, metric, week, value in queryset.order_by('project_id', 'metric', 'week').values_list(
+        'project_id', 'metric', 'week', 'value'
+    ):
+        series.setdefault((project_id, metric), []).append((week, value))
+    return {key: downsample(points, max_points) for key, points in series.items()}
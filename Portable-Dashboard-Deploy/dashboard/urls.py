@@ -10,6 +10,7 @@ from django.contrib.auth import views as auth_views
 urlpatterns = [
     # Dashboard
     path('', views.dashboard, name='dashboard'),
+    path('search/', views.SearchView.as_view(), name='search'),
 
     # Resource URLs
     path('resources/', views.ResourceListView.as_view(), name='resource-list'),
@@ -24,6 +25,7 @@ urlpatterns = [
     # Product URLs
     path('products/', views.ProductListView.as_view(), name='product-list'),
     path('products/<int:pk>/', views.ProductDetailView.as_view(), name='product-detail'),
+    path('api/automation-metrics/', views.automation_metrics_api, name='automation-metrics-api'),
     path('products/new/', views.ProductCreateView.as_view(), name='product-create'),
     path('products/<int:pk>/edit/', views.ProductUpdateView.as_view(), name='product-update'),
     path('products/<int:pk>/delete/', views.ProductDeleteView.as_view(), name='product-delete'),
@@ -69,6 +71,7 @@ urlpatterns = [
     path('weekly-product-meetings/<int:pk>/start/', views.start_weekly_product_meeting, name='start-weekly-product-meeting'),
     path('weekly-product-meetings/<int:pk>/end/', views.end_weekly_product_meeting, name='end-weekly-product-meeting'),
     path('weekly-product-meetings/<int:meeting_id>/update-product/<int:project_id>/', views.update_product_in_meeting, name='update-product-in-meeting'),
+    path('weekly-product-meetings/<int:meeting_id>/update-product/<int:project_id>/problems/', views.update_product_problems_api, name='update-product-problems-api'),
     path('weekly-product-meetings/latest-updates/', views.LatestProductUpdatesView.as_view(), name='latest-product-updates'),
 
     # Quarter URLs
@@ -97,6 +100,10 @@ urlpatterns = [
 
     # Resource Planning URLs
     path('resource-planning/', views.ResourcePlanningView.as_view(), name='resource-planning'),
+    path('resource-planning/events/', views.resource_planning_events, name='resource-planning-events'),
+    path('resource-capacity/', views.CapacityHeatmapView.as_view(), name='capacity-heatmap'),
+    path('api/capacity/', views.capacity_api, name='capacity-api'),
+    path('api/resources/picker/', views.resource_picker_api, name='resource-picker-api'),
     path('resource-leaves/new/', views.ResourceLeaveCreateView.as_view(), name='resource-leave-create'),
     path('resource-leaves/<int:pk>/edit/', views.ResourceLeaveUpdateView.as_view(), name='resource-leave-update'),
     path('resource-leaves/<int:pk>/delete/', views.ResourceLeaveDeleteView.as_view(), name='resource-leave-delete'),
@@ -118,6 +125,7 @@ urlpatterns = [
     # Strategic Roadmap URLs - Temporarily hidden
     # path('roadmap/', views.RoadmapTimelineView.as_view(), name='roadmap-timeline'),
     # path('roadmap/quarter/<int:quarter_id>/', views.RoadmapTimelineView.as_view(), name='roadmap-timeline-quarter'),
+    # path('roadmap/quarter/<int:quarter_id>/timeline.json', views.roadmap_timeline_api, name='roadmap-timeline-api'),
     # path('roadmap/items/', views.RoadmapItemListView.as_view(), name='roadmap-item-list'),
     # path('roadmap/items/<int:pk>/', views.RoadmapItemDetailView.as_view(), name='roadmap-item-detail'),
     # path('roadmap/items/new/', views.RoadmapItemCreateView.as_view(), name='roadmap-item-create'),
@@ -148,6 +156,7 @@ urlpatterns = [
     # path('records/password-verify/', views.RecordsPasswordVerifyView.as_view(), name='records-password-verify'),
     # path('records/password-set/', views.RecordsPasswordSetView.as_view(), name='records-password-set'),
     # path('records/restore/<int:pk>/', views.restore_record, name='restore-record'),
+    # path('records/bulk/', views.bulk_records_action, name='records-bulk-action'),
 
     # User Action Logs
     path('logs/', views.UserActionListView.as_view(), name='user-action-list'),
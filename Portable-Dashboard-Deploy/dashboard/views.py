@@ -1,20 +1,49 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
 from django.contrib import messages
-from django.db.models import Count, Sum, Avg, Q
+from django.db import transaction
+from django.db.models import Count, Sum, Avg, Q, OuterRef, Subquery
 from django.utils import timezone
-from .models import Resource, Project, ProjectResource, WeeklyMeeting, WeeklyProjectUpdate, SprintCycle, OATReleaseCycle, Quarter, QuarterTarget, QuarterTargetResource, WeeklyProductMeeting, WeeklyProductUpdate, ResourceLeave, Rock, RoadmapItem, ProductDocumentation, ProductionBug, DepartmentDocument, DeletedRecord, RecordsPassword, UserAction, KPI, KPIRating, KPIRatingSubmission, OneOnOneFeedback, MonthlyFeedback, SOP, SOPStatusHistory, ProductBackupResource, AutomationRunner, AutomationSprint
+from .activity import (
+    SORT_OPTIONS, action_model_names, action_user_options, activity_counts, raw_window_start, retention_days,
+    search_actions, sort_ordering,
+)
+from .alignment import PICKER_LIMIT, alignment_prefetch, search_resources
+from .capacity import (
+    build_capacity_matrix, capacity_report, heatmap_levels, over_allocation_intervals, parse_horizon,
+    resource_totals, team_resource_ids, team_rollups, weekly_utilization,
+)
+from .hierarchy import accessible_resources, can_view_resource, get_access_scope
+from .meetings import (
+    apply_problem_edits, bootstrap_weekly_meeting, carry_forward_product_updates, clear_meeting_state,
+    complete_weekly_meeting, load_meeting_state, parse_problem_edits, record_modified_fields, save_meeting_baselines,
+    PROBLEM_EDIT_FIELDS,
+)
+from .metrics import compute_dashboard_metrics
+from .pagination import CursorPaginator, InvalidCursor
+from .planning import TABLE_ROW_LIMIT, calendar_events, parse_window, table_rows
+from .product_filters import team_lead_options
+from .recycle import bulk_purge, bulk_restore, deleted_records, recycle_object
+from .roadmap import timeline_items, timeline_queryset, timeline_version
+from .search import SEARCH_SOURCES, index_objects, matching_ids, search_documents
+from .timeseries import DEFAULT_MAX_POINTS, MAX_POINTS, metric_series
+from .models import Resource, Project, ProjectResource, WeeklyMeeting, WeeklyProjectUpdate, SprintCycle, OATReleaseCycle, Quarter, QuarterTarget, QuarterTargetResource, WeeklyProductMeeting, WeeklyProductUpdate, ProductProblem, ResourceLeave, Rock, RoadmapItem, ProductDocumentation, ProductionBug, DepartmentDocument, DeletedRecord, RecordsPassword, UserAction, KPI, KPIRating, KPIRatingSubmission, OneOnOneFeedback, MonthlyFeedback, SOP, SOPStatusHistory, ProductBackupResource, AutomationRunner, AutomationSprint, DashboardSnapshot, MeetingBaseline, ProductMeetingBaseline, AutomationMetricPoint, SearchDocument, QuarterSummary
 from django.contrib.auth.models import User
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView, FormView
 from django.views.generic.list import MultipleObjectMixin
 from django.urls import reverse_lazy
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.http import JsonResponse, HttpResponseRedirect
+from django.http import HttpResponse, JsonResponse, HttpResponseRedirect, Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.http import quote_etag
 from django import forms
+import hashlib
 import json
 from decimal import Decimal
 from json import JSONEncoder
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from django.utils.crypto import get_random_string
 from django.core.exceptions import PermissionDenied
 
@@ -125,40 +154,22 @@ class DecimalEncoder(JSONEncoder):
 class RecyclableDeleteView(DeleteView):
     """
     A base DeleteView that moves records to the DeletedRecord model instead of permanently deleting them.
-    This allows for potential restoration of deleted records.
+    The record is stored together with every row its deletion cascades to, so restoring it is complete.
     """
 
+    def form_valid(self, form):
+        # Route form submissions through delete() so subclasses that extend it apply to both
+        return self.delete(self.request, *self.args, **self.kwargs)
+
     def delete(self, request, *args, **kwargs):
         """
-        Override the delete method to store the record in the DeletedRecord model
-        before "deleting" it from the main database.
+        Override the delete method to store the record and its cascade in the
+        DeletedRecord model before "deleting" it from the main database.
         """
         self.object = self.get_object()
         success_url = self.get_success_url()
 
-        # Convert the object to a dictionary
-        # This is a simple approach - for complex models with relationships,
-        # you might need a more sophisticated serialization
-        model_fields = [field.name for field in self.object._meta.fields]
-        data_dict = {field: getattr(self.object, field) for field in model_fields}
-
-        # Handle non-serializable types
-        for key, value in data_dict.items():
-            if isinstance(value, datetime):
-                data_dict[key] = value.isoformat()
-            elif hasattr(value, 'pk'):  # Foreign key
-                data_dict[key] = value.pk
-
-        # Create a DeletedRecord entry
-        DeletedRecord.objects.create(
-            model_name=self.object.__class__.__name__,
-            record_id=self.object.pk,
-            data=json.dumps(data_dict),
-            deleted_by=request.user if request.user.is_authenticated else None
-        )
-
-        # Now delete the object as usual
-        self.object.delete()
+        recycle_object(self.object, deleted_by=request.user if request.user.is_authenticated else None)
 
         return HttpResponseRedirect(success_url)
 
@@ -168,8 +179,15 @@ class PaginationMixin:
     A mixin to add pagination functionality to ListView classes.
     Allows users to choose between 20, 50, or 100 entries per page.
     Default is 50 entries per page.
+
+    Views over large tables can set pagination_mode = 'cursor' to page on the
+    (sort key, pk) tuple with opaque ?cursor= tokens instead of COUNT + OFFSET.
+    In that mode no total is shown unless approximate_count_limit is set, in
+    which case the count stops at that many rows.
     """
     paginate_by = 50  # Default page size
+    pagination_mode = 'offset'
+    approximate_count_limit = None
 
     def get_paginate_by(self, queryset):
         """
@@ -185,29 +203,52 @@ class PaginationMixin:
             pass
         return self.paginate_by
 
+    def get_cursor_ordering(self, queryset):
+        """
+        Return the ordering used in cursor mode: the queryset ordering with pk
+        appended as a tie-breaker, or None if it contains expressions.
+        """
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        if not all(isinstance(name, str) for name in ordering):
+            return None
+        if not any(name.lstrip('-') in ('pk', 'id') for name in ordering):
+            descending = ordering[0].startswith('-') if ordering else True
+            ordering.append('-pk' if descending else 'pk')
+        return ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        """Use the cursor paginator when enabled and the ordering allows it."""
+        if self.pagination_mode == 'cursor':
+            ordering = self.get_cursor_ordering(queryset)
+            if ordering and CursorPaginator.supports(queryset.model, ordering):
+                paginator = CursorPaginator(queryset, page_size, ordering, count_limit=self.approximate_count_limit)
+                try:
+                    page = paginator.page(self.request.GET.get('cursor'))
+                except InvalidCursor:
+                    raise Http404("Invalid page cursor")
+                return paginator, page, page.object_list, page.has_other_pages()
+        return super().paginate_queryset(queryset, page_size)
+
     def get_context_data(self, **kwargs):
         """
         Add pagination-related context variables.
         """
         context = super().get_context_data(**kwargs)
-        context['page_size'] = self.get_paginate_by(self.get_queryset())
+        context['page_size'] = self.get_paginate_by(None)
         context['available_page_sizes'] = [20, 50, 100]
+        context['cursor_pagination'] = isinstance(context.get('paginator'), CursorPaginator)
         return context
 
 # Dashboard view
 @login_required
 def dashboard(request):
-    # Get all projects
+    # Headline totals come from the materialized snapshot row; overdue products,
+    # automation backlog and coverage are computed in one aggregate query
+    snapshot = DashboardSnapshot.load()
+    metrics = compute_dashboard_metrics(snapshot=snapshot)
     projects = Project.objects.all()
 
-    # Get counts for analytics
-    total_products = projects.count()
-    total_resources = Resource.objects.count()
-    active_products = projects.filter(status='in_progress').count()
-    completed_products = projects.filter(status='completed').count()
-
-    # Get projects by status for chart
-    products_by_status = projects.values('status').annotate(count=Count('id'))
+    total_resources = snapshot.total_resources
 
     # Get resources by project count
     resources_by_product_count = Resource.objects.annotate(product_count=Count('project')).order_by('-product_count')[:5]
@@ -218,52 +259,6 @@ def dashboard(request):
     # Get recent projects (from filtered set)
     recent_products = projects.order_by('-created_at')[:5]
 
-    # Get overdue projects (from filtered set)
-    overdue_products = [p for p in projects.filter(status__in=['not_started', 'in_progress', 'on_hold']) if p.is_overdue]
-
-    # Calculate automation backlog for all projects (from filtered set)
-    projects_with_automation_data = projects.filter(
-        total_automatable_test_cases__isnull=False,
-        total_automated_test_cases__isnull=False
-    )
-
-    automation_backlog = []
-    for project in projects_with_automation_data:
-        backlog = project.total_automatable_test_cases - project.total_automated_test_cases
-        if backlog > 0:
-            automation_backlog.append({
-                'name': project.name,
-                'backlog': backlog
-            })
-
-    # Calculate smoke coverage percentage (from filtered set)
-    projects_with_smoke_data = projects.filter(
-        total_automatable_smoke_test_cases__gt=0,
-        total_automated_smoke_test_cases__isnull=False
-    )
-
-    smoke_coverage_data = []
-    for project in projects_with_smoke_data:
-        coverage = (project.total_automated_smoke_test_cases / project.total_automatable_smoke_test_cases) * 100
-        smoke_coverage_data.append({
-            'name': project.name,
-            'coverage': round(coverage, 2)
-        })
-
-    # Calculate regression coverage percentage (from filtered set)
-    projects_with_regression_data = projects.filter(
-        total_automatable_test_cases__gt=0,
-        total_automated_test_cases__isnull=False
-    )
-
-    regression_coverage_data = []
-    for project in projects_with_regression_data:
-        coverage = (project.total_automated_test_cases / project.total_automatable_test_cases) * 100
-        regression_coverage_data.append({
-            'name': project.name,
-            'coverage': round(coverage, 2)
-        })
-
     # Get resource count based on project assignments
     resources_with_assignments = Resource.objects.annotate(
         assignment_count=Count('projectresource')
@@ -274,33 +269,22 @@ def dashboard(request):
     current_year = timezone.now().year
 
     # Get resources accessible to the current user
-    try:
-        user_resource = Resource.objects.get(user=request.user)
-
-        # If user is a lead, show only resources that report to them
-        if Resource.objects.filter(lead=user_resource).exists():
-            accessible_resources = Resource.objects.filter(lead=user_resource)
-        # If user is a manager, show all resources
-        elif Resource.objects.filter(manager=user_resource).exists():
-            accessible_resources = Resource.objects.all()
-        # Otherwise, user can only see themselves
-        else:
-            accessible_resources = Resource.objects.filter(id=user_resource.id)
-
-    except Resource.DoesNotExist:
-        # If user doesn't have a resource, don't show any resources
-        accessible_resources = Resource.objects.none()
-
-    # Count feedbacks for accessible resources
-    total_feedbacks = accessible_resources.count()
-
-    # Count submitted feedbacks
-    submitted_feedbacks = MonthlyFeedback.objects.filter(
-        resource__in=accessible_resources,
-        month=current_month,
-        year=current_year,
-        status='submitted'
-    ).count()
+    if get_access_scope(request.user).role == 'manager':
+        # Managers see every resource, so the snapshot totals apply as-is
+        total_feedbacks = snapshot.total_resources
+        submitted_feedbacks = snapshot.submitted_feedbacks
+    else:
+        # Count feedbacks for accessible resources
+        visible_resources = accessible_resources(request.user)
+        total_feedbacks = visible_resources.count()
+
+        # Count submitted feedbacks
+        submitted_feedbacks = MonthlyFeedback.objects.filter(
+            resource__in=visible_resources,
+            month=current_month,
+            year=current_year,
+            status='submitted'
+        ).count()
 
     # Count due feedbacks
     due_feedbacks = total_feedbacks - submitted_feedbacks
@@ -319,18 +303,11 @@ def dashboard(request):
     automation_runners = AutomationRunner.objects.all()
 
     context = {
-        'total_products': total_products,
+        **metrics.as_context(),
         'total_resources': total_resources,
-        'active_products': active_products,
-        'completed_products': completed_products,
-        'products_by_status': products_by_status,
         'resources_by_product_count': resources_by_product_count,
         'products_with_most_resources': products_with_most_resources,
         'recent_products': recent_products,
-        'overdue_products': overdue_products,
-        'automation_backlog': automation_backlog,
-        'smoke_coverage_data': smoke_coverage_data,
-        'regression_coverage_data': regression_coverage_data,
         'resources_with_assignments': resources_with_assignments,
         # Monthly feedback statistics
         'total_feedbacks': total_feedbacks,
@@ -473,12 +450,14 @@ class ProductListView(LoginRequiredMixin, PaginationMixin, ListView):
     context_object_name = 'products'
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('team_lead').annotate(
+            resource_count=Count('resources', distinct=True)
+        ).order_by('pk')
 
         # Search by product name
         search_query = self.request.GET.get('search', '')
         if search_query:
-            queryset = queryset.filter(name__icontains=search_query)
+            queryset = queryset.filter(pk__in=matching_ids('project', search_query))
 
         # Filter by status
         status = self.request.GET.get('status')
@@ -525,8 +504,8 @@ class ProductListView(LoginRequiredMixin, PaginationMixin, ListView):
         context['status_choices'] = Project.STATUS_CHOICES
         context['automation_status_choices'] = Project.AUTOMATION_STATUS_CHOICES
         context['pipeline_schedule_choices'] = Project.PIPELINE_SCHEDULE_CHOICES
-        # Filter team_leads to only show resources that are actually team leads for products
-        context['team_leads'] = Resource.objects.filter(products_as_lead__isnull=False).distinct()
+        # Only resources that are actually team leads for products (cached)
+        context['team_leads'] = team_lead_options()
         context['boolean_choices'] = [('True', 'Yes'), ('False', 'No')]
 
         # Add current filter values to context
@@ -558,7 +537,7 @@ class ProductDetailView(LoginRequiredMixin, DetailView):
         # Get historical project updates from weekly meetings
         historical_updates = WeeklyProjectUpdate.objects.filter(
             project=self.object
-        ).order_by('-meeting__meeting_date')
+        ).select_related('meeting').order_by('-meeting__meeting_date')
 
         # Get documentation for this product
         context['documentation'] = ProductDocumentation.objects.filter(project=self.object)
@@ -566,7 +545,7 @@ class ProductDetailView(LoginRequiredMixin, DetailView):
         # Get manual product updates
         manual_updates = WeeklyProductUpdate.objects.filter(
             project=self.object
-        ).order_by('-meeting__meeting_date')
+        ).select_related('meeting').order_by('-meeting__meeting_date')
         context['manual_updates'] = manual_updates
 
         # Prepare data for smoke coverage chart
@@ -590,6 +569,48 @@ class ProductDetailView(LoginRequiredMixin, DetailView):
         context['historical_updates'] = historical_updates
         return context
 
+@login_required
+def automation_metrics_api(request):
+    """
+    Return weekly automation metric series as JSON.
+
+    Query parameters: product (repeatable, required), metric (repeatable,
+    defaults to all), start / end (YYYY-MM-DD) and points (maximum points per
+    series, 1 to 520, default 52).
+    """
+    try:
+        project_ids = [int(value) for value in request.GET.getlist('product')]
+        metrics = request.GET.getlist('metric')
+        start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else None
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else None
+        max_points = int(request.GET.get('points', DEFAULT_MAX_POINTS))
+    except ValueError as e:
+        return JsonResponse({'error': f'Invalid parameter: {e}'}, status=400)
+
+    if not project_ids:
+        return JsonResponse({'error': 'At least one product is required'}, status=400)
+    if not 1 <= max_points <= MAX_POINTS:
+        return JsonResponse({'error': f'points must be between 1 and {MAX_POINTS}'}, status=400)
+    unknown_metrics = set(metrics) - set(AutomationMetricPoint.METRIC_FIELDS)
+    if unknown_metrics:
+        return JsonResponse({'error': f'Unknown metrics: {", ".join(sorted(unknown_metrics))}'}, status=400)
+
+    series = metric_series(project_ids, metrics, start, end, max_points)
+    product_names = dict(Project.objects.filter(id__in=project_ids).values_list('id', 'name'))
+    metric_labels = dict(AutomationMetricPoint.METRIC_CHOICES)
+    return JsonResponse({
+        'series': [
+            {
+                'product_id': project_id,
+                'product_name': product_names.get(project_id, ''),
+                'metric': metric,
+                'metric_label': metric_labels[metric],
+                'points': [{'week': week.isoformat(), 'value': value} for week, value in points],
+            }
+            for (project_id, metric), points in series.items()
+        ]
+    })
+
 class ProductCreateView(LoginRequiredMixin, CreateView):
     model = Project
     template_name = 'dashboard/product_form.html'
@@ -709,17 +730,38 @@ def assign_resource(request, product_id):
 
             return redirect('product-detail', pk=project.id)
 
-    # Get resources not already assigned to this project
-    assigned_resources = project.resources.all()
-    available_resources = Resource.objects.exclude(id__in=[r.id for r in assigned_resources])
-
+    # The resource picker searches resource_picker_api; only check that there is something to pick
     context = {
         'product': project,
-        'available_resources': available_resources
+        'has_available_resources': Resource.objects.exclude(projectresource__project=project).exists()
     }
 
     return render(request, 'dashboard/assign_resource.html', context)
 
+
+@login_required
+def resource_picker_api(request):
+    """
+    Search resources for the assignment picker.
+
+    Query parameters: q (matches name, role or email), exclude_project (leave
+    out resources already assigned to that product) and limit.
+    """
+    try:
+        limit = int(request.GET.get('limit', PICKER_LIMIT))
+        exclude_project = int(request.GET['exclude_project']) if request.GET.get('exclude_project') else None
+    except ValueError:
+        return JsonResponse({'error': 'limit and exclude_project must be integers'}, status=400)
+
+    resources, has_more = search_resources(request.GET.get('q', '').strip(), exclude_project, limit)
+    return JsonResponse({
+        'results': [
+            {'id': resource.id, 'name': resource.name, 'role': resource.role, 'skill': resource.skill}
+            for resource in resources
+        ],
+        'has_more': has_more,
+    })
+
 def remove_resource(request, product_id, resource_id):
     project_resource = get_object_or_404(ProjectResource, project_id=product_id, resource_id=resource_id)
     resource_name = project_resource.resource.name
@@ -912,95 +954,9 @@ def start_weekly_meeting(request, pk):
         # Set the meeting as active in the session
         request.session[f'meeting_active_{meeting.id}'] = True
 
-        # Get all projects
-        projects = Project.objects.all()
-
-        # Store original project values in the session for comparison when the meeting ends
-        original_values = {}
-
-        # Create WeeklyProjectUpdate objects for each project if they don't exist
-        for project in projects:
-            # Store original values for this project
-            original_values[project.id] = {
-                'smoke_automation_status': project.smoke_automation_status or 'na',
-                'regression_automation_status': project.regression_automation_status or 'na',
-                'pipeline_schedule': project.pipeline_schedule or 'na',
-                'execution_time_of_smoke': project.execution_time_of_smoke or "0h 0m",
-                'total_number_of_available_test_cases': project.total_number_of_available_test_cases or 0,
-                'bugs_found_through_automation': project.bugs_found_through_automation or 0,
-                'regression_coverage': project.regression_coverage or 0,
-                'total_automatable_test_cases': project.total_automatable_test_cases or 0,
-                'total_automated_test_cases': project.total_automated_test_cases or 0,
-                'total_automated_smoke_test_cases': project.total_automated_smoke_test_cases or 0,
-                'status_of_last_automation_run': project.status_of_last_automation_run or '',
-                'date_of_last_automation_run': project.date_of_last_automation_run.strftime('%Y-%m-%d') if project.date_of_last_automation_run else None,
-                'automation_framework_tech_stack': project.automation_framework_tech_stack or '',
-                'total_number_of_functional_test_cases': project.total_number_of_functional_test_cases or 0,
-                'total_number_of_business_test_cases': project.total_number_of_business_test_cases or 0,
-                'readiness_for_production': getattr(project, 'readiness_for_production', False),
-                'team_lead_id': project.team_lead.id if project.team_lead else None,
-                'team_lead_name': project.team_lead.name if project.team_lead else 'Not assigned',
-                'sprint_cycle': project.sprint_cycle or '',
-                'oat_release_cycle': project.oat_release_cycle or '',
-            }
-
-            # Parse execution time from project
-            execution_hours = 0
-            execution_minutes = 0
-            if project.execution_time_of_smoke:
-                time_str = project.execution_time_of_smoke.strip()
-                # Try to parse "Xh Ym" format
-                import re
-                match = re.match(r'(\d+)h\s*(\d+)m', time_str)
-                if match:
-                    execution_hours = int(match.group(1))
-                    execution_minutes = int(match.group(2))
-
-            # Look up SprintCycle and OATReleaseCycle objects based on string values
-            sprint_cycle = None
-            oat_release_cycle = None
-
-            if project.sprint_cycle:
-                try:
-                    sprint_cycle = SprintCycle.objects.get(name=project.sprint_cycle.strip())
-                except SprintCycle.DoesNotExist:
-                    pass
-
-            if project.oat_release_cycle:
-                try:
-                    oat_release_cycle = OATReleaseCycle.objects.get(name=project.oat_release_cycle.strip())
-                except OATReleaseCycle.DoesNotExist:
-                    pass
-
-            WeeklyProjectUpdate.objects.get_or_create(
-                meeting=meeting,
-                project=project,
-                defaults={
-                    'smoke_automation_status': project.smoke_automation_status or 'na',
-                    'regression_automation_status': project.regression_automation_status or 'na',
-                    'pipeline_schedule': project.pipeline_schedule or 'na',
-                    'execution_time_hours': execution_hours,
-                    'execution_time_minutes': execution_minutes,
-                    'total_available_test_cases': project.total_number_of_available_test_cases or 0,
-                    'bugs_found_through_automation': project.bugs_found_through_automation or 0,
-                    'regression_coverage': project.regression_coverage or 0,
-                    'total_automatable_test_cases': project.total_automatable_test_cases or 0,
-                    'total_automated_test_cases': project.total_automated_test_cases or 0,
-                    'total_automated_smoke_test_cases': project.total_automated_smoke_test_cases or 0,
-                    'last_automation_run_status': project.status_of_last_automation_run or '',
-                    'last_automation_run_date': project.date_of_last_automation_run,
-                    'automation_framework_tech_stack': project.automation_framework_tech_stack or '',
-                    'functional_test_cases_count': project.total_number_of_functional_test_cases or 0,
-                    'business_test_cases_count': project.total_number_of_business_test_cases or 0,
-                    'readiness_for_production': getattr(project, 'readiness_for_production', False),
-                    'team_lead': project.team_lead,
-                    'sprint_cycle': sprint_cycle,
-                    'oat_release_cycle': oat_release_cycle,
-                }
-            )
-
-        # Store original values in the session
-        request.session[f'original_values_{meeting.id}'] = original_values
+        # Create the missing WeeklyProjectUpdate objects in bulk and store the
+        # original project values for comparison when the meeting ends
+        bootstrap_weekly_meeting(meeting)
 
         messages.success(request, f'Weekly meeting "{meeting.title}" has been started.')
 
@@ -1010,289 +966,13 @@ def end_weekly_meeting(request, pk):
     meeting = get_object_or_404(WeeklyMeeting, pk=pk)
 
     if request.method == 'POST':
-        # Get the original values from the session
-        original_values = request.session.get(f'original_values_{meeting.id}', {})
-
-        # Remove the meeting active flag and original values from the session
+        # Remove the meeting active flag from the session
         if f'meeting_active_{meeting.id}' in request.session:
             del request.session[f'meeting_active_{meeting.id}']
-        if f'original_values_{meeting.id}' in request.session:
-            del request.session[f'original_values_{meeting.id}']
 
-        # Mark the meeting as completed
-        meeting.is_completed = True
-        meeting.save()
-
-        # Get all project updates for this meeting
-        project_updates = WeeklyProjectUpdate.objects.filter(meeting=meeting)
-
-        # Generate meeting notes summarizing changes
-        summary_notes = []
-
-        for update in project_updates:
-            project = update.project
-            changes = []
-
-            # Skip if we don't have original values for this project
-            if str(project.id) not in original_values:
-                continue
-
-            # Get original values for this project
-            orig = original_values[str(project.id)]
-
-            # Check for changes in each field by comparing with original values (not current project values)
-            # Only add to changes if the values are actually different
-
-            # For status fields, compare the actual values, not the display values
-            orig_smoke_status = str(orig['smoke_automation_status'])
-            update_smoke_status = str(update.smoke_automation_status)
-            if orig_smoke_status != update_smoke_status:
-                # Get display values for the status choices
-                old_status = dict(Project.AUTOMATION_STATUS_CHOICES).get(orig['smoke_automation_status'], orig['smoke_automation_status'])
-                new_status = dict(Project.AUTOMATION_STATUS_CHOICES).get(update.smoke_automation_status, update.smoke_automation_status)
-                changes.append(f"Smoke Automation Status changed from '{old_status}' to '{new_status}'")
-
-            orig_regression_status = str(orig['regression_automation_status'])
-            update_regression_status = str(update.regression_automation_status)
-            if orig_regression_status != update_regression_status:
-                old_status = dict(Project.AUTOMATION_STATUS_CHOICES).get(orig['regression_automation_status'], orig['regression_automation_status'])
-                new_status = dict(Project.AUTOMATION_STATUS_CHOICES).get(update.regression_automation_status, update.regression_automation_status)
-                changes.append(f"Regression Automation Status changed from '{old_status}' to '{new_status}'")
-
-            orig_pipeline = str(orig['pipeline_schedule'])
-            update_pipeline = str(update.pipeline_schedule)
-            if orig_pipeline != update_pipeline:
-                old_schedule = dict(Project.PIPELINE_SCHEDULE_CHOICES).get(orig['pipeline_schedule'], orig['pipeline_schedule'])
-                new_schedule = dict(Project.PIPELINE_SCHEDULE_CHOICES).get(update.pipeline_schedule, update.pipeline_schedule)
-                changes.append(f"Pipeline Schedule changed from '{old_schedule}' to '{new_schedule}'")
-
-            # For numeric fields, convert to integers before comparing
-            orig_available_tests = int(orig['total_number_of_available_test_cases'])
-            update_available_tests = int(update.total_available_test_cases)
-            if orig_available_tests != update_available_tests:
-                changes.append(f"Total Available Test Cases changed from {orig_available_tests} to {update_available_tests}")
-
-            orig_regression_coverage = int(orig['regression_coverage'])
-            update_regression_coverage = int(update.regression_coverage)
-            if orig_regression_coverage != update_regression_coverage:
-                changes.append(f"Regression Coverage changed from {orig_regression_coverage}% to {update_regression_coverage}%")
-
-            orig_bugs = int(orig['bugs_found_through_automation'])
-            update_bugs = int(update.bugs_found_through_automation)
-            if orig_bugs != update_bugs:
-                changes.append(f"Bugs Found Through Automation changed from {orig_bugs} to {update_bugs}")
-
-            # Check for changes in execution time
-            update_execution_time = update.get_execution_time_display()
-            orig_execution_time = str(orig['execution_time_of_smoke'] or '')
-
-            # Normalize empty values to "0h 0m" for comparison
-            if not orig_execution_time or orig_execution_time.strip() == '':
-                orig_execution_time = "0h 0m"
-
-            # Normalize "0h 0m" values for comparison
-            is_orig_zero = orig_execution_time.strip() == "0h 0m"
-            is_update_zero = update_execution_time.strip() == "0h 0m"
-
-            # Only add to changes if there's a real difference and not just empty values
-            # Also check if execution time fields were modified during the meeting
-            if update_execution_time != orig_execution_time and not (is_orig_zero and is_update_zero) and \
-               ('execution_time_hours' in request.session.get(f'modified_fields_{meeting.id}_{project.id}', []) or \
-                'execution_time_minutes' in request.session.get(f'modified_fields_{meeting.id}_{project.id}', [])):
-                changes.append(f"Execution Time changed from {orig_execution_time} to {update_execution_time}")
-
-            # Check for changes in test case counts
-            orig_automatable = int(orig['total_automatable_test_cases'])
-            update_automatable = int(update.total_automatable_test_cases)
-            if orig_automatable != update_automatable:
-                changes.append(f"Total Automatable Test Cases changed from {orig_automatable} to {update_automatable}")
-
-            orig_automated = int(orig['total_automated_test_cases'])
-            update_automated = int(update.total_automated_test_cases)
-            if orig_automated != update_automated:
-                changes.append(f"Total Automated Test Cases changed from {orig_automated} to {update_automated}")
-
-            orig_smoke = int(orig['total_automated_smoke_test_cases'])
-            update_smoke = int(update.total_automated_smoke_test_cases)
-            if orig_smoke != update_smoke:
-                changes.append(f"Total Automated Smoke Test Cases changed from {orig_smoke} to {update_smoke}")
-
-            orig_functional = int(orig['total_number_of_functional_test_cases'])
-            update_functional = int(update.functional_test_cases_count)
-            if orig_functional != update_functional:
-                changes.append(f"Functional Test Cases changed from {orig_functional} to {update_functional}")
-
-            orig_business = int(orig['total_number_of_business_test_cases'])
-            update_business = int(update.business_test_cases_count)
-            if orig_business != update_business:
-                changes.append(f"Business Test Cases changed from {orig_business} to {update_business}")
-
-            # Check for changes in text fields
-            orig_run_status = str(orig['status_of_last_automation_run'] or '').strip()
-            update_run_status = str(update.last_automation_run_status or '').strip()
-            # Only add to changes if there's a real difference (ignoring whitespace)
-            if orig_run_status != update_run_status:
-                old_status = orig_run_status or 'Not specified'
-                new_status = update_run_status or 'Not specified'
-                changes.append(f"Last Automation Run Status changed from '{old_status}' to '{new_status}'")
-
-            orig_tech_stack = str(orig['automation_framework_tech_stack'] or '').strip()
-            update_tech_stack = str(update.automation_framework_tech_stack or '').strip()
-            # Only add to changes if there's a real difference (ignoring whitespace)
-            if orig_tech_stack != update_tech_stack:
-                old_stack = orig_tech_stack or 'Not specified'
-                new_stack = update_tech_stack or 'Not specified'
-                changes.append(f"Automation Framework/Tech Stack changed from '{old_stack}' to '{new_stack}'")
-
-            # Check for changes in date fields
-            update_date = update.last_automation_run_date.strftime('%Y-%m-%d') if update.last_automation_run_date else None
-            orig_date = orig['date_of_last_automation_run']
-
-            # Normalize None and empty string values for comparison
-            if update_date is None and (orig_date is None or orig_date == ''):
-                # Both are effectively empty, so no change
-                pass
-            elif update_date != orig_date:
-                old_date = orig_date or 'Not specified'
-                new_date = update_date or 'Not specified'
-                changes.append(f"Last Automation Run Date changed from {old_date} to {new_date}")
-
-            # Check for changes in boolean fields
-            orig_readiness = bool(orig['readiness_for_production'])
-            update_readiness = bool(update.readiness_for_production)
-            if orig_readiness != update_readiness:
-                old_status = 'Ready' if orig_readiness else 'Not Ready'
-                new_status = 'Ready' if update_readiness else 'Not Ready'
-                changes.append(f"Readiness for Production changed from {old_status} to {new_status}")
-
-            # Check for changes in foreign key fields
-            update_team_lead_id = update.team_lead.id if update.team_lead else None
-            orig_team_lead_id = orig['team_lead_id']
-
-            # Only consider it a change if at least one value is not None
-            # and they are different
-            if (update_team_lead_id is not None or orig_team_lead_id is not None) and update_team_lead_id != orig_team_lead_id:
-                old_lead = orig['team_lead_name']
-                new_lead = update.team_lead.name if update.team_lead else 'Not assigned'
-                changes.append(f"Team Lead changed from {old_lead} to {new_lead}")
-
-            # For sprint_cycle, compare with the original string value
-            update_sprint_cycle_name = update.sprint_cycle.name if update.sprint_cycle else ''
-            orig_sprint_cycle = str(orig['sprint_cycle'] or '')
-
-            # Normalize empty values for comparison
-            update_sprint_cycle_name = update_sprint_cycle_name.strip()
-            orig_sprint_cycle = orig_sprint_cycle.strip()
-
-            # Only consider it a change if the user actually made changes during the meeting
-            # If both values are empty or both values are the same, don't report a change
-            # Check if 'sprint_cycle' is in the modified fields to ensure it was actually changed by the user
-            if update_sprint_cycle_name != orig_sprint_cycle and 'sprint_cycle' in request.session.get(f'modified_fields_{meeting.id}_{project.id}', []):
-                old_cycle = orig_sprint_cycle or 'Not specified'
-                new_cycle = update_sprint_cycle_name or 'Not specified'
-                changes.append(f"Sprint Cycle changed from {old_cycle} to {new_cycle}")
-
-            # For oat_release_cycle, compare with the original string value
-            update_oat_cycle_name = update.oat_release_cycle.name if update.oat_release_cycle else ''
-            orig_oat_cycle = str(orig['oat_release_cycle'] or '')
-
-            # Normalize empty values for comparison
-            update_oat_cycle_name = update_oat_cycle_name.strip()
-            orig_oat_cycle = orig_oat_cycle.strip()
-
-            # Only consider it a change if the user actually made changes during the meeting
-            # If both values are empty or both values are the same, don't report a change
-            # Check if 'oat_release_cycle' is in the modified fields to ensure it was actually changed by the user
-            if update_oat_cycle_name != orig_oat_cycle and 'oat_release_cycle' in request.session.get(f'modified_fields_{meeting.id}_{project.id}', []):
-                old_cycle = orig_oat_cycle or 'Not specified'
-                new_cycle = update_oat_cycle_name or 'Not specified'
-                changes.append(f"OAT Release Cycle changed from {old_cycle} to {new_cycle}")
-
-            if changes:
-                summary_notes.append(f"Project: {project.name}\n" + "\n".join([f"- {change}" for change in changes]))
-
-        # Update meeting notes with the summary
-        if summary_notes:
-            meeting_summary = "Meeting Summary:\n\n" + "\n\n".join(summary_notes)
-            if meeting.notes:
-                meeting.notes += f"\n\n{meeting_summary}"
-            else:
-                meeting.notes = meeting_summary
-            meeting.save()
-
-        # Update project fields with values from project updates
-        for update in project_updates:
-            project = update.project
-
-            # Get the modified fields for this project update from the session
-            modified_fields = request.session.get(f'modified_fields_{meeting.id}_{project.id}', [])
-
-            # Only update fields that were explicitly modified during the meeting
-            if 'smoke_automation_status' in modified_fields:
-                project.smoke_automation_status = update.smoke_automation_status
-
-            if 'regression_automation_status' in modified_fields:
-                project.regression_automation_status = update.regression_automation_status
-
-            if 'pipeline_schedule' in modified_fields:
-                project.pipeline_schedule = update.pipeline_schedule
-
-            # Update additional fields that were modified during the meeting
-            if 'execution_time_hours' in modified_fields or 'execution_time_minutes' in modified_fields:
-                # Format execution time as "Xh Ym"
-                project.execution_time_of_smoke = f"{update.execution_time_hours}h {update.execution_time_minutes}m"
-
-            if 'total_available_test_cases' in modified_fields:
-                project.total_number_of_available_test_cases = update.total_available_test_cases
-
-            if 'bugs_found_through_automation' in modified_fields:
-                project.bugs_found_through_automation = update.bugs_found_through_automation
-
-            if 'regression_coverage' in modified_fields:
-                project.regression_coverage = update.regression_coverage
-
-            if 'total_automatable_test_cases' in modified_fields:
-                project.total_automatable_test_cases = update.total_automatable_test_cases
-
-            if 'total_automated_test_cases' in modified_fields:
-                project.total_automated_test_cases = update.total_automated_test_cases
-
-            if 'total_automated_smoke_test_cases' in modified_fields:
-                project.total_automated_smoke_test_cases = update.total_automated_smoke_test_cases
-
-            if 'functional_test_cases_count' in modified_fields:
-                project.total_number_of_functional_test_cases = update.functional_test_cases_count
-
-            if 'business_test_cases_count' in modified_fields:
-                project.total_number_of_business_test_cases = update.business_test_cases_count
-
-            if 'last_automation_run_status' in modified_fields:
-                project.status_of_last_automation_run = update.last_automation_run_status
-
-            if 'last_automation_run_date' in modified_fields:
-                project.date_of_last_automation_run = update.last_automation_run_date
-
-            if 'automation_framework_tech_stack' in modified_fields:
-                project.automation_framework_tech_stack = update.automation_framework_tech_stack
-
-            if 'readiness_for_production' in modified_fields:
-                project.readiness_for_production = update.readiness_for_production
-
-            if 'team_lead' in modified_fields:
-                project.team_lead = update.team_lead
-
-            if 'sprint_cycle' in modified_fields:
-                project.sprint_cycle = update.sprint_cycle.name if update.sprint_cycle else ""
-
-            if 'oat_release_cycle' in modified_fields:
-                project.oat_release_cycle = update.oat_release_cycle.name if update.oat_release_cycle else ""
-
-            # Save the project with the updated fields
-            project.save()
-
-            # Remove the modified fields from the session
-            if f'modified_fields_{meeting.id}_{project.id}' in request.session:
-                del request.session[f'modified_fields_{meeting.id}_{project.id}']
+        # Generate the summary notes, write the modified fields back to the
+        # projects and mark the meeting as completed
+        complete_weekly_meeting(meeting)
 
         messages.success(request, f'Weekly meeting "{meeting.title}" has been completed and summary notes have been generated.')
 
@@ -1500,8 +1180,8 @@ def update_project_in_meeting(request, meeting_id, project_id):
         if modified_fields or created:
             project_update.save()
 
-            # Store the modified fields in the session for use when ending the meeting
-            request.session[f'modified_fields_{meeting.id}_{project.id}'] = modified_fields
+            # Store the modified fields for use when ending the meeting
+            record_modified_fields(MeetingBaseline, meeting, project, modified_fields)
 
             if modified_fields:
                 messages.success(request, f'Project "{project.name}" has been updated. Modified fields: {", ".join(modified_fields)}')
@@ -1590,31 +1270,21 @@ class WeeklyProductUpdateEditView(UpdateView):
         return reverse_lazy('weekly-product-meeting-detail', kwargs={'pk': self.object.meeting.id})
 
 
-class LatestProductUpdatesView(ListView):
+class LatestProductUpdatesView(PaginationMixin, ListView):
     """View for displaying the latest product updates across all meetings."""
     model = WeeklyProductUpdate
     template_name = 'dashboard/latest_product_updates.html'
     context_object_name = 'product_updates'
 
     def get_queryset(self):
-        # Get the latest update for each project
-        latest_updates = []
-        projects = Project.objects.all()
-
-        for project in projects:
-            # Find the latest update for this project
-            latest_update = WeeklyProductUpdate.objects.filter(
-                project=project
-            ).order_by('-meeting__meeting_date').first()
+        # Newest update per project, resolved in a single query
+        latest_update = WeeklyProductUpdate.objects.filter(
+            project=OuterRef('project')
+        ).order_by('-meeting__meeting_date', '-pk').values('pk')[:1]
 
-            if latest_update:
-                # We no longer need to add notes attribute for backward compatibility
-                # as the model now has a notes field
-                # Add solution_timeline_display for UI
-                latest_update.solution_timeline_display = latest_update.get_solution_timeline_display()
-                latest_updates.append(latest_update)
-
-        return latest_updates
+        return WeeklyProductUpdate.objects.filter(
+            pk=Subquery(latest_update)
+        ).select_related('project', 'meeting').prefetch_related('product_problems').order_by('project_id')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -1647,60 +1317,11 @@ def start_weekly_product_meeting(request, pk):
                 messages.error(request, "Please select at least one product to start the meeting.")
                 return redirect('weekly-product-meeting-detail', pk=meeting.id)
 
-            # Store original project values in the session for comparison when the meeting ends
-            original_values = {}
-
-            # Create WeeklyProductUpdate objects for each selected project if they don't exist
-            for project in projects:
-                # Find the most recent product update for this project from previous meetings
-                previous_update = WeeklyProductUpdate.objects.filter(
-                    project=project
-                ).exclude(
-                    meeting=meeting
-                ).order_by('-meeting__meeting_date').first()
-
-                # Set default values based on previous meeting data if available
-                default_latest_updates = previous_update.latest_project_updates if previous_update else ''
-                default_product_notes = previous_update.product_notes if previous_update and hasattr(previous_update, 'product_notes') else ''
-                default_problems = previous_update.problems if previous_update else ''
-                default_expected_solution = previous_update.expected_solution if previous_update else ''
-                default_solution_timeline = previous_update.solution_timeline if previous_update else 'medium'
-
-                # Store original values for this project
-                original_values[project.id] = {
-                    'latest_project_updates': default_latest_updates,
-                    'product_notes': default_product_notes,
-                    'problems': default_problems,
-                    'expected_solution': default_expected_solution,
-                    'solution_timeline': default_solution_timeline,
-                }
-
-                # Get or create the product update
-                product_update, created = WeeklyProductUpdate.objects.get_or_create(
-                    meeting=meeting,
-                    project=project,
-                    defaults={
-                        'latest_project_updates': default_latest_updates,
-                        'product_notes': default_product_notes,
-                        'problems': default_problems,
-                        'expected_solution': default_expected_solution,
-                        'solution_timeline': default_solution_timeline,
-                    }
-                )
-
-                # If the product update already exists,
-                # update it with data from previous meetings
-                if not created and previous_update:
-                    # Update with the latest data from previous meetings
-                    product_update.latest_project_updates = default_latest_updates
-                    product_update.product_notes = default_product_notes
-                    product_update.problems = default_problems
-                    product_update.expected_solution = default_expected_solution
-                    product_update.solution_timeline = default_solution_timeline
-                    product_update.save()
-
-            # Store original values in the session
-            request.session[f'product_original_values_{meeting.id}'] = original_values
+            # Create or refresh the WeeklyProductUpdate objects from the previous
+            # meeting's data and store the original values for comparison when
+            # the meeting ends
+            original_values = carry_forward_product_updates(meeting, [project.id for project in projects])
+            save_meeting_baselines(ProductMeetingBaseline, meeting, original_values)
 
             messages.success(request, f'Weekly product meeting "{meeting.title}" has been started with {len(projects)} selected products.')
         else:
@@ -1718,14 +1339,12 @@ def end_weekly_product_meeting(request, pk):
     meeting = get_object_or_404(WeeklyProductMeeting, pk=pk)
 
     if request.method == 'POST':
-        # Get the original values from the session
-        original_values = request.session.get(f'product_original_values_{meeting.id}', {})
+        # Get the original values stored when the meeting started
+        original_values, _ = load_meeting_state(ProductMeetingBaseline, meeting)
 
-        # Remove the meeting active flag and original values from the session
+        # Remove the meeting active flag from the session
         if f'product_meeting_active_{meeting.id}' in request.session:
             del request.session[f'product_meeting_active_{meeting.id}']
-        if f'product_original_values_{meeting.id}' in request.session:
-            del request.session[f'product_original_values_{meeting.id}']
 
         # Mark the meeting as completed
         meeting.is_completed = True
@@ -1739,7 +1358,7 @@ def end_weekly_product_meeting(request, pk):
 
         for update in product_updates:
             project = update.project
-            project_id = str(project.id)
+            project_id = project.id
 
             # Skip if there are no updates, product notes, problems, or expected solutions
             if not update.latest_project_updates and not update.product_notes and not update.problems and not update.expected_solution:
@@ -1796,9 +1415,6 @@ def end_weekly_product_meeting(request, pk):
         for update in product_updates:
             project = update.project
 
-            # Get the modified fields for this product update from the session
-            modified_fields = request.session.get(f'product_modified_fields_{meeting.id}_{project.id}', [])
-
             # We no longer append manual updates to the project description
             # Instead, they are displayed in a separate "Manual Updates" section on the product detail page
 
@@ -1813,9 +1429,8 @@ def end_weekly_product_meeting(request, pk):
             # Save the project with the updated fields
             project.save()
 
-            # Remove the modified fields from the session
-            if f'product_modified_fields_{meeting.id}_{project.id}' in request.session:
-                del request.session[f'product_modified_fields_{meeting.id}_{project.id}']
+        # The meeting state is no longer needed once the summary is generated
+        clear_meeting_state(ProductMeetingBaseline, meeting)
 
         messages.success(request, f'Weekly product meeting "{meeting.title}" has been completed and summary notes have been generated.')
 
@@ -1830,38 +1445,13 @@ def update_product_in_meeting(request, meeting_id, project_id):
         messages.error(request, "This meeting is not currently active.")
         return redirect('weekly-product-meeting-detail', pk=meeting.id)
 
-    # Get the product update or create it if it doesn't exist
-    product_update, created = WeeklyProductUpdate.objects.get_or_create(
-        meeting=meeting,
-        project=project
-    )
-
-    # Find the most recent product update for this project from previous meetings
-    previous_update = WeeklyProductUpdate.objects.filter(
-        project=project,
-        meeting__id__lt=meeting.id  # Only from previous meetings
-    ).order_by('-meeting__meeting_date').first()
-
-    # If this is a newly created product update and there's a previous update,
-    # use the previous data to populate it
-    if created and previous_update:
-        product_update.latest_project_updates = previous_update.latest_project_updates or previous_update.problems  # Use legacy field if needed
-        product_update.product_notes = previous_update.product_notes if hasattr(previous_update, 'product_notes') else ''
-        product_update.problems = previous_update.problems
-        product_update.expected_solution = previous_update.expected_solution
-        product_update.solution_timeline = previous_update.solution_timeline
-        product_update.save()
-
-        # Copy any existing problems from the previous update
-        # Only copy if this is a newly created product update to avoid duplicates
-        if created:
-            for problem in previous_update.product_problems.all():
-                ProductProblem.objects.create(
-                    product_update=product_update,
-                    problem_description=problem.problem_description,
-                    expected_solutions=problem.expected_solutions,
-                    solution_timeline=problem.solution_timeline
-                )
+    # Get the product update or create it from the previous meeting's data,
+    # including copies of its problems
+    product_update = WeeklyProductUpdate.objects.filter(meeting=meeting, project=project).first()
+    created = product_update is None
+    if created:
+        carry_forward_product_updates(meeting, [project.id])
+        product_update = WeeklyProductUpdate.objects.get(meeting=meeting, project=project)
 
     if request.method == 'POST':
         # Track which fields have been modified
@@ -1919,49 +1509,81 @@ def update_product_in_meeting(request, meeting_id, project_id):
                 )
                 modified_fields.append('added_problem')
 
-        # Then, handle updates to existing problems
-        for key, value in request.POST.items():
-            # Check for problem updates in format problem_<id>_<field>
-            if key.startswith('problem_') and '_' in key:
-                parts = key.split('_')
-                if len(parts) >= 3:
-                    problem_id = parts[1]
-                    field_name = '_'.join(parts[2:])  # Join back in case field name contains underscores
+        # Then, apply the updates to existing problems (problem_<id>_<field> keys) in bulk
+        modified_fields.extend(apply_problem_edits(product_update, parse_problem_edits(request.POST)))
 
-                    try:
-                        problem = ProductProblem.objects.get(id=problem_id, product_update=product_update)
+        if modified_fields:
+            # Store the modified fields for use in end_weekly_product_meeting
+            record_modified_fields(ProductMeetingBaseline, meeting, project, modified_fields)
+            messages.success(request, f'Product "{project.name}" has been updated. Modified fields: {", ".join(modified_fields)}')
+        else:
+            messages.success(request, f'Product "{project.name}" has been updated.')
 
-                        if field_name == 'description' and value != problem.problem_description:
-                            problem.problem_description = value
-                            problem.save()
-                            modified_fields.append(f'problem_{problem_id}_description')
+    return redirect('weekly-product-meeting-detail', pk=meeting.id)
 
-                        elif field_name == 'expected_solutions' and value != problem.expected_solutions:
-                            problem.expected_solutions = value
-                            problem.save()
-                            modified_fields.append(f'problem_{problem_id}_expected_solutions')
 
-                        elif field_name == 'solution_timeline' and value != problem.solution_timeline:
-                            problem.solution_timeline = value
-                            problem.save()
-                            modified_fields.append(f'problem_{problem_id}_solution_timeline')
+def update_product_problems_api(request, meeting_id, project_id):
+    """
+    Save problem edits for a product in an active meeting from a JSON PATCH body:
 
-                        elif field_name == 'delete' and value == 'true':
-                            problem.delete()
-                            modified_fields.append(f'deleted_problem_{problem_id}')
+        {"problems": {"<id>": {"description": "...", "expected_solutions": "...",
+                               "solution_timeline": "short", "delete": true}},
+         "new_problems": [{"description": "...", "expected_solutions": "...", "solution_timeline": "medium"}]}
+    """
+    if request.method != 'PATCH':
+        return JsonResponse({'error': 'Only PATCH method is allowed'}, status=405)
 
-                    except ProductProblem.DoesNotExist:
-                        pass  # Ignore if problem doesn't exist
+    meeting = get_object_or_404(WeeklyProductMeeting, pk=meeting_id)
+    project = get_object_or_404(Project, pk=project_id)
+    if not request.session.get(f'product_meeting_active_{meeting.id}', False):
+        return JsonResponse({'error': 'This meeting is not currently active.'}, status=409)
+    product_update = get_object_or_404(WeeklyProductUpdate, meeting=meeting, project=project)
 
+    try:
+        payload = json.loads(request.body or '{}')
+        problem_edits = payload.get('problems', {})
+        new_problems = payload.get('new_problems', [])
+        if not isinstance(problem_edits, dict) or not isinstance(new_problems, list):
+            raise ValueError('"problems" must be an object and "new_problems" a list')
+        edits = {int(problem_id): dict(changes) for problem_id, changes in problem_edits.items()}
+    except (TypeError, ValueError, AttributeError) as e:
+        return JsonResponse({'error': f'Invalid request body: {e}'}, status=400)
+
+    timelines = dict(ProductProblem.TIMELINE_CHOICES)
+    for changes in [*edits.values(), *new_problems]:
+        if not isinstance(changes, dict) or changes.get('solution_timeline', 'medium') not in timelines:
+            return JsonResponse({'error': 'Invalid solution timeline'}, status=400)
+        unknown_fields = set(changes) - set(PROBLEM_EDIT_FIELDS) - {'delete'}
+        if unknown_fields:
+            return JsonResponse({'error': f'Unknown fields: {", ".join(sorted(unknown_fields))}'}, status=400)
+        # The problem columns are NOT NULL text, so null or non-text values must not reach the database
+        invalid_fields = [field for field in PROBLEM_EDIT_FIELDS if field in changes and not isinstance(changes[field], str)]
+        if invalid_fields:
+            return JsonResponse({'error': f'Fields must be strings: {", ".join(invalid_fields)}'}, status=400)
+        if not isinstance(changes.get('delete', False), bool):
+            return JsonResponse({'error': '"delete" must be true or false'}, status=400)
+
+    with transaction.atomic():
+        modified_fields = apply_problem_edits(product_update, edits)
+        added = ProductProblem.objects.bulk_create([
+            ProductProblem(
+                product_update=product_update,
+                problem_description=problem['description'],
+                expected_solutions=problem.get('expected_solutions', ''),
+                solution_timeline=problem.get('solution_timeline', 'medium'),
+            )
+            for problem in new_problems if problem.get('description')
+        ])
+        index_objects(ProductProblem, [problem.pk for problem in added])
+        modified_fields.extend('added_problem' for _ in added)
         if modified_fields:
-            # Store the modified fields in the session for use in end_weekly_product_meeting
-            request.session[f'product_modified_fields_{meeting.id}_{project.id}'] = modified_fields
-            messages.success(request, f'Product "{project.name}" has been updated. Modified fields: {", ".join(modified_fields)}')
-        else:
-            messages.success(request, f'Product "{project.name}" has been updated.')
-
-    return redirect('weekly-product-meeting-detail', pk=meeting.id)
+            record_modified_fields(ProductMeetingBaseline, meeting, project, modified_fields)
 
+    return JsonResponse({
+        'success': True,
+        'modified_fields': modified_fields,
+        'problems': product_update.to_dict()['problems'],
+    })
 
 # Quarter views
 class QuarterListView(PaginationMixin, ListView):
@@ -2135,17 +1757,29 @@ class QuarterTargetDashboardView(TemplateView):
         context = super().get_context_data(**kwargs)
 
         # Get all quarters
-        quarters = Quarter.objects.all().order_by('-year', 'quarter_number')
+        quarters = list(Quarter.objects.all().order_by('-year', 'quarter_number'))
         context['quarters'] = quarters
 
         # Count completed quarters
-        completed_quarters = Quarter.objects.filter(completed=True).count()
-        context['completed_quarters'] = completed_quarters
+        context['completed_quarters'] = sum(1 for quarter in quarters if quarter.completed)
+
+        # Completed quarters are read from their snapshots; the others are
+        # aggregated live with one grouped query per quarter and per project
+        summaries = {
+            summary.quarter_id: summary
+            for summary in QuarterSummary.objects.filter(quarter__completed=True).defer('resource_allocations')
+        }
+        statistics_by_quarter, project_statistics = QuarterTarget.grouped_statistics(
+            [quarter.id for quarter in quarters if quarter.id not in summaries]
+        )
+        statistics_by_quarter.update({quarter_id: summary.statistics() for quarter_id, summary in summaries.items()})
+        project_statistics = QuarterTarget.merge_project_statistics(
+            project_statistics, *(summary.project_achievement for summary in summaries.values())
+        )
 
-        # Get statistics for each quarter
         quarter_stats = []
         for quarter in quarters:
-            stats = quarter.get_statistics()
+            stats = statistics_by_quarter.get(quarter.id, QuarterTarget.empty_statistics())
             quarter_stats.append({
                 'id': quarter.id,
                 'name': str(quarter),
@@ -2159,31 +1793,9 @@ class QuarterTargetDashboardView(TemplateView):
             })
         context['quarter_stats'] = quarter_stats
 
-        # Get all quarter targets
-        targets = QuarterTarget.objects.all().select_related('quarter', 'project')
-        context['targets'] = targets
-
-        # Get projects with quarter targets
-        projects_with_targets = Project.objects.filter(quarterly_targets__isnull=False).distinct()
-        context['projects_with_targets'] = projects_with_targets
-
-        # Get target achievement data by project
-        project_achievement_data = []
-        for project in projects_with_targets:
-            project_targets = targets.filter(project=project)
-            achievement_percentages = [
-                target.achievement_percentage 
-                for target in project_targets 
-                if target.achievement_percentage is not None
-            ]
-            avg_achievement = sum(achievement_percentages) / len(achievement_percentages) if achievement_percentages else 0
-            project_achievement_data.append({
-                'project_name': project.name,
-                'avg_achievement': avg_achievement,
-                'target_count': project_targets.count()
-            })
-        context['project_achievement_data'] = project_achievement_data
-
+        context['total_targets'] = sum(stats['total_targets'] for stats in statistics_by_quarter.values())
+        context['projects_with_targets_count'] = len(project_statistics)
+        context['project_achievement_data'] = project_statistics
 
         return context
 
@@ -2224,13 +1836,17 @@ def complete_quarter(request, pk):
         target_formset = TargetFormSet(request.POST, queryset=targets)
 
         if quarter_form.is_valid() and target_formset.is_valid():
-            # Save the quarter form
-            quarter = quarter_form.save(commit=False)
-            quarter.completed = True
-            quarter.save()
+            with transaction.atomic():
+                # Save the quarter form
+                quarter = quarter_form.save(commit=False)
+                quarter.completed = True
+                quarter.save()
 
-            # Save the target formset
-            target_formset.save()
+                # Save the target formset
+                target_formset.save()
+
+                # Freeze the quarter's statistics
+                QuarterSummary.capture(quarter)
 
             messages.success(request, f'Quarter {quarter} has been marked as completed.')
             return redirect('quarter-summary', pk=quarter.pk)
@@ -2253,10 +1869,14 @@ def quarter_summary(request, pk):
         messages.warning(request, f'Quarter {quarter} has not been completed yet.')
         return redirect('quarter-detail', pk=quarter.pk)
 
+    # Quarters completed before snapshots existed get theirs on first view
+    summary = QuarterSummary.objects.filter(quarter=quarter).first() or QuarterSummary.capture(quarter)
+
     context = {
         'quarter': quarter,
-        'targets': quarter.targets.all(),
-        'statistics': quarter.get_statistics(),
+        'targets': quarter.targets.select_related('project'),
+        'statistics': summary.statistics(),
+        'summary': summary,
     }
 
     return render(request, 'dashboard/quarter_summary.html', context)
@@ -2269,81 +1889,127 @@ class ResourcePlanningView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Get all resources
-        resources = Resource.objects.all()
+        # Get search parameter
+        search_query = self.request.GET.get('search', '').strip()
 
-        # Get all project assignments
-        project_resources = ProjectResource.objects.select_related('project', 'resource').all()
+        # The tables show current and upcoming rows, or the rows matching the search
+        project_resources, leaves, truncated = table_rows(timezone.now().date(), search_query)
 
-        # Get search parameter
-        search_query = self.request.GET.get('search', '')
+        context['resources'] = Resource.objects.order_by('name')
+        context['leads'] = Resource.objects.filter(team_members_as_lead__isnull=False).distinct().order_by('name')
+        context['projects'] = Project.objects.order_by('name')
+        context['project_resources'] = project_resources
+        context['leaves'] = leaves
+        context['tables_truncated'] = truncated
+        context['table_row_limit'] = TABLE_ROW_LIMIT
+        # Calendar events are loaded per visible window from resource_planning_events
+        return context
 
-        # Get current date for filtering leaves
-        current_date = timezone.now().date()
 
-        # Get leaves based on search parameter
-        if search_query:
-            # If searching, include all leaves
-            leaves = ResourceLeave.objects.select_related('resource').all()
-        else:
-            # By default, only show current and upcoming leaves
-            leaves = ResourceLeave.objects.select_related('resource').filter(
-                Q(start_date__gte=current_date) | Q(end_date__gte=current_date)
-            )
+@login_required
+def resource_planning_events(request):
+    """
+    Return the resource planning calendar events of a date window as JSON.
 
-        # Prepare data for calendar view
-        calendar_data = []
-
-        # Add project assignments to calendar data
-        for pr in project_resources:
-            end_date = pr.end_date if pr.end_date else (pr.start_date + timedelta(days=30))  # Default to 30 days if no end date
-            calendar_data.append({
-                'id': f'project_{pr.id}',
-                'title': f'{pr.resource.name} - {pr.project.name}',
-                'start': pr.start_date.isoformat(),
-                'end': end_date.isoformat(),
-                'color': '#3788d8',  # Blue for project assignments
-                'extendedProps': {
-                    'type': 'project',
-                    'resource_id': pr.resource.id,
-                    'project_id': pr.project.id,
-                    'utilization': float(pr.utilization_percentage),
-                    'hours': float(pr.hours_allocated),
-                    'notes': pr.notes
-                }
-            })
+    Query parameters: start / end (ISO dates or datetimes, as sent by
+    FullCalendar), resource and project (optional ids). The response carries an
+    ETag of its content, so an unchanged window is answered with 304.
+    """
+    try:
+        start, end = parse_window(request.GET.get('start'), request.GET.get('end'))
+        resource_id = int(request.GET['resource']) if request.GET.get('resource') else None
+        project_id = int(request.GET['project']) if request.GET.get('project') else None
+    except ValueError as e:
+        return JsonResponse({'error': f'Invalid parameter: {e}'}, status=400)
+
+    content = json.dumps(calendar_events(start, end, resource_id, project_id))
+    etag = quote_etag(hashlib.md5(content.encode()).hexdigest())
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _capacity_request(request):
+    """Parse the horizon and resource selection shared by the capacity API and heatmap."""
+    start, end = parse_horizon(request.GET.get('start'), request.GET.get('end'), timezone.now().date())
+    resource_ids = [int(value) for value in request.GET.getlist('resource')] or None
+    lead_id = int(request.GET['lead']) if request.GET.get('lead') else None
+    if lead_id is not None:
+        team = team_resource_ids(lead_id)
+        resource_ids = team if resource_ids is None else [pk for pk in resource_ids if pk in team]
+    return build_capacity_matrix(start, end, resource_ids)
 
-        # Add leaves to calendar data
-        current_date = timezone.now().date()
-        for leave in leaves:
-            # Check if this is a past leave
-            is_past_leave = leave.end_date < current_date
-
-            # Add "Past Leave" tag to title if it's a past leave
-            title = f'{leave.resource.name} - {leave.get_leave_type_display()}'
-            if is_past_leave and self.request.GET.get('search', ''):
-                title += ' (Past Leave)'
-
-            calendar_data.append({
-                'id': f'leave_{leave.id}',
-                'title': title,
-                'start': leave.start_date.isoformat(),
-                'end': leave.end_date.isoformat(),
-                'color': '#e74c3c',  # Red for leaves
-                'extendedProps': {
-                    'type': 'leave',
-                    'resource_id': leave.resource.id,
-                    'leave_type': leave.leave_type,
-                    'description': leave.description,
-                    'is_past_leave': is_past_leave
-                }
-            })
 
-        context['resources'] = resources
-        context['projects'] = Project.objects.all()
-        context['project_resources'] = project_resources
-        context['leaves'] = leaves
-        context['calendar_data'] = json.dumps(calendar_data)
+@login_required
+def capacity_api(request):
+    """
+    Return the capacity report of a horizon as JSON.
+
+    Query parameters: start / end (YYYY-MM-DD, inclusive, default the next 30
+    days), resource (repeatable) and lead (limit to the lead's team).
+    """
+    try:
+        matrix = _capacity_request(request)
+    except ValueError as e:
+        return JsonResponse({'error': f'Invalid parameter: {e}'}, status=400)
+    return JsonResponse(capacity_report(matrix))
+
+
+class CapacityHeatmapView(LoginRequiredMixin, TemplateView):
+    """
+    Utilization heatmap of resources by day (by week for horizons longer than
+    DAILY_HEATMAP_DAYS) with over-allocations and team rollups.
+    """
+    template_name = 'dashboard/capacity_heatmap.html'
+    DAILY_HEATMAP_DAYS = 62
+
+    def get(self, request, *args, **kwargs):
+        try:
+            self.matrix = _capacity_request(request)
+        except ValueError as e:
+            messages.error(request, f'Invalid capacity filter: {e}')
+            return redirect('capacity-heatmap')
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        matrix = self.matrix
+        if matrix.days <= self.DAILY_HEATMAP_DAYS:
+            columns = [{'date': day, 'label': day.strftime('%d'), 'title': day.strftime('%a %b %d')} for day in matrix.dates()]
+            utilization = matrix.allocated
+            levels = heatmap_levels(utilization, matrix.over, matrix.working_days, matrix.on_leave)
+        else:
+            week_starts, utilization, over = weekly_utilization(matrix)
+            columns = [{'date': day, 'label': day.strftime('%b %d'), 'title': f"Week of {day.strftime('%b %d')}"} for day in week_starts]
+            levels = heatmap_levels(utilization, over)
+
+        totals = resource_totals(matrix)
+        intervals = over_allocation_intervals(matrix)
+        context['columns'] = columns
+        context['rows'] = [
+            {
+                'resource': resource,
+                'cells': [
+                    {'value': round(float(value)), 'level': level, 'title': column['title']}
+                    for value, level, column in zip(utilization[row].tolist(), levels[row].tolist(), columns)
+                ],
+                'free_days': float(totals['free_days'][row]),
+                'over_allocations': intervals.get(resource.id, []),
+            }
+            for row, resource in enumerate(matrix.resources)
+        ]
+        context['teams'] = team_rollups(matrix, totals)
+        context['leads'] = Resource.objects.filter(
+            reporting_descendants__relation='lead', reporting_descendants__depth=1
+        ).distinct().order_by('name')
+        context['current_filters'] = {
+            'start': matrix.start.isoformat(),
+            'end': matrix.end.isoformat(),
+            'lead': self.request.GET.get('lead', ''),
+        }
         return context
 
 
@@ -2506,6 +2172,8 @@ class RockListView(PaginationMixin, ListView):
             queryset = queryset.filter(project_id=project_filter)
         if quarter_target_filter:
             queryset = queryset.filter(quarter_target_id=quarter_target_filter)
+        if self.request.GET.get('overdue'):
+            queryset = queryset.filter(Rock.overdue_q())
 
         return queryset
 
@@ -2523,6 +2191,7 @@ class RockListView(PaginationMixin, ListView):
         context['current_assignee'] = self.request.GET.get('assignee', '')
         context['current_project'] = self.request.GET.get('project', '')
         context['current_quarter_target'] = self.request.GET.get('quarter_target', '')
+        context['current_overdue'] = self.request.GET.get('overdue', '')
 
         # Add filter applied flag
         context['filters_applied'] = any([
@@ -2530,7 +2199,8 @@ class RockListView(PaginationMixin, ListView):
             context['current_priority'],
             context['current_assignee'],
             context['current_project'],
-            context['current_quarter_target']
+            context['current_quarter_target'],
+            context['current_overdue']
         ])
 
         return context
@@ -2620,8 +2290,8 @@ class RockDashboardView(TemplateView):
         # Rocks by project
         rocks_by_project = rocks.values('project__name').annotate(count=Count('id'))
 
-        # Overdue rocks
-        overdue_rocks = [rock for rock in rocks if rock.is_overdue]
+        # Overdue rocks, from the indexed overdue flag
+        overdue_rocks = rocks.filter(Rock.overdue_q()).select_related('assignee')
 
         # Recently completed rocks
         recently_completed = rocks.filter(
@@ -2855,31 +2525,20 @@ class RoadmapTimelineView(TemplateView):
                 # If no current quarter, get the most recent one
                 quarter = Quarter.objects.all().order_by('-year', '-quarter_number').first()
 
-        # Get all roadmap items for the quarter
-        roadmap_items = RoadmapItem.objects.filter(quarter=quarter).select_related('owner', 'project', 'quarter_target')
-
-        # Filter by owner
-        owner_id = self.request.GET.get('owner')
-        if owner_id:
-            roadmap_items = roadmap_items.filter(owner_id=owner_id)
-
-        # Filter by project
-        project_id = self.request.GET.get('project')
-        if project_id:
-            roadmap_items = roadmap_items.filter(project_id=project_id)
-
-        # Filter by status
-        status = self.request.GET.get('status')
-        if status:
-            roadmap_items = roadmap_items.filter(status=status)
-
-        # Filter by priority
-        priority = self.request.GET.get('priority')
-        if priority:
-            roadmap_items = roadmap_items.filter(priority=priority)
+        # Get the quarter's roadmap items, filtered by owner, project, status and priority
+        roadmap_items = timeline_queryset(
+            quarter,
+            owner=self.request.GET.get('owner'),
+            project=self.request.GET.get('project'),
+            status=self.request.GET.get('status'),
+            priority=self.request.GET.get('priority'),
+        )
 
-        # Prepare timeline data
-        timeline_data = [item.get_timeline_data() for item in roadmap_items]
+        # Prepare timeline data; the page then polls roadmap_timeline_api for changes
+        timeline_data = timeline_items(roadmap_items)
+        _, last_modified = timeline_version(roadmap_items)
+        context['timeline_last_modified'] = last_modified.isoformat() if last_modified else ''
+        roadmap_items = roadmap_items.select_related('owner')
 
         context['quarter'] = quarter
         context['quarters'] = Quarter.objects.all().order_by('-year', 'quarter_number')
@@ -2899,6 +2558,56 @@ class RoadmapTimelineView(TemplateView):
         return context
 
 
+def roadmap_timeline_api(request, quarter_id):
+    """
+    Return the roadmap timeline items of a quarter as JSON.
+
+    Takes the timeline page's owner / project / status / priority filters.
+    With ?since=<updated_at> (the last_modified of a previous response) only
+    the items changed after it are returned; ids always lists every item on
+    the timeline so clients can remove deleted ones. The response carries an
+    ETag, so an unchanged timeline is answered with 304. There is no
+    Last-Modified: the latest updated_at does not change when an item is
+    deleted or filtered out.
+    """
+    quarter = get_object_or_404(Quarter, pk=quarter_id)
+    since = request.GET.get('since')
+    if since:
+        try:
+            # An unencoded '+' of the UTC offset arrives as a space
+            since = parse_datetime(since.replace(' ', '+'))
+        except ValueError:
+            since = None
+        if since is None:
+            return JsonResponse({'error': 'since must be an ISO datetime'}, status=400)
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+
+    queryset = timeline_queryset(
+        quarter,
+        owner=request.GET.get('owner'),
+        project=request.GET.get('project'),
+        status=request.GET.get('status'),
+        priority=request.GET.get('priority'),
+    )
+    count, last_modified = timeline_version(queryset)
+    # is_overdue depends on the current date, so it is part of the version
+    version = f"{quarter.pk}:{count}:{last_modified.isoformat() if last_modified else ''}:{timezone.now().date()}"
+    etag = quote_etag(hashlib.md5(version.encode()).hexdigest())
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse({
+            'items': timeline_items(queryset, since),
+            'ids': list(queryset.order_by().values_list('id', flat=True)),
+            'full': since is None,
+            'last_modified': last_modified.isoformat() if last_modified else None,
+        })
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 def start_roadmap_item(request, pk):
     """Mark a roadmap item as in progress."""
     roadmap_item = get_object_or_404(RoadmapItem, pk=pk)
@@ -3017,6 +2726,7 @@ class ProductionBugListView(LoginRequiredMixin, PaginationMixin, ListView):
     model = ProductionBug
     template_name = 'dashboard/production_bug_list.html'
     context_object_name = 'bugs'
+    pagination_mode = 'cursor'
 
     def get_queryset(self):
         queryset = super().get_queryset().select_related('project')
@@ -3044,11 +2754,7 @@ class ProductionBugListView(LoginRequiredMixin, PaginationMixin, ListView):
         # Search by title or details if specified
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | 
-                Q(details__icontains=search_query) |
-                Q(project__name__icontains=search_query)
-            )
+            queryset = queryset.filter(pk__in=matching_ids('production_bug', search_query))
 
         # Sort by field if specified
         sort_by = self.request.GET.get('sort_by', '-reported_date')
@@ -3143,10 +2849,7 @@ class ProductDocumentationListView(LoginRequiredMixin, PaginationMixin, ListView
         # Search by title or project name
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | 
-                Q(project__name__icontains=search_query)
-            )
+            queryset = queryset.filter(pk__in=matching_ids('product_documentation', search_query))
 
         # Sort by field if specified
         sort_by = self.request.GET.get('sort_by', '-created_at')
@@ -3179,7 +2882,7 @@ class DepartmentDocumentListView(PaginationMixin, ListView):
         # Search by title
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(title__icontains=search_query)
+            queryset = queryset.filter(pk__in=matching_ids('department_document', search_query))
 
         # Sort by field if specified
         sort_by = self.request.GET.get('sort_by', '-created_at')
@@ -3310,46 +3013,60 @@ class RecordsListView(RecordsPasswordVerificationMixin, PaginationMixin, ListVie
     model = DeletedRecord
     template_name = 'dashboard/records_list.html'
     context_object_name = 'records'
+    pagination_mode = 'cursor'
+    approximate_count_limit = 1000
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-
-        # Filter by model name if specified
-        model_name = self.request.GET.get('model_name')
-        if model_name:
-            queryset = queryset.filter(model_name=model_name)
+    # sort_by values, each served by an index on deleted_at
+    SORT_OPTIONS = {
+        '-deleted_at': 'Newest First',
+        'deleted_at': 'Oldest First',
+    }
 
-        # Search by record ID or model name
-        search_query = self.request.GET.get('search')
-        if search_query:
-            queryset = queryset.filter(
-                Q(record_id__icontains=search_query) | 
-                Q(model_name__icontains=search_query)
-            )
+    def get_filters(self):
+        return records_filters(self.request.GET)
 
-        # Sort by field if specified
-        sort_by = self.request.GET.get('sort_by', '-deleted_at')
-        queryset = queryset.order_by(sort_by)
+    def get_queryset(self):
+        # The snapshots are only read on restore
+        queryset = deleted_records(**self.get_filters()).select_related('deleted_by').defer('data', 'payload')
 
-        return queryset
+        sort_by = self.request.GET.get('sort_by')
+        if sort_by not in self.SORT_OPTIONS:
+            sort_by = '-deleted_at'
+        return queryset.order_by(sort_by)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Get unique model names for filtering
-        model_names = DeletedRecord.objects.values_list('model_name', flat=True).distinct()
-        context['model_names'] = model_names
+        # Get unique model names for filtering (read from the model_name index)
+        context['model_names'] = DeletedRecord.objects.order_by('model_name').values_list(
+            'model_name', flat=True
+        ).distinct()
 
         # Add current filter values to context
+        sort_by = self.request.GET.get('sort_by')
         context['current_filters'] = {
             'model_name': self.request.GET.get('model_name', ''),
             'search': self.request.GET.get('search', ''),
-            'sort_by': self.request.GET.get('sort_by', '-deleted_at'),
+            'deleted_before': self.request.GET.get('deleted_before', ''),
+            'sort_by': sort_by if sort_by in self.SORT_OPTIONS else '-deleted_at',
         }
+        context['sort_options'] = self.SORT_OPTIONS.items()
+        context['retention_days'] = settings.RECYCLE_BIN_RETENTION_DAYS
 
         return context
 
 
+def records_filters(params):
+    """Recycle bin filter arguments of deleted_records() from request parameters."""
+    deleted_before = parse_date(params.get('deleted_before') or '')
+    return {
+        'model_name': params.get('model_name') or None,
+        'search': params.get('search') or None,
+        'deleted_before': timezone.make_aware(datetime.combine(deleted_before, datetime.min.time()))
+        if deleted_before else None,
+    }
+
+
 def restore_record(request, pk):
     """View for restoring a deleted record."""
     # Check if the user has verified the password
@@ -3368,6 +3085,45 @@ def restore_record(request, pk):
     return redirect('records-list')
 
 
+def bulk_records_action(request):
+    """
+    Restore or permanently delete the selected deleted records, or every
+    record matching the list filters when apply_to_filter is set.
+    """
+    if not request.session.get('records_password_verified'):
+        return redirect('records-password-verify')
+    if request.method != 'POST':
+        return redirect('records-list')
+
+    action = request.POST.get('action')
+    if request.POST.get('apply_to_filter'):
+        queryset = deleted_records(**records_filters(request.POST))
+    else:
+        ids = [int(pk) for pk in request.POST.getlist('selected') if pk.isdigit()]
+        queryset = deleted_records(ids=ids)
+
+    if action == 'restore':
+        result = bulk_restore(queryset)
+        verb = 'Restored'
+    elif action == 'purge':
+        result = bulk_purge(queryset)
+        verb = 'Permanently deleted'
+    else:
+        messages.error(request, "Unknown bulk action.")
+        return redirect('records-list')
+
+    if result.total == 0:
+        messages.info(request, "No records matched the selection.")
+    else:
+        messages.success(request, f"{verb} {result.done} of {result.total} records.")
+    for pk, error in result.errors[:10]:
+        messages.error(request, f"Record #{pk} could not be restored: {error}")
+    if result.failed > 10:
+        messages.error(request, f"{result.failed - 10} more records could not be restored.")
+
+    return redirect('records-list')
+
+
 class SettingsView(LoginRequiredMixin, TemplateView):
     """View for user settings page."""
     template_name = 'dashboard/settings.html'
@@ -3779,14 +3535,15 @@ class ResourceAlignmentView(LoginRequiredMixin, PaginationMixin, ListView):
         if team_lead:
             queryset = queryset.filter(team_lead=team_lead)
 
-        return queryset
+        # Assignments are prefetched for the products of the current page only
+        return queryset.prefetch_related(alignment_prefetch()).order_by('pk')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         # Add filter options to context
         context['status_choices'] = Project.STATUS_CHOICES
-        context['team_leads'] = Resource.objects.all()
+        context['team_leads'] = team_lead_options()
 
         # Add current filter values to context
         context['current_filters'] = {
@@ -3794,20 +3551,12 @@ class ResourceAlignmentView(LoginRequiredMixin, PaginationMixin, ListView):
             'team_lead': self.request.GET.get('team_lead', '')
         }
 
-        # Get all resources for assignment
-        context['resources'] = Resource.objects.all()
-
-        # Get all project resources
-        project_resources = ProjectResource.objects.select_related('project', 'resource').all()
-
-        # Organize resources by project
-        resources_by_project = {}
-        for pr in project_resources:
-            if pr.project.id not in resources_by_project:
-                resources_by_project[pr.project.id] = []
-            resources_by_project[pr.project.id].append(pr)
-
-        context['resources_by_project'] = resources_by_project
+        # Organize the page's assignments by project
+        context['resources_by_project'] = {
+            product.id: product.alignment_assignments
+            for product in context['products']
+            if product.alignment_assignments
+        }
 
         return context
 
@@ -3818,6 +3567,8 @@ class UserActionListView(LoginRequiredMixin, PaginationMixin, ListView):
     template_name = 'dashboard/user_action_list.html'
     context_object_name = 'actions'
     paginate_by = 50
+    pagination_mode = 'cursor'
+    approximate_count_limit = 1000
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -3847,18 +3598,14 @@ class UserActionListView(LoginRequiredMixin, PaginationMixin, ListView):
             # Add time component to make it inclusive of the entire day
             queryset = queryset.filter(timestamp__lte=f"{end_date} 23:59:59")
 
-        # Search by details if specified
+        # Search details and model names through the full-text index, usernames directly
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(details__icontains=search_query) | 
-                Q(user__username__icontains=search_query) |
-                Q(model_name__icontains=search_query)
-            )
+            queryset = search_actions(queryset, search_query)
 
-        # Sort by field if specified
-        sort_by = self.request.GET.get('sort_by', '-timestamp')
-        queryset = queryset.order_by(sort_by)
+        # Sort by one of the indexed orderings
+        sort_by, ordering = sort_ordering(self.request.GET.get('sort_by'))
+        queryset = queryset.select_related('user').order_by(*ordering)
 
         return queryset
 
@@ -3873,7 +3620,7 @@ class UserActionListView(LoginRequiredMixin, PaginationMixin, ListView):
             'start_date': self.request.GET.get('start_date', ''),
             'end_date': self.request.GET.get('end_date', ''),
             'search': self.request.GET.get('search', ''),
-            'sort_by': self.request.GET.get('sort_by', '-timestamp'),
+            'sort_by': sort_ordering(self.request.GET.get('sort_by'))[0],
         }
 
         # Convert user_id to string for template comparison
@@ -3882,13 +3629,33 @@ class UserActionListView(LoginRequiredMixin, PaginationMixin, ListView):
 
         # Add action types for filtering
         context['action_types'] = UserAction.ACTION_TYPES
-
-        # Add unique model names for filtering
-        context['model_names'] = UserAction.objects.values_list('model_name', flat=True).distinct()
-
-        # Add users for filtering
-        from django.contrib.auth.models import User
-        context['users'] = User.objects.all()
+        context['sort_options'] = [(value, label) for value, (label, _) in SORT_OPTIONS.items()]
+
+        # Add unique model names and users for filtering (cached until the actions or users change)
+        context['model_names'] = action_model_names()
+        context['users'] = action_user_options()
+
+        # Raw actions are only kept for the retention window; older activity
+        # is summarized from the daily rollups
+        filters = context['current_filters']
+        window_start = raw_window_start()
+        context['retention_days'] = retention_days()
+        context['raw_window_start'] = window_start
+        start_date = parse_date(filters['start_date']) if filters['start_date'] else None
+        end_date = parse_date(filters['end_date']) if filters['end_date'] else None
+        if start_date is None or start_date < window_start:
+            archived = activity_counts(
+                start=start_date,
+                end=min(end_date + timedelta(days=1), window_start) if end_date else window_start,
+                user_ids=[filters['user_id']] if filters['user_id'] else None,
+                action_type=filters['action_type'] or None,
+                model_name=filters['model_name'] or None,
+            )
+            labels = dict(UserAction.ACTION_TYPES)
+            context['archived_activity'] = [
+                (labels.get(action_type, action_type), count) for action_type, count in sorted(archived.items())
+            ]
+            context['archived_activity_total'] = sum(archived.values())
 
         return context
 
@@ -4037,20 +3804,7 @@ class MonthlyFeedbackForm(forms.ModelForm):
 
         # Filter resources based on user role
         if self.user:
-            try:
-                user_resource = Resource.objects.get(user=self.user)
-                # If user is a lead, show only resources that report to them
-                if Resource.objects.filter(lead=user_resource).exists():
-                    self.fields['resource'].queryset = Resource.objects.filter(lead=user_resource)
-                # If user is a manager, show all resources
-                elif Resource.objects.filter(manager=user_resource).exists():
-                    self.fields['resource'].queryset = Resource.objects.all()
-                # Otherwise, user can only see themselves
-                else:
-                    self.fields['resource'].queryset = Resource.objects.filter(id=user_resource.id)
-            except Resource.DoesNotExist:
-                # If user doesn't have a resource, don't show any resources
-                self.fields['resource'].queryset = Resource.objects.none()
+            self.fields['resource'].queryset = accessible_resources(self.user)
 
 
 class MonthlyFeedbackListView(LoginRequiredMixin, PaginationMixin, ListView):
@@ -4062,29 +3816,17 @@ class MonthlyFeedbackListView(LoginRequiredMixin, PaginationMixin, ListView):
     context_object_name = 'resources'
 
     def get_queryset(self):
-        try:
-            user_resource = Resource.objects.get(user=self.request.user)
-
-            # If user is a lead, show only resources that report to them
-            if Resource.objects.filter(lead=user_resource).exists():
-                queryset = Resource.objects.filter(lead=user_resource)
-            # If user is a manager, show all resources
-            elif Resource.objects.filter(manager=user_resource).exists():
-                queryset = Resource.objects.all()
-            # Otherwise, user can only see themselves
-            else:
-                queryset = Resource.objects.filter(id=user_resource.id)
+        # Resources the user is allowed to see (leads, managers or themselves)
+        queryset = accessible_resources(self.request.user)
 
-            # Get filter parameters from request
-            resource_name = self.request.GET.get('resource_name', '')
+        # Get filter parameters from request
+        resource_name = self.request.GET.get('resource_name', '')
 
-            # Apply filters
-            if resource_name:
-                queryset = queryset.filter(name__icontains=resource_name)
+        # Apply filters
+        if resource_name:
+            queryset = queryset.filter(name__icontains=resource_name)
 
-            return queryset.order_by('name')
-        except Resource.DoesNotExist:
-            return Resource.objects.none()
+        return queryset.order_by('name')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -4139,27 +3881,12 @@ class MonthlyFeedbackDetailView(LoginRequiredMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Check if user has permission to view this feedback
-        try:
-            user_resource = Resource.objects.get(user=self.request.user)
-            feedback_resource = self.object.resource
-
-            # User can view feedback if:
-            # 1. They are the resource the feedback is about
-            # 2. They are the lead of the resource
-            # 3. They are the manager of the resource
-            # 4. They submitted the feedback
-            if (user_resource == feedback_resource or 
-                user_resource == feedback_resource.lead or 
-                user_resource == feedback_resource.manager or 
-                self.request.user == self.object.submitted_by):
-                context['can_view'] = True
-            else:
-                context['can_view'] = False
-
-        except Resource.DoesNotExist:
-            # If user doesn't have a resource, they can only view if they submitted the feedback
-            context['can_view'] = self.request.user == self.object.submitted_by
+        # User can view feedback if they submitted it, or if they are the resource
+        # the feedback is about or anywhere above it in the reporting hierarchy
+        context['can_view'] = (
+            self.request.user == self.object.submitted_by or
+            can_view_resource(self.request.user, self.object.resource)
+        )
 
         return context
 
@@ -4240,45 +3967,32 @@ class MonthlyFeedbackHistoryView(LoginRequiredMixin, PaginationMixin, ListView):
     paginate_by = 20
 
     def get_queryset(self):
-        try:
-            user_resource = Resource.objects.get(user=self.request.user)
-
-            # Get resources under user's reporting
-            if Resource.objects.filter(lead=user_resource).exists():
-                # If user is a lead, show feedback for resources that report to them
-                resources_under_reporting = Resource.objects.filter(lead=user_resource)
-            elif Resource.objects.filter(manager=user_resource).exists():
-                # If user is a manager, show feedback for all resources
-                resources_under_reporting = Resource.objects.all()
-            else:
-                # Otherwise, user can only see their own feedback
-                resources_under_reporting = Resource.objects.filter(id=user_resource.id)
+        # Get resources under user's reporting
+        resources_under_reporting = accessible_resources(self.request.user)
 
-            # Get filter parameters from request
-            month = self.request.GET.get('month', '')
-            year = self.request.GET.get('year', '')
-            resource_name = self.request.GET.get('resource_name', '')
-            status = self.request.GET.get('status', '')
+        # Get filter parameters from request
+        month = self.request.GET.get('month', '')
+        year = self.request.GET.get('year', '')
+        resource_name = self.request.GET.get('resource_name', '')
+        status = self.request.GET.get('status', '')
 
-            # Start with all feedback for resources under reporting
-            queryset = MonthlyFeedback.objects.filter(resource__in=resources_under_reporting)
+        # Start with all feedback for resources under reporting
+        queryset = MonthlyFeedback.objects.filter(resource__in=resources_under_reporting)
 
-            # Apply filters
-            if month and month.isdigit():
-                queryset = queryset.filter(month=int(month))
+        # Apply filters
+        if month and month.isdigit():
+            queryset = queryset.filter(month=int(month))
 
-            if year and year.isdigit():
-                queryset = queryset.filter(year=int(year))
+        if year and year.isdigit():
+            queryset = queryset.filter(year=int(year))
 
-            if resource_name:
-                queryset = queryset.filter(resource__name__icontains=resource_name)
+        if resource_name:
+            queryset = queryset.filter(resource__name__icontains=resource_name)
 
-            if status:
-                queryset = queryset.filter(status=status)
+        if status:
+            queryset = queryset.filter(status=status)
 
-            return queryset.order_by('-year', '-month', 'resource__name')
-        except Resource.DoesNotExist:
-            return MonthlyFeedback.objects.none()
+        return queryset.select_related('resource').order_by('-year', '-month', 'resource__name')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -4400,7 +4114,7 @@ class SOPListView(LoginRequiredMixin, PaginationMixin, ListView):
 
         # Apply filters
         if name:
-            queryset = queryset.filter(name__icontains=name)
+            queryset = queryset.filter(pk__in=matching_ids('sop', name))
         if status:
             queryset = queryset.filter(status=status)
 
@@ -4844,3 +4558,23 @@ class SprintMetricsUpdateView(LoginRequiredMixin, UpdateView):
         context['title'] = 'Update Sprint Metrics'
         context['sprint'] = self.object
         return context
+
+# Search
+class SearchView(LoginRequiredMixin, PaginationMixin, ListView):
+    """
+    Ranked full-text search over products, production bugs, product updates,
+    problems and documents. ?q= is the query and ?kind= limits it to one source.
+    """
+    template_name = 'dashboard/search_results.html'
+    context_object_name = 'results'
+
+    def get_queryset(self):
+        kind = self.request.GET.get('kind')
+        return search_documents(self.request.GET.get('q', ''), [kind] if kind in SEARCH_SOURCES else None)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.request.GET.get('q', '')
+        context['kind'] = self.request.GET.get('kind', '')
+        context['kind_choices'] = SearchDocument.KIND_CHOICES
+        return context
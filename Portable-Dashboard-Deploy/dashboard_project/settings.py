@@ -162,3 +162,24 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/dashboard/'
 LOGOUT_REDIRECT_URL = '/accounts/login/'
+
+# Buffered user action audit log (see dashboard/audit.py). The test runner
+# (TEST_RUNNER below) switches it off so query counts and the test database
+# are not affected.
+USER_ACTION_AUDIT = {
+    'ENABLED': os.environ.get('DJANGO_USER_ACTION_AUDIT', 'True') == 'True',
+    'MAX_QUEUE_SIZE': int(os.environ.get('DJANGO_USER_ACTION_AUDIT_QUEUE_SIZE', '10000')),
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL_MS': 500,
+    # What to do with a record when the queue is full: 'drop', 'block' or 'sync'
+    'OVERFLOW': os.environ.get('DJANGO_USER_ACTION_AUDIT_OVERFLOW', 'drop'),
+    'BLOCK_TIMEOUT_MS': 50,
+    # Days of raw rows kept; older rows are rolled up per day and archived by archive_user_actions
+    'RETENTION_DAYS': int(os.environ.get('DJANGO_USER_ACTION_RETENTION_DAYS', '90')),
+    'ARCHIVE_DIR': os.environ.get('DJANGO_USER_ACTION_ARCHIVE_DIR', str(BASE_DIR / 'archive' / 'user_actions')),
+}
+
+# Deleted records older than this many days are purged by the purge_deleted_records command
+RECYCLE_BIN_RETENTION_DAYS = int(os.environ.get('DJANGO_RECYCLE_BIN_RETENTION_DAYS', '180'))
+
+TEST_RUNNER = 'dashboard_project.test_runner.DashboardTestRunner'
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class DashboardTestRunner(DiscoverRunner):
+    """
+    Run the tests with the user action audit writer disabled, so requests
+    made by the test client do not queue UserActions for its background
+    thread. Tests of the writer build their own AuditWriter.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._audit_override = override_settings(
+            USER_ACTION_AUDIT={**settings.USER_ACTION_AUDIT, 'ENABLED': False}
+        )
+        self._audit_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._audit_override.disable()
+        super().teardown_test_environment(**kwargs)